@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Time each stage of the social card pipeline for every brand, against a baseline.
+
+Each brand's card (see brandkit.cards) is built exactly as its generator and
+og-server.py build it — build_svg() with the card's own text, then
+card_png() — while the functions that make up each stage are timed in
+place:
+
+  font      font metrics loading (brandkit.fonts) and @font-face payloads
+            (brandkit.embed: subsetting, base64)
+  measure   the card's text measurement (fit_size, measure_width, split_x, x_after)
+  svg       the rest of build_svg(): geometry and SVG assembly
+  parse     cairosvg parsing the SVG (raster.SvgDocument.parse)
+  render    cairo rasterizing it (SvgDocument.render_png)
+  grain     the film-grain overlay, for cards that apply one (brandkit.grain)
+  encode    Pillow writing the PNG
+  optimize  the build's lossless re-encode (brandkit.pngopt.search, uncached)
+  write     writing the PNG to disk
+
+A stage's time excludes the stages nested in it (measuring a title loads its
+font; that counts as font). The in-process caches of fonts, embed and
+grain are cleared before every run, as in a fresh build worker; the
+on-disk metric and subset caches stay warm. After --warmup untimed runs,
+each card is run --repeat times; the median per stage is reported, the
+minimum and every sample are in the JSON.
+
+With a baseline (--baseline, default the brandkit cache's bench/
+baseline.json) each median is compared with the baseline's; a stage that is
+more than --threshold slower, and by more than --min-delta ms, is a
+regression and the exit status is 1. --save-baseline records this run as
+the baseline instead. Baselines are per machine, so none is committed.
+
+Prerequisites:
+  As for the social card scripts.
+
+Usage:
+  python3 scripts/benchmark.py
+  python3 scripts/benchmark.py custodyzero --repeat 10 --json bench.json
+  python3 scripts/benchmark.py --save-baseline
+  python3 scripts/benchmark.py --threshold 0.05
+"""
+
+import argparse
+import functools
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from PIL import Image
+
+from brandkit import cards, embed, fonts, fontstore, grain, pngopt, raster
+from brandkit.paths import cache_dir
+
+STAGES = ("font", "measure", "svg", "parse", "render", "grain", "encode", "optimize", "write")
+MEASURE = ("fit_size", "measure_width", "split_x", "x_after")
+CACHED_MODULES = (fonts, embed, grain)
+
+THRESHOLD = 0.20
+MIN_DELTA_MS = 2.0
+
+
+def default_baseline() -> Path:
+    return cache_dir("bench") / "baseline.json"
+
+
+# ---------------------------------------------------------------------------
+# Stage timing
+# ---------------------------------------------------------------------------
+
+class Clock:
+    """Exclusive (self) time per stage, for timed functions that nest."""
+
+    def __init__(self):
+        self.seconds = dict.fromkeys(STAGES, 0.0)
+        self._children = []
+
+    def timed(self, stage: str, fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            self._children.append(0.0)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                self.seconds[stage] += elapsed - self._children.pop()
+                if self._children:
+                    self._children[-1] += elapsed
+        return wrapper
+
+
+@contextmanager
+def instrumented(clock: Clock, mod):
+    """Replace each stage's functions with timed wrappers while the block runs."""
+    targets = [(fonts, "_load", "font"), (embed, "font_b64", "font")]
+    targets += [(mod, name, "measure") for name in MEASURE if hasattr(mod, name)]
+    targets += [
+        (mod, "build_svg", "svg"),
+        (raster.SvgDocument, "parse", "parse"),
+        (raster.SvgDocument, "render_png", "render"),
+        (grain, "add_grain", "grain"),
+        (Image.Image, "save", "encode"),
+    ]
+    saved = [(owner, name, getattr(owner, name)) for owner, name, _ in targets]
+    try:
+        for owner, name, stage in targets:
+            setattr(owner, name, clock.timed(stage, getattr(owner, name)))
+        yield
+    finally:
+        for owner, name, original in saved:
+            setattr(owner, name, original)
+
+
+def clear_caches() -> None:
+    """Forget every in-process memo a build worker would start without."""
+    for module in CACHED_MODULES:
+        for value in list(vars(module).values()):
+            if callable(getattr(value, "cache_clear", None)):
+                value.cache_clear()
+
+
+def run_once(card: str, scale: int, out_dir: Path) -> tuple:
+    """(stage → seconds, PNG bytes) for one cold build of `card`."""
+    mod = cards.module(card)
+    clock = Clock()
+    clear_caches()
+    with instrumented(clock, mod):
+        png = mod.card_png(mod.build_svg(), scale)
+    clock.timed("optimize", pngopt.search)(png)
+    clock.timed("write", (out_dir / f"{card}.png").write_bytes)(png)
+    return clock.seconds, len(png)
+
+
+def bench_card(card: str, scale: int, warmup: int, repeat: int, out_dir: Path) -> dict:
+    cards.prepare(card)
+    for _ in range(warmup):
+        run_once(card, scale, out_dir)
+    samples = {stage: [] for stage in STAGES}
+    for _ in range(repeat):
+        seconds, size = run_once(card, scale, out_dir)
+        for stage in STAGES:
+            samples[stage].append(seconds[stage] * 1000)
+    totals = [sum(run) for run in zip(*samples.values())]
+    stages = {stage: summarize(ms) for stage, ms in samples.items()}
+    return {"png_bytes": size, "stages": stages, "total": summarize(totals)}
+
+
+def summarize(ms: list) -> dict:
+    return {"median": round(statistics.median(ms), 3), "min": round(min(ms), 3),
+            "runs": [round(v, 3) for v in ms]}
+
+
+# ---------------------------------------------------------------------------
+# Reporting
+# ---------------------------------------------------------------------------
+
+def print_table(results: dict) -> None:
+    print(f"\n  {'median ms':<12}" + "".join(f"{s:>9}" for s in STAGES) + f"{'total':>10}")
+    for card, r in results.items():
+        row = "".join(f"{r['stages'][s]['median']:>9.1f}" for s in STAGES)
+        print(f"  {card:<12}{row}{r['total']['median']:>10.1f}")
+
+
+def regressions(results: dict, baseline: dict, threshold: float, min_delta: float) -> list:
+    """(card, stage, baseline ms, ms) for every median beyond the thresholds."""
+    found = []
+    for card, r in results.items():
+        base = baseline.get("cards", {}).get(card)
+        if base is None:
+            continue
+        for stage in (*STAGES, "total"):
+            now = r["total"] if stage == "total" else r["stages"][stage]
+            then = base["total"] if stage == "total" else base["stages"].get(stage)
+            if then is None:
+                continue
+            was, ms = then["median"], now["median"]
+            if ms - was > min_delta and ms > was * (1 + threshold):
+                found.append((card, stage, was, ms))
+    return found
+
+
+def main() -> None:
+    fontstore.configure()
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("cards", nargs="*", metavar="CARD",
+                        help=f"cards to time (default: all — {', '.join(cards.CARDS)})")
+    parser.add_argument("--scale", type=int, choices=cards.SCALES, default=1)
+    parser.add_argument("--warmup", type=int, default=1, help="untimed runs per card (default: 1)")
+    parser.add_argument("--repeat", "-n", type=int, default=5, help="timed runs per card (default: 5)")
+    parser.add_argument("--json", metavar="PATH", help="write the results as JSON ('-' for stdout)")
+    parser.add_argument("--baseline", type=Path, default=default_baseline(),
+                        help="baseline to compare with (default: %(default)s)")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="record this run as the baseline instead of comparing")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD,
+                        help=f"relative slowdown that fails (default: {THRESHOLD})")
+    parser.add_argument("--min-delta", type=float, default=MIN_DELTA_MS,
+                        help=f"ignore slowdowns of at most this many ms (default: {MIN_DELTA_MS})")
+    args = parser.parse_args()
+
+    unknown = [c for c in args.cards if c not in cards.CARDS]
+    if unknown:
+        parser.error(f"unknown card(s): {', '.join(unknown)} (choose from {', '.join(cards.CARDS)})")
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+    log = sys.stderr if args.json == "-" else sys.stdout
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="benchmark-") as tmp:
+        for card in args.cards or cards.CARDS:
+            print(f"  {card}: {args.warmup} warmup + {args.repeat} runs…", file=log)
+            results[card] = bench_card(card, args.scale, args.warmup, args.repeat, Path(tmp))
+
+    report = {
+        "version": 1,
+        "python": platform.python_version(),
+        "machine": f"{platform.system()} {platform.machine()}, {os.cpu_count()} CPUs",
+        "scale": args.scale,
+        "warmup": args.warmup,
+        "repeat": args.repeat,
+        "cards": results,
+    }
+    if args.json == "-":
+        json.dump(report, sys.stdout, indent=1)
+        print()
+    else:
+        print_table(results)
+        if args.json:
+            Path(args.json).write_text(json.dumps(report, indent=1) + "\n", encoding="utf-8")
+            print(f"\n  results: {args.json}")
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(report, indent=1) + "\n", encoding="utf-8")
+        print(f"\n  baseline saved: {args.baseline}", file=log)
+        return
+    if not args.baseline.exists():
+        print(f"\n  no baseline at {args.baseline} (record one with --save-baseline)", file=log)
+        return
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    if baseline.get("scale") != args.scale:
+        print(f"\n  baseline is for scale {baseline.get('scale')}; not compared", file=log)
+        return
+    slower = regressions(results, baseline, args.threshold, args.min_delta)
+    if not slower:
+        print(f"\n  no stage more than {args.threshold:.0%} slower than the baseline", file=log)
+        return
+    print(f"\n  {len(slower)} regression(s) against {args.baseline}:", file=log)
+    for card, stage, was, ms in slower:
+        change = f"+{ms / was - 1:.0%}" if was else "new"
+        print(f"    {card:<12} {stage:<9} {was:8.1f} → {ms:8.1f} ms ({change})", file=log)
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+"""
+Shared helpers for the scripts/generate-*.py brand generators.
+
+The generators are run as plain scripts (python3 scripts/generate-archon.py),
+which puts scripts/ on sys.path, so `from brandkit import fonts` resolves
+without any packaging step.
+"""
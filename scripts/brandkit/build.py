@@ -0,0 +1,281 @@
+"""
+Deferred output jobs for the brand generators.
+
+Generators hand every rasterized output to submit(). Run as a plain script,
+submit() calls the function immediately, exactly as before. Inside
+collecting(), the call is recorded as a Job instead, so scripts/build-brand.py
+can gather the outputs of every generator and render them across a process
+pool.
+
+A Job names its function by script path + attribute name rather than by
+object, so it pickles cleanly even though the generate-*.py scripts are not
+importable modules. Workers load each script once (without running main()).
+
+Incremental rebuilds: every job gets a content key — SHA-256 over the job
+function's script source (which fixes its grain seed/opacity and encoder
+settings), the brandkit sources, the arguments (SVG text, target size; an
+SVG given by path is hashed by content) and the digests of every font the
+target measured or embedded. Job functions take (source, out_path, ...);
+out_path may be a tuple of paths the job writes together: outputs that all
+receive the same bytes (one render shared by identical outputs), or a set
+rendered in one pass (e.g. an icon's sizes). A job given an
+encode.Alternates also writes the WebP/AVIF companions of its PNGs, which
+count as its outputs too.
+The key, size and mtime of each written output are kept in a manifest in the
+brandkit cache; a job whose key matches and whose output is untouched is
+skipped. Set BRANDKIT_REBUILD=1 (or pass --force to build-brand.py) to
+render everything regardless.
+
+Every .png a job writes is then re-encoded losslessly by brandkit.pngopt in
+the same worker, before the output is recorded.
+"""
+
+import hashlib
+import importlib.util
+import json
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import NamedTuple
+
+from brandkit import encode, pngopt, trace
+from brandkit.paths import cache_dir
+
+# Bump to invalidate every recorded output (e.g. after a renderer change).
+CACHE_VERSION = 1
+
+
+class Job(NamedTuple):
+    script: str
+    fn: str
+    args: tuple
+    key: str = ""
+
+    def __str__(self) -> str:
+        return f"{Path(self.script).stem}.{self.fn}"
+
+    @property
+    def out_paths(self) -> tuple:
+        out = self.args[1]
+        paths = out if isinstance(out, (tuple, list)) else (out,)
+        paths = [Path(p).resolve() for p in paths]
+        for alternates in (a for a in self.args if isinstance(a, encode.Alternates)):
+            paths += [c for p in paths if p.suffix == ".png" for c in encode.companions(p, alternates)]
+        return tuple(str(p) for p in paths)
+
+    @property
+    def out_path(self) -> str:
+        return self.out_paths[0]
+
+
+_collected = None
+_inputs = set()
+
+
+@contextmanager
+def collecting():
+    """Record submitted jobs instead of running them; yields the job list."""
+    global _collected
+    outer, _collected = _collected, []
+    _inputs.clear()
+    try:
+        yield _collected
+    finally:
+        _collected = outer
+
+
+def note_input(path: str) -> None:
+    """Register a font file the current target depends on (see brandkit.fonts)."""
+    _inputs.add(path)
+
+
+def submit(fn, *args) -> None:
+    """Run fn(*args) now (unless up to date), or record it inside collecting()."""
+    job = Job(fn.__code__.co_filename, fn.__name__, args)
+    job = job._replace(key=job_key(job))
+    if _collected is None:
+        run_incremental([job], workers=1)
+        return
+    _collected.append(job)
+
+
+# ---------------------------------------------------------------------------
+# Content keys + manifest
+# ---------------------------------------------------------------------------
+
+@lru_cache(maxsize=None)
+def _source_digest(*paths: str) -> str:
+    h = hashlib.sha256()
+    for path in paths:
+        h.update(Path(path).read_bytes())
+    return h.hexdigest()
+
+
+def _file_digest(path) -> str:
+    st = os.stat(path)
+    return _file_digest_at(str(path), st.st_mtime_ns, st.st_size)
+
+
+@lru_cache(maxsize=None)
+def _file_digest_at(path: str, mtime_ns: int, size: int) -> str:
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def code_digest(script: str) -> str:
+    """Digest of a generator script together with the brandkit sources it runs on."""
+    kit = sorted(str(p) for p in Path(__file__).parent.glob("*.py"))
+    return _source_digest(script) + _source_digest(*kit)
+
+
+def job_key(job: Job) -> str:
+    from brandkit import fontindex
+
+    source, *rest = job.args
+    if isinstance(source, Path) or (isinstance(source, str) and not source.lstrip().startswith("<")):
+        source = "file:" + _file_digest(source)
+    parts = [
+        CACHE_VERSION,
+        job.fn,
+        code_digest(job.script),
+        hashlib.sha256(source.encode()).hexdigest(),
+        [str(a) for a in rest],
+        sorted(fontindex.font_digest(p) for p in _inputs),
+    ]
+    return hashlib.sha256(json.dumps(parts).encode()).hexdigest()
+
+
+def _manifest_path() -> Path:
+    return cache_dir("build") / "manifest.json"
+
+
+def load_manifest() -> dict:
+    try:
+        return json.loads(_manifest_path().read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(manifest: dict) -> None:
+    """Write the manifest atomically; a read-only cache is silently skipped."""
+    tmp = None
+    try:
+        target = _manifest_path()
+        fd, tmp = tempfile.mkstemp(dir=target.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=0, sort_keys=True)
+        os.replace(tmp, target)
+    except OSError:
+        if tmp is not None:
+            Path(tmp).unlink(missing_ok=True)
+
+
+def rebuild_all() -> bool:
+    return os.environ.get("BRANDKIT_REBUILD", "") not in ("", "0")
+
+
+def is_current(job: Job, manifest: dict) -> bool:
+    """True when every output exists untouched and was built from the same inputs."""
+    for path in job.out_paths:
+        entry = manifest.get(path)
+        if entry is None or entry.get("key") != job.key:
+            return False
+        try:
+            st = os.stat(path)
+        except OSError:
+            if entry.get("size") is None:  # recorded as not written; still absent
+                continue
+            return False
+        if entry.get("size") != st.st_size or entry.get("mtime_ns") != st.st_mtime_ns:
+            return False
+    return True
+
+
+def record(job: Job, manifest: dict) -> None:
+    """
+    Record each output's key, size and mtime. An output the job did not
+    write (a companion with no candidate above its threshold) is recorded
+    with no size, so it stays current only while it is absent.
+    """
+    for path in job.out_paths:
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            manifest[path] = {"key": job.key, "size": None, "mtime_ns": None}
+            continue
+        manifest[path] = {"key": job.key, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def run_incremental(jobs: list, workers: int = None) -> int:
+    """
+    Run the jobs whose outputs are out of date; returns how many were skipped.
+
+    Successful outputs are recorded in the manifest even if another job fails.
+    """
+    manifest = load_manifest()
+    stale = jobs if rebuild_all() else [j for j in jobs if not is_current(j, manifest)]
+    for job in jobs:
+        if job not in stale:
+            for path in job.out_paths:
+                print(f"  {Path(path).name} (up to date)")
+    done = []
+    try:
+        run_parallel(stale, workers, done=done)
+    finally:
+        if done:
+            for job in done:
+                record(job, manifest)
+            save_manifest(manifest)
+    return len(jobs) - len(stale)
+
+
+@lru_cache(maxsize=None)
+def load_script(path: str):
+    """Import a scripts/*.py file as a module (its main() is not run)."""
+    name = "brandkit_script_" + Path(path).stem.replace("-", "_")
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def run_job(job: Job) -> None:
+    with trace.span(str(job), "job") as span:
+        getattr(load_script(job.script), job.fn)(*job.args)
+        for path in job.out_paths:
+            if path.endswith(".png"):
+                pngopt.optimize_file(path)
+        span.args["outputs"] = [Path(p).name for p in job.out_paths]
+        span.bytes_out = sum(os.path.getsize(p) for p in job.out_paths if os.path.exists(p))
+
+
+def run_parallel(jobs: list, workers: int = None, done: list = None) -> None:
+    """
+    Run jobs across a process pool sized to the machine (or `workers`).
+
+    Every job is attempted; the first failure is re-raised once the pool has
+    drained so a broken output never hides the others' results. Jobs that
+    succeed are appended to `done` when given.
+    """
+    done = [] if done is None else done
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) <= 1:
+        for job in jobs:
+            run_job(job)
+            done.append(job)
+        return
+    first_error = None
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+        futures = [(job, pool.submit(run_job, job)) for job in jobs]
+        for job, future in futures:
+            try:
+                future.result()
+            except Exception as exc:
+                print(f"  FAILED {job}: {exc}")
+                first_error = first_error or exc
+            else:
+                done.append(job)
+    if first_error is not None:
+        raise first_error
@@ -0,0 +1,162 @@
+"""
+Social card builders, addressable by brand, for on-demand rendering.
+
+Each brand's generate-*social.py exposes build_svg(title, tagline, url[, split])
+and card_png(svg, scale). This module loads those scripts (without running
+main()), normalizes caller-supplied text into a hashable CardRequest and
+renders it to PNG bytes. render() and write() are plain top-level functions
+so they can run in a process pool.
+"""
+
+import hashlib
+import inspect
+import os
+import re
+import tempfile
+import unicodedata
+from functools import lru_cache
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+from brandkit import build
+
+SCRIPTS = Path(__file__).resolve().parent.parent
+
+CARDS = {
+    "custodyzero": "generate-social.py",
+    "factory": "generate-factory-social.py",
+    "stationzero": "generate-stationzero-social.py",
+    "steward": "generate-steward-social.py",
+    "valet": "generate-valet-social.py",
+}
+
+SCALES = (1, 2)
+MAX_LEN = {"title": 80, "tagline": 160, "url": 120}
+
+_SPACE = re.compile(r"\s+")
+
+
+class CardRequest(NamedTuple):
+    card: str
+    title: str
+    tagline: str
+    url: str
+    split: Optional[int]
+    scale: int
+
+
+def module(card: str):
+    if card not in CARDS:
+        raise KeyError(card)
+    return build.load_script(str(SCRIPTS / CARDS[card]))
+
+
+@lru_cache(maxsize=None)
+def defaults(card: str) -> dict:
+    """build_svg()'s keyword defaults for `card` (title, tagline, url[, split])."""
+    params = inspect.signature(module(card).build_svg).parameters
+    return {name: p.default for name, p in params.items()}
+
+
+def prepare(card: str) -> None:
+    """Run the card script's ensure_* font installers and load its module."""
+    mod = module(card)
+    for name in sorted(dir(mod)):
+        if name.startswith("ensure_"):
+            getattr(mod, name)()
+
+
+def load_all() -> None:
+    """Pool initializer: import every card script once per worker."""
+    for card in CARDS:
+        module(card)
+
+
+def _clean(value: Optional[str], field: str, default: str) -> str:
+    if value is None:
+        return default
+    text = _SPACE.sub(" ", unicodedata.normalize("NFC", value)).strip()
+    if len(text) > MAX_LEN[field]:
+        raise ValueError(f"{field} is longer than {MAX_LEN[field]} characters")
+    return text
+
+
+def normalize(card: str, title: str = None, tagline: str = None, url: str = None,
+              split=None, scale=1) -> CardRequest:
+    """
+    Canonical request for the given parameters; raises KeyError for an unknown
+    card and ValueError for invalid values.
+
+    Omitted text falls back to the card's own. `split` (characters of the
+    title set in white) applies to two-tone cards only; it defaults to the
+    card's own split for its own title and to the whole title otherwise.
+    """
+    base = defaults(card)
+    title = _clean(title, "title", base["title"])
+    if not title:
+        raise ValueError("title must not be empty")
+    tagline = _clean(tagline, "tagline", base["tagline"])
+    url = _clean(url, "url", base["url"])
+    if "split" in base:
+        if split is None:
+            split = base["split"] if title == base["title"] else len(title)
+        split = int(split)
+        if not 0 <= split <= len(title):
+            raise ValueError(f"split must be between 0 and {len(title)}")
+    else:
+        split = None
+    scale = int(scale)
+    if scale not in SCALES:
+        raise ValueError(f"scale must be one of {SCALES}")
+    return CardRequest(card, title, tagline, url, split, scale)
+
+
+def _svg(req: CardRequest) -> str:
+    kwargs = {"title": req.title, "tagline": req.tagline, "url": req.url}
+    if req.split is not None:
+        kwargs["split"] = req.split
+    return module(req.card).build_svg(**kwargs)
+
+
+@lru_cache(maxsize=1024)
+def check(req: CardRequest) -> None:
+    """
+    Raise ValueError if `req` cannot be rendered (e.g. a character its fonts
+    cannot set), by building its SVG without rasterizing it. Requests that
+    pass are remembered.
+    """
+    _svg(req)
+
+
+def render(req: CardRequest) -> bytes:
+    """PNG bytes for `req`, exactly as the card's generator would encode it."""
+    return module(req.card).card_png(_svg(req), req.scale)
+
+
+def write(req: CardRequest, out_path: str) -> int:
+    """Render `req` to `out_path` atomically (temp file + rename); returns its size."""
+    png = render(req)
+    out = Path(out_path)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=out.parent, prefix=f".{out.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(png)
+        os.chmod(tmp, 0o644)  # mkstemp creates 0600; these are published assets
+        os.replace(tmp, out)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    return len(png)
+
+
+@lru_cache(maxsize=None)
+def _code(card: str) -> str:
+    return build.code_digest(str(SCRIPTS / CARDS[card]))
+
+
+def etag(req: CardRequest) -> str:
+    """Strong ETag: the request plus the code that renders it (read once per process)."""
+    code = _code(req.card)
+    digest = hashlib.sha256(f"{code}\0{req!r}".encode()).hexdigest()
+    return f'"{digest[:32]}"'
@@ -0,0 +1,99 @@
+"""
+Font payloads for SVG @font-face data URIs.
+
+By default each font is subset to exactly the characters the SVG sets in it
+(layout features, including kerning, are kept) before base64 encoding, which
+cuts a six-glyph wordmark from the full ~21 KB TTF to a few KB.
+
+Subsets are also kept in the brandkit cache, keyed by font SHA-256 and
+character set, so an unchanged rebuild never imports fontTools.subset.
+
+Set BRANDKIT_FONT_EMBED=full to embed complete TTFs instead.
+"""
+
+import base64
+import hashlib
+import io
+import os
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+
+from brandkit import build, fontindex, trace
+from brandkit.paths import cache_dir
+
+# Bump when the subsetter options below change.
+SUBSET_VERSION = 1
+
+
+def embed_mode() -> str:
+    mode = os.environ.get("BRANDKIT_FONT_EMBED", "subset")
+    if mode not in ("subset", "full"):
+        raise ValueError(f"BRANDKIT_FONT_EMBED must be 'subset' or 'full', not {mode!r}")
+    return mode
+
+
+@lru_cache(maxsize=None)
+def _full(path: str) -> bytes:
+    return Path(path).read_bytes()
+
+
+def _make_subset(path: str, chars: str) -> bytes:
+    from fontTools import subset
+    from fontTools.ttLib import TTFont
+
+    options = subset.Options()
+    options.layout_features = ["*"]
+    options.notdef_outline = True
+    options.name_IDs = ["*"]
+    options.name_languages = ["*"]
+    # Keep the output byte-stable across runs (head.modified is otherwise
+    # stamped with the current time on save).
+    font = TTFont(path, recalcTimestamp=False)
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(text=chars)
+    subsetter.subset(font)
+    font.flavor = None
+    buf = io.BytesIO()
+    font.save(buf)
+    return buf.getvalue()
+
+
+@lru_cache(maxsize=None)
+def _subset(path: str, chars: str) -> bytes:
+    key = hashlib.sha256(
+        f"{SUBSET_VERSION}:{fontindex.font_digest(path)}:{chars}".encode()
+    ).hexdigest()
+    cached = cache_dir("subsets") / f"{key}.ttf"
+    try:
+        return cached.read_bytes()
+    except OSError:
+        pass
+    data = _make_subset(path, chars)
+    tmp = None
+    try:
+        fd, tmp = tempfile.mkstemp(dir=cached.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, cached)
+    except OSError:
+        if tmp is not None:
+            Path(tmp).unlink(missing_ok=True)
+    return data
+
+
+def font_bytes(font_path: Path, text: str = None) -> bytes:
+    """TTF bytes to embed: subset to `text` unless text is None or mode is full."""
+    path = str(Path(font_path).resolve())
+    build.note_input(path)
+    with trace.span(f"embed {Path(path).name}", "font") as span:
+        if text is None or embed_mode() == "full":
+            data = _full(path)
+        else:
+            data = _subset(path, "".join(sorted(set(text))))
+        span.bytes_out = len(data)
+        return data
+
+
+def font_b64(font_path: Path, text: str = None) -> str:
+    return base64.b64encode(font_bytes(font_path, text)).decode("ascii")
@@ -0,0 +1,178 @@
+"""
+WebP and AVIF companions for rasterized PNGs.
+
+A grained social card is several hundred KB as PNG, which is heavy for
+link-preview crawlers and CDN egress. write_alternates() encodes a PNG's
+pixels as candidate WebP (lossless, then lossy at descending quality) and
+AVIF (lossy, when Pillow has an AVIF codec), measures each candidate's PSNR
+against the PNG, and writes the smallest one per format that stays at or
+above a threshold next to it (card.png → card.webp, card.avif). Lossless
+WebP is encoded with exact=True, so the RGB under transparent pixels is
+kept, and it is measured like the others. A table of every candidate's size, encode time
+and PSNR is printed, the chosen ones marked.
+
+Which formats and threshold apply is an Alternates value passed to the job
+(so it is part of the job's content key, like a GrainStyle). The job lists
+the companions among its outputs (companions()), so the rebuild manifest
+notices one that was deleted or edited:
+
+  BRANDKIT_FORMATS    comma-separated formats, e.g. "webp,avif", or "none"
+                      (default: the generator's own, see alternates_from_env())
+  BRANDKIT_MIN_PSNR   threshold in dB (default 40)
+"""
+
+import io
+import math
+import os
+import time
+from pathlib import Path
+from typing import NamedTuple
+
+from PIL import Image, ImageChops, features
+
+from brandkit import trace
+
+FORMATS = ("webp", "avif")
+MIN_PSNR = 40.0
+
+WEBP_QUALITIES = (95, 90, 85, 80, 75, 70)
+AVIF_QUALITIES = (90, 80, 70, 60, 50)
+AVIF_SPEED = 6
+
+
+class Alternates(NamedTuple):
+    formats: tuple = ()
+    min_psnr: float = MIN_PSNR
+
+    def __str__(self) -> str:
+        if not self.formats:
+            return "none"
+        return f"{'+'.join(self.formats)} ≥{self.min_psnr:g} dB"
+
+
+NONE = Alternates()
+
+
+class Encoded(NamedTuple):
+    fmt: str
+    label: str
+    data: bytes
+    seconds: float
+    psnr: float
+
+
+def available(fmt: str) -> bool:
+    """Whether this Pillow build can encode `fmt`."""
+    return bool(features.check(fmt))
+
+
+def parse_formats(spec: str) -> tuple:
+    names = tuple(f.strip().lower() for f in spec.split(",") if f.strip())
+    if names in ((), ("none",)):
+        return ()
+    unknown = [f for f in names if f not in FORMATS]
+    if unknown:
+        raise ValueError(f"unknown format(s) {', '.join(unknown)} (choose from {', '.join(FORMATS)})")
+    return tuple(dict.fromkeys(names))
+
+
+def alternates_from_env(default: tuple = ()) -> Alternates:
+    """Alternates for $BRANDKIT_FORMATS / $BRANDKIT_MIN_PSNR, else `default` formats at MIN_PSNR."""
+    spec = os.environ.get("BRANDKIT_FORMATS")
+    formats = parse_formats(spec) if spec is not None else tuple(default)
+    threshold = os.environ.get("BRANDKIT_MIN_PSNR")
+    return Alternates(formats, float(threshold) if threshold else MIN_PSNR)
+
+
+def psnr(img: Image.Image, ref: Image.Image) -> float:
+    """Peak signal-to-noise ratio of `img` against `ref` over all channels (dB)."""
+    if img.mode != ref.mode:
+        img = img.convert(ref.mode)
+    hist = ImageChops.difference(img, ref).histogram()
+    sse = sum(count * (i % 256) ** 2 for i, count in enumerate(hist) if count)
+    mse = sse / (ref.width * ref.height * len(ref.getbands()))
+    return math.inf if mse == 0 else 10 * math.log10(255 ** 2 / mse)
+
+
+def _encode(img: Image.Image, fmt: str, label: str, options: dict) -> Encoded:
+    start = time.perf_counter()
+    buf = io.BytesIO()
+    with trace.span(fmt, "encode") as span:
+        img.save(buf, format=fmt.upper(), **options)
+        span.args["setting"] = label
+        span.bytes_out = buf.tell()
+    seconds = time.perf_counter() - start
+    data = buf.getvalue()
+    return Encoded(fmt, label, data, seconds, psnr(Image.open(io.BytesIO(data)), img))
+
+
+def candidates(img: Image.Image, fmt: str, min_psnr: float) -> list:
+    """
+    Every candidate tried for `fmt`: lossless WebP, then lossy at descending
+    quality until one falls below `min_psnr` (lower qualities would too).
+    """
+    tried = []
+    if fmt == "webp":
+        tried.append(_encode(img, fmt, "lossless", {"lossless": True, "exact": True, "method": 4}))
+        lossy = [(q, {"quality": q, "method": 4}) for q in WEBP_QUALITIES]
+    else:
+        lossy = [(q, {"quality": q, "speed": AVIF_SPEED}) for q in AVIF_QUALITIES]
+    for q, options in lossy:
+        result = _encode(img, fmt, f"q={q}", options)
+        tried.append(result)
+        if result.psnr < min_psnr:
+            break
+    return tried
+
+
+def choose(results, min_psnr: float):
+    """The smallest result at or above `min_psnr`, or None."""
+    ok = [r for r in results if r.psnr >= min_psnr]
+    return min(ok, key=lambda r: len(r.data)) if ok else None
+
+
+def _kb(n: int) -> str:
+    return f"{n / 1024:.1f} KB"
+
+
+def companions(out_path, alternates: Alternates) -> tuple:
+    """The companion paths write_alternates() may write for `out_path` (encodable formats only)."""
+    out_path = Path(out_path)
+    return tuple(out_path.with_suffix(f".{fmt}") for fmt in alternates.formats if available(fmt))
+
+
+def write_alternates(png: bytes, out_path: Path, alternates: Alternates) -> list:
+    """
+    Write the chosen WebP/AVIF companions of PNG bytes `png` (the file at
+    `out_path`) and print the candidate table; returns the paths written.
+    Formats this Pillow cannot encode are reported and skipped; a format
+    with no candidate above the threshold is not written, and an earlier
+    companion in that format is removed.
+    """
+    if not alternates.formats:
+        return []
+    img = Image.open(io.BytesIO(png))
+    img.load()
+    out_path = Path(out_path)
+    written = []
+    print(f"    {'format':<6} {'setting':<9} {'size':>10} {'time':>9} {'PSNR':>9}")
+    print(f"    {'png':<6} {'':<9} {_kb(len(png)):>10} {'':>9} {'':>9}")
+    for fmt in alternates.formats:
+        if not available(fmt):
+            print(f"    {fmt:<6} (not supported by this Pillow build; skipped)")
+            continue
+        results = candidates(img, fmt, alternates.min_psnr)
+        best = choose(results, alternates.min_psnr)
+        for r in results:
+            mark = "  ←" if r is best else ""
+            quality = "lossless" if math.isinf(r.psnr) else f"{r.psnr:.2f} dB"
+            print(f"    {r.fmt:<6} {r.label:<9} {_kb(len(r.data)):>10} "
+                  f"{r.seconds * 1000:>6.0f} ms {quality:>9}{mark}")
+        path = out_path.with_suffix(f".{fmt}")
+        if best is None:
+            print(f"    {fmt:<6} no candidate ≥ {alternates.min_psnr:g} dB; not written")
+            path.unlink(missing_ok=True)
+            continue
+        path.write_bytes(best.data)
+        written.append(path)
+    return written
@@ -0,0 +1,128 @@
+"""
+Persistent on-disk glyph metric index.
+
+The codepoint → advance table extracted from a TTF, together with each
+glyph's horizontal ink bounds and the font's pair-kerning table, is written
+to a compact array-backed file named after the SHA-256 of the font bytes. A
+cold process that finds the index never imports fontTools for measurement; a
+changed font file hashes differently and simply gets a new index.
+
+File layout (little-endian):
+  header   <4sHHI   magic b"BKMI", format version, unitsPerEm, entry count
+  uint32[count]     codepoints, ascending
+  uint16[count]     advance widths in font units
+  int16[count]      ink xMin per codepoint (0 for blank glyphs)
+  int16[count]      ink xMax per codepoint (0 for blank glyphs)
+  uint32            kerning pair count
+  uint32[pairs]     left codepoints
+  uint32[pairs]     right codepoints
+  int16[pairs]      x-advance adjustment in font units
+"""
+
+import hashlib
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from functools import lru_cache
+from pathlib import Path
+
+from brandkit.paths import cache_dir
+
+MAGIC = b"BKMI"
+VERSION = 3
+_HEADER = struct.Struct("<4sHHI")
+_COUNT = struct.Struct("<I")
+
+
+@lru_cache(maxsize=None)
+def _digest(path: str, mtime_ns: int, size: int) -> str:
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def font_digest(font_path: Path) -> str:
+    """SHA-256 of the font bytes, hashed once per process per file version."""
+    st = os.stat(font_path)
+    return _digest(str(font_path), st.st_mtime_ns, st.st_size)
+
+
+def _index_path(digest: str) -> Path:
+    return cache_dir("metrics") / f"{digest}.idx"
+
+
+def _le(a: array) -> array:
+    if sys.byteorder != "little":
+        a.byteswap()
+    return a
+
+
+def _arrays(data: bytes, off: int, spec) -> tuple:
+    """Decode consecutive arrays [(typecode, n), ...] starting at `off`."""
+    out = []
+    for code, n in spec:
+        arr = array(code)
+        end = off + arr.itemsize * n
+        arr.frombytes(data[off:end])
+        if len(arr) != n:
+            raise ValueError("truncated index")
+        out.append(_le(arr))
+        off = end
+    return out, off
+
+
+def read(digest: str):
+    """
+    Return (units_per_em, advances, bounds, kerning) or None if not indexed.
+
+    advances: {codepoint: advance}; bounds: {codepoint: (xMin, xMax)};
+    kerning: {(left, right): adjustment}.
+    """
+    try:
+        data = _index_path(digest).read_bytes()
+    except OSError:
+        return None
+    if len(data) < _HEADER.size:
+        return None
+    magic, version, upm, count = _HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        return None
+    try:
+        (cps, advs, xmin, xmax), off = _arrays(
+            data, _HEADER.size, [("I", count), ("H", count), ("h", count), ("h", count)])
+        (pairs,) = _COUNT.unpack_from(data, off)
+        (lefts, rights, values), _ = _arrays(
+            data, off + _COUNT.size, [("I", pairs), ("I", pairs), ("h", pairs)])
+    except (ValueError, struct.error):
+        return None
+    advances = dict(zip(cps, advs))
+    bounds = dict(zip(cps, zip(xmin, xmax)))
+    kerning = dict(zip(zip(lefts, rights), values))
+    return upm, advances, bounds, kerning
+
+
+def write(digest: str, units_per_em: int, advances: dict, bounds: dict, kerning: dict) -> None:
+    """Write the index atomically; a read-only cache is silently skipped."""
+    cps = sorted(advances)
+    pairs = sorted(kerning)
+    body = b"".join([
+        _HEADER.pack(MAGIC, VERSION, units_per_em, len(cps)),
+        _le(array("I", cps)).tobytes(),
+        _le(array("H", (advances[cp] for cp in cps))).tobytes(),
+        _le(array("h", (bounds.get(cp, (0, 0))[0] for cp in cps))).tobytes(),
+        _le(array("h", (bounds.get(cp, (0, 0))[1] for cp in cps))).tobytes(),
+        _COUNT.pack(len(pairs)),
+        _le(array("I", (l for l, _ in pairs))).tobytes(),
+        _le(array("I", (r for _, r in pairs))).tobytes(),
+        _le(array("h", (kerning[p] for p in pairs))).tobytes(),
+    ])
+    tmp = None
+    try:
+        target = _index_path(digest)
+        fd, tmp = tempfile.mkstemp(dir=target.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(body)
+        os.replace(tmp, target)
+    except OSError:
+        if tmp is not None:
+            Path(tmp).unlink(missing_ok=True)
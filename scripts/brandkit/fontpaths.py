@@ -0,0 +1,178 @@
+"""
+Where the brand fonts are on this machine, looked up once per process.
+
+Every generator used to read its TTFs from ~/Library/Fonts, which only
+exists on macOS; install-fonts.py puts them in ~/.local/share/fonts on
+Linux. Fonts are now resolved by searching, in order:
+
+  1. $BRANDKIT_FONT_DIRS (os.pathsep-separated), for one-off overrides
+  2. the local font store's fonts/ directory (brandkit.fontstore)
+  3. the user font directory: ~/Library/Fonts, $XDG_DATA_HOME/fonts
+     (~/.local/share/fonts), ~/.fonts, or %LOCALAPPDATA%\\Microsoft\\Windows\\Fonts
+  4. ~/Library/Fonts on every platform, where the generators always looked
+     (machines set up for them may have the fonts there)
+  5. system font directories: /Library/Fonts, $XDG_DATA_DIRS/fonts
+     (/usr/local/share/fonts, /usr/share/fonts), %WINDIR%\\Fonts
+  6. whatever fontconfig knows about (`fc-list`, when installed)
+
+Each directory is walked at most once per process, and only when no earlier
+one has the file, so a font found in the store costs one stat. Lookups are
+memoized:
+
+  locate("BebasNeue-Regular.ttf")      by file name
+  find("Fraunces", 300, "italic")      by family/weight/style — via the
+                                       lockfile, then fontconfig
+
+A font that cannot be found resolves to its path in the store (where
+`fontstore.install()` / scripts/install-fonts.py will put it), so callers
+keep their `path.exists()` checks and ensure_* installers; find() raises
+FontNotFound only for a family that is neither locked nor known to
+fontconfig.
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from brandkit import fontstore, trace
+
+FONT_SUFFIXES = (".ttf", ".otf", ".ttc")
+
+# fontconfig weight → CSS/OpenType weight (FcWeightToOpenType's table)
+_FC_WEIGHTS = ((0, 100), (40, 200), (50, 300), (55, 350), (75, 380), (80, 400),
+               (100, 500), (180, 600), (200, 700), (205, 800), (210, 900), (215, 1000))
+
+
+class FontNotFound(FileNotFoundError):
+    """No font of the requested family/weight/style is known."""
+
+
+def user_dir() -> Path:
+    """The per-user font directory fonts are installed into on this platform."""
+    if sys.platform == "darwin":
+        return Path.home() / "Library" / "Fonts"
+    if sys.platform == "win32":
+        local = os.environ.get("LOCALAPPDATA")
+        base = Path(local) if local else Path.home() / "AppData" / "Local"
+        return base / "Microsoft" / "Windows" / "Fonts"
+    xdg = os.environ.get("XDG_DATA_HOME")
+    return (Path(xdg) if xdg else Path.home() / ".local" / "share") / "fonts"
+
+
+def _system_dirs() -> list:
+    if sys.platform == "darwin":
+        return [Path("/Library/Fonts"), Path("/System/Library/Fonts")]
+    if sys.platform == "win32":
+        return [Path(os.environ.get("WINDIR", r"C:\Windows")) / "Fonts"]
+    data = os.environ.get("XDG_DATA_DIRS") or "/usr/local/share:/usr/share"
+    return [Path(d) / "fonts" for d in data.split(":") if d]
+
+
+@lru_cache(maxsize=1)
+def search_dirs() -> tuple:
+    """Existing font directories, in search order (see module docstring)."""
+    extra = [Path(d) for d in os.environ.get("BRANDKIT_FONT_DIRS", "").split(os.pathsep) if d]
+    dirs = [*extra, fontstore.fonts_dir(), user_dir()]
+    if sys.platform.startswith("linux"):
+        dirs.append(Path.home() / ".fonts")
+    dirs.append(Path.home() / "Library" / "Fonts")  # legacy location; user_dir() on macOS
+    dirs += _system_dirs()
+    out = []
+    for d in dirs:
+        if d.is_dir() and d not in out:
+            out.append(d)
+    return tuple(out)
+
+
+@lru_cache(maxsize=None)
+def _index(directory: Path) -> dict:
+    """file name → path for every font file under `directory` (first found wins)."""
+    found = {}
+    for root, subdirs, files in os.walk(directory):
+        subdirs.sort()
+        for name in sorted(files):
+            if name.lower().endswith(FONT_SUFFIXES):
+                found.setdefault(name, Path(root) / name)
+    return found
+
+
+def _css_weight(fc_weight: int) -> int:
+    return min(_FC_WEIGHTS, key=lambda pair: abs(pair[0] - fc_weight))[1]
+
+
+@lru_cache(maxsize=1)
+def fontconfig() -> tuple:
+    """(path, families, css weight, italic) for every font fontconfig lists; () without fc-list."""
+    fc_list = shutil.which("fc-list")
+    if fc_list is None:
+        return ()
+    try:
+        out = subprocess.run([fc_list, "--format", "%{file}\t%{family}\t%{weight}\t%{slant}\n"],
+                             capture_output=True, text=True, timeout=30, check=True).stdout
+    except (OSError, subprocess.SubprocessError):
+        return ()
+    fonts = []
+    for line in out.splitlines():
+        parts = line.split("\t")
+        if len(parts) != 4 or not parts[0]:
+            continue
+        path, families, weight, slant = parts
+        try:
+            css = _css_weight(int(float(weight or 80)))
+            italic = int(float(slant or 0)) != 0
+        except ValueError:
+            continue
+        fonts.append((Path(path), tuple(f.strip() for f in families.split(",")), css, italic))
+    return tuple(fonts)
+
+
+@lru_cache(maxsize=None)
+def locate(file: str) -> Path:
+    """
+    Path of font file `file` — the first search directory holding it, then
+    fontconfig's — or its store path (fonts/<file>) if it is nowhere yet.
+    """
+    with trace.span(f"locate {file}", "font"):
+        for directory in search_dirs():
+            direct = directory / file
+            if direct.is_file():
+                return direct
+        for directory in search_dirs():
+            path = _index(directory).get(file)
+            if path is not None:
+                return path
+        for path, *_ in fontconfig():
+            if path.name == file:
+                return path
+        return fontstore.fonts_dir() / file
+
+
+@lru_cache(maxsize=None)
+def find(family: str, weight: int = 400, style: str = "normal") -> Path:
+    """Path of the `family` face at `weight` and `style` ("normal" or "italic")."""
+    with trace.span(f"find {family} {weight} {style}", "font"):
+        for entry in fontstore.lock().values():
+            if (entry.family, entry.weight, entry.style) == (family, weight, style):
+                return locate(entry.file)
+        italic = style != "normal"
+        match: Optional[Path] = None
+        for path, families, css, is_italic in fontconfig():
+            if family in families and css == weight and is_italic == italic:
+                match = path
+                break
+        if match is None:
+            raise FontNotFound(
+                f"no {family} {weight} {style} font: it is not in {fontstore.LOCKFILE.name} "
+                "and fontconfig does not list it"
+            )
+        return match
+
+
+def cache_clear() -> None:
+    """Forget every lookup (after installing fonts in this process)."""
+    for fn in (search_dirs, _index, fontconfig, locate, find):
+        fn.cache_clear()
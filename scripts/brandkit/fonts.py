@@ -0,0 +1,241 @@
+"""
+Process-wide font metrics registry.
+
+Every TTF is parsed at most once per process. Its cmap, hmtx, head, glyph
+outline and GPOS (or legacy kern) tables are folded into flat tables keyed by
+codepoint: advances, horizontal ink bounds, and pair kerning expanded to
+(left, right) codepoint pairs. Measuring a string is one dict lookup per
+character plus, with kerning, one per adjacent pair. A full-brand run that
+imports several generators shares the same registry.
+
+Tables are also persisted by brandkit.fontindex, keyed by the font's SHA-256,
+so later processes skip fontTools entirely when measuring.
+
+Kerning is applied only when asked for (kern=True, or BRANDKIT_KERN=1 for the
+default). cairosvg, which rasterizes every committed PNG, places each letter
+by its own advance and never kerns, so the unkerned layout is the one that
+matches the PNGs; browsers viewing the SVGs do kern.
+"""
+
+import math
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from brandkit import build, fontindex, trace
+
+
+def kerning_default() -> bool:
+    return os.environ.get("BRANDKIT_KERN", "") not in ("", "0")
+
+
+@dataclass(frozen=True)
+class FontMetrics:
+    """Advances, ink bounds and pair kerning (font units) keyed by codepoint."""
+
+    name: str
+    units_per_em: int
+    advances: dict
+    bounds: dict
+    kerning: dict
+
+    def advance_px(self, ch: str, font_size: float) -> float:
+        adv = self.advances.get(ord(ch))
+        if adv is None:
+            raise ValueError(f"Glyph missing for '{ch}' (U+{ord(ch):04X}) in {self.name}")
+        return adv / self.units_per_em * font_size
+
+    def kern_px(self, left: str, right: str, font_size: float) -> float:
+        return self.kerning.get((ord(left), ord(right)), 0) / self.units_per_em * font_size
+
+    def kerning_px(self, text: str, font_size: float) -> float:
+        """Total pair adjustment across `text`."""
+        get = self.kerning.get
+        units = sum(get((ord(a), ord(b)), 0) for a, b in zip(text, text[1:]))
+        return units / self.units_per_em * font_size
+
+    def ink_px(self, ch: str, font_size: float) -> tuple:
+        """(xMin, xMax) of the glyph's ink relative to its origin, in px."""
+        lo, hi = self.bounds.get(ord(ch), (0, 0))
+        scale = font_size / self.units_per_em
+        return lo * scale, hi * scale
+
+
+def _pair_value(record) -> int:
+    value = getattr(record, "Value1", None)
+    return getattr(value, "XAdvance", 0) or 0 if value is not None else 0
+
+
+def _gpos_kerning(tt, glyph_cps: dict) -> dict:
+    """
+    Pair adjustments from the GPOS 'kern' feature, by (left, right) codepoint.
+
+    PairPos formats 1 (glyph pairs) and 2 (class pairs) are expanded over the
+    glyphs the cmap reaches. Within a lookup the first subtable that matches
+    a pair wins; adjustments from separate lookups add up.
+    """
+    gpos = tt["GPOS"].table
+    if gpos.FeatureList is None or gpos.LookupList is None:
+        return {}
+    indices = sorted({
+        i for rec in gpos.FeatureList.FeatureRecord if rec.FeatureTag == "kern"
+        for i in rec.Feature.LookupListIndex
+    })
+    kerning = {}
+    for index in indices:
+        lookup = gpos.LookupList.Lookup[index]
+        seen = {}
+        for sub in lookup.SubTable:
+            if lookup.LookupType == 9:
+                sub = sub.ExtSubTable
+            if sub.LookupType != 2:
+                continue
+            covered = [g for g in sub.Coverage.glyphs if g in glyph_cps]
+            if sub.Format == 1:
+                for first, pair_set in zip(sub.Coverage.glyphs, sub.PairSet):
+                    if first not in glyph_cps:
+                        continue
+                    for rec in pair_set.PairValueRecord:
+                        if rec.SecondGlyph in glyph_cps:
+                            seen.setdefault((first, rec.SecondGlyph), _pair_value(rec))
+            elif sub.Format == 2:
+                class1 = sub.ClassDef1.classDefs
+                class2 = sub.ClassDef2.classDefs
+                seconds = list(glyph_cps)
+                for first in covered:
+                    row = sub.Class1Record[class1.get(first, 0)].Class2Record
+                    for second in seconds:
+                        key = (first, second)
+                        if key not in seen:
+                            seen[key] = _pair_value(row[class2.get(second, 0)])
+        for (first, second), value in seen.items():
+            if value:
+                for lcp in glyph_cps[first]:
+                    for rcp in glyph_cps[second]:
+                        kerning[(lcp, rcp)] = kerning.get((lcp, rcp), 0) + value
+    return {k: v for k, v in kerning.items() if v}
+
+
+def _legacy_kerning(tt, glyph_cps: dict) -> dict:
+    kerning = {}
+    for sub in getattr(tt["kern"], "kernTables", []):
+        if getattr(sub, "format", 0) != 0:
+            continue
+        for (first, second), value in sub.kernTable.items():
+            for lcp in glyph_cps.get(first, ()):
+                for rcp in glyph_cps.get(second, ()):
+                    kerning[(lcp, rcp)] = kerning.get((lcp, rcp), 0) + value
+    return {k: v for k, v in kerning.items() if v}
+
+
+def _parse(path: str):
+    from fontTools.pens.boundsPen import BoundsPen
+    from fontTools.ttLib import TTFont
+
+    tt = TTFont(path, lazy=True)
+    cmap = tt.getBestCmap()
+    hmtx = tt["hmtx"].metrics
+    advances = {cp: hmtx[gid][0] for cp, gid in cmap.items()}
+    upm = tt["head"].unitsPerEm
+
+    glyph_cps = {}
+    for cp, name in cmap.items():
+        glyph_cps.setdefault(name, []).append(cp)
+
+    glyphs = tt.getGlyphSet()
+    bounds = {}
+    for name, cps in glyph_cps.items():
+        pen = BoundsPen(glyphs)
+        glyphs[name].draw(pen)
+        if pen.bounds is not None:
+            lo, hi = math.floor(pen.bounds[0]), math.ceil(pen.bounds[2])
+            for cp in cps:
+                bounds[cp] = (lo, hi)
+
+    if "GPOS" in tt:
+        kerning = _gpos_kerning(tt, glyph_cps)
+    elif "kern" in tt:
+        kerning = _legacy_kerning(tt, glyph_cps)
+    else:
+        kerning = {}
+    tt.close()
+    return upm, advances, bounds, kerning
+
+
+@lru_cache(maxsize=None)
+def _load(path: str) -> FontMetrics:
+    with trace.span(f"metrics {Path(path).name}", "font", os.path.getsize(path)):
+        digest = fontindex.font_digest(Path(path))
+        indexed = fontindex.read(digest)
+        if indexed is None:
+            indexed = _parse(path)
+            fontindex.write(digest, *indexed)
+        return FontMetrics(Path(path).name, *indexed)
+
+
+def metrics(font_path: Path) -> FontMetrics:
+    """Return the (cached) metrics for `font_path`."""
+    path = str(Path(font_path).resolve())
+    build.note_input(path)
+    return _load(path)
+
+
+@trace.traced("measure")
+def measure_width(text: str, font_path: Path, font_size: float, ls_em: float,
+                  kern: bool = None) -> float:
+    """Visual ink width (no trailing letter-spacing gap)."""
+    m = metrics(font_path)
+    advances = [m.advance_px(ch, font_size) for ch in text]
+    ls_px = ls_em * font_size
+    width = sum(advances) + (len(text) - 1) * ls_px
+    if kern if kern is not None else kerning_default():
+        width += m.kerning_px(text, font_size)
+    return width
+
+
+def x_after(text: str, font_path: Path, font_size: float, ls_em: float,
+            kern: bool = None) -> float:
+    """Advance width INCLUDING trailing letter-spacing (start-x for next char)."""
+    m = metrics(font_path)
+    ls_px = ls_em * font_size
+    total = 0.0
+    for ch in text:
+        total += m.advance_px(ch, font_size) + ls_px
+    if kern if kern is not None else kerning_default():
+        total += m.kerning_px(text, font_size)
+    return total
+
+
+@trace.traced("measure")
+def split_x(text: str, index: int, font_path: Path, font_size: float, ls_em: float,
+            kern: bool = None) -> float:
+    """
+    x (from the text origin) midway between the ink of text[index - 1] and
+    text[index]: the place to cut a two-colour clip so neither glyph is
+    touched. index 0 gives 0; index len(text) gives the full advance.
+    """
+    if index <= 0:
+        return 0.0
+    if index >= len(text):
+        return x_after(text, font_path, font_size, ls_em, kern)
+    m = metrics(font_path)
+    kern = kern if kern is not None else kerning_default()
+    left, right = text[index - 1], text[index]
+    left_x = x_after(text[:index - 1], font_path, font_size, ls_em, kern)
+    right_x = left_x + m.advance_px(left, font_size) + ls_em * font_size
+    if kern:
+        right_x += m.kern_px(left, right, font_size)
+    ink_right = left_x + m.ink_px(left, font_size)[1]
+    ink_left = right_x + m.ink_px(right, font_size)[0]
+    return (ink_right + ink_left) / 2.0
+
+
+@trace.traced("measure")
+def fit_size(text: str, font_path: Path, font_size: float, ls_em: float,
+             max_width: float) -> float:
+    """`font_size`, or the smaller size at which `text` is exactly `max_width` wide."""
+    width = measure_width(text, font_path, font_size, ls_em)
+    if width <= max_width:
+        return font_size
+    return math.floor(font_size * max_width / width * 100) / 100
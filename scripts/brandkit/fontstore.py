@@ -0,0 +1,295 @@
+"""
+Local content-addressed font store, pinned by scripts/fonts.lock.json.
+
+The lockfile names every font the generators use — file name, family,
+style, weight — with the SHA-256 of its TTF bytes and where it came from
+(a direct URL, or a Google Fonts css2 query). The store keeps each TTF
+once, under its hash:
+
+  <store>/objects/<sha256>.ttf   the bytes, verified on the way in
+  <store>/fonts/<file>           hard link (or copy) named as in the lock
+  <store>/fonts.conf             fontconfig config: the system's, plus fonts/
+
+The store is $BRANDKIT_FONT_STORE, else the brandkit cache's fonts/
+directory. It is filled by scripts/install-fonts.py, either from the
+network or from a directory of TTFs (--import), so a machine without
+network access can be provisioned from a copied store or font directory.
+
+Once every locked font is present, a build needs no network and no
+`fc-cache -f`: configure() points FONTCONFIG_FILE at the store's own config,
+so cairosvg resolves the brand families from fonts/ alone. That config
+includes the system fonts.conf (and through it conf.d), so the system's
+hinting, antialiasing and subpixel settings still apply; it adds fonts/ and
+rejects every other copy of a locked family. The generators' entry points
+call configure() before they render. With BRANDKIT_OFFLINE=1 anything
+missing from the store is an error instead of a download.
+"""
+
+import hashlib
+import io
+import json
+import os
+import re
+import shutil
+import tempfile
+import urllib.request
+from functools import lru_cache
+from pathlib import Path
+from typing import NamedTuple, Optional
+from xml.sax.saxutils import escape
+
+from brandkit.paths import BASE, cache_dir
+
+LOCKFILE = BASE / "scripts" / "fonts.lock.json"
+
+_GF_UA = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
+_CSS_URL = re.compile(r"url\(([^)]+\.(?:woff2|ttf))\)")
+
+
+class FontMissing(RuntimeError):
+    """A locked font is not in the store and may not be downloaded."""
+
+
+class LockEntry(NamedTuple):
+    file: str
+    family: str
+    style: str
+    weight: int
+    sha256: str
+    url: Optional[str] = None
+    css: Optional[str] = None
+
+
+def offline() -> bool:
+    return os.environ.get("BRANDKIT_OFFLINE", "") not in ("", "0")
+
+
+@lru_cache(maxsize=1)
+def lock() -> dict:
+    """file name → LockEntry."""
+    raw = json.loads(LOCKFILE.read_text(encoding="utf-8"))
+    return {e["file"]: LockEntry(**e) for e in raw["fonts"]}
+
+
+def write_lock(entries) -> None:
+    body = {"fonts": [dict((k, v) for k, v in e._asdict().items() if v is not None)
+                      for e in sorted(entries, key=lambda e: e.file)]}
+    LOCKFILE.write_text(json.dumps(body, indent=2) + "\n", encoding="utf-8")
+    lock.cache_clear()
+
+
+def store_dir() -> Path:
+    root = os.environ.get("BRANDKIT_FONT_STORE")
+    d = Path(root) if root else cache_dir("fonts")
+    d.mkdir(parents=True, exist_ok=True)
+    return d
+
+
+def fonts_dir() -> Path:
+    d = store_dir() / "fonts"
+    d.mkdir(exist_ok=True)
+    return d
+
+
+def _object(sha: str) -> Path:
+    return store_dir() / "objects" / f"{sha}.ttf"
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def _link(entry: LockEntry) -> Path:
+    """fonts/<file> for an entry whose object is stored."""
+    target = fonts_dir() / entry.file
+    obj = _object(entry.sha256)
+    try:
+        if target.exists() and os.path.samefile(target, obj):
+            return target
+    except OSError:
+        pass
+    tmp = target.with_name(f".{target.name}.tmp")
+    tmp.unlink(missing_ok=True)
+    try:
+        os.link(obj, tmp)
+    except OSError:
+        shutil.copyfile(obj, tmp)
+    os.replace(tmp, target)
+    return target
+
+
+def add(data: bytes, entry: LockEntry) -> Path:
+    """Store TTF bytes for `entry` after checking them against the lock."""
+    sha = _sha256(data)
+    if sha != entry.sha256:
+        raise ValueError(
+            f"{entry.file}: SHA-256 {sha[:12]}… does not match the lockfile "
+            f"({entry.sha256[:12]}…); run scripts/install-fonts.py --relock to accept it"
+        )
+    obj = _object(sha)
+    if not obj.exists():
+        _atomic_write(obj, data)
+    return _link(entry)
+
+
+def stored(name: str) -> Optional[Path]:
+    """Store path of a locked font if its verified object is present."""
+    entry = lock()[name]
+    if not _object(entry.sha256).exists():
+        return None
+    return _link(entry)
+
+
+def _to_ttf(data: bytes) -> bytes:
+    if data[:4] != b"wOF2":
+        return data
+    from fontTools.ttLib import TTFont
+
+    font = TTFont(io.BytesIO(data))
+    font.flavor = None
+    out = io.BytesIO()
+    font.save(out)
+    return out.getvalue()
+
+
+def _get(url: str, headers: dict = None) -> bytes:
+    req = urllib.request.Request(url, headers=headers or {})
+    with urllib.request.urlopen(req) as r:
+        return r.read()
+
+
+def download(entry: LockEntry) -> bytes:
+    """The TTF bytes for `entry` from its pinned source (network)."""
+    if offline():
+        raise FontMissing(
+            f"{entry.file} ({entry.family} {entry.weight} {entry.style}) is not in the font "
+            f"store at {store_dir()} and BRANDKIT_OFFLINE is set; provision the store with "
+            "scripts/install-fonts.py (online) or scripts/install-fonts.py --import DIR"
+        )
+    url = entry.url
+    if url is None:
+        css = _get(f"https://fonts.googleapis.com/css2?{entry.css}&display=swap",
+                   {"User-Agent": _GF_UA}).decode("utf-8")
+        urls = _CSS_URL.findall(css)
+        if not urls:
+            raise RuntimeError(f"No font URL found in CSS for {entry.css}\n{css[:400]}")
+        url = urls[0]
+    print(f"    Downloading {url}")
+    return _to_ttf(_get(url))
+
+
+def ensure(name: str) -> Path:
+    """Store path of locked font `name`, downloading it once if allowed."""
+    path = stored(name)
+    if path is None:
+        path = add(download(lock()[name]), lock()[name])
+        print(f"    Stored {name} → {path}")
+    return path
+
+
+def install(dest: Path) -> Path:
+    """
+    Make the locked font named dest.name available at `dest` (for scripts
+    that read fonts from a fixed directory): hard link or copy from the
+    store, which is filled first if needed. An existing file is left alone.
+    """
+    dest = Path(dest)
+    if dest.exists():
+        return dest
+    src = ensure(dest.name)
+    if dest.exists():  # dest is the store's own fonts/<file>
+        return dest
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.link(src, dest)
+    except OSError:
+        shutil.copyfile(src, dest)
+    print(f"    Installed → {dest}")
+    return dest
+
+
+def complete() -> bool:
+    """True when every locked font is in the store."""
+    return all(_object(e.sha256).exists() for e in lock().values())
+
+
+# Where fontconfig's own configuration lives, by platform/packaging.
+SYSTEM_CONFIGS = (
+    Path("/etc/fonts/fonts.conf"),
+    Path("/usr/local/etc/fonts/fonts.conf"),
+    Path("/opt/homebrew/etc/fonts/fonts.conf"),
+)
+
+
+def system_fontconfig() -> Optional[Path]:
+    """The system fonts.conf ($FONTCONFIG_PATH's first, else the usual places)."""
+    dirs = [Path(d) / "fonts.conf" for d in os.environ.get("FONTCONFIG_PATH", "").split(os.pathsep) if d]
+    return next((p for p in (*dirs, *SYSTEM_CONFIGS) if p.is_file()), None)
+
+
+def fontconfig_file() -> Path:
+    """
+    A fontconfig config: the system one (rendering settings, font dirs) plus
+    the store's fonts/, with the locked families accepted only from there.
+    """
+    conf = store_dir() / "fonts.conf"
+    system = system_fontconfig()
+    include = f'  <include ignore_missing="yes">{escape(str(system))}</include>\n' if system else ""
+
+    def patterns(name: str, values) -> str:
+        return "".join(f'      <pattern><patelt name="{name}"><string>{escape(str(v))}</string>'
+                       f"</patelt></pattern>\n" for v in values)
+
+    # Pattern rules: an accepted file overrides a rejected family (a glob
+    # accept would not), so only the store's copies of the locked families load.
+    entries = lock().values()
+    accept = patterns("file", sorted(fonts_dir() / e.file for e in entries))
+    reject = patterns("family", sorted({e.family for e in entries}))
+    body = (
+        '<?xml version="1.0"?>\n'
+        '<!DOCTYPE fontconfig SYSTEM "urn:fontconfig:fonts.dtd">\n'
+        "<fontconfig>\n"
+        f"{include}"
+        f"  <dir>{escape(str(fonts_dir()))}</dir>\n"
+        f"  <cachedir>{escape(str(store_dir() / 'fontconfig'))}</cachedir>\n"
+        "  <selectfont>\n"
+        f"    <acceptfont>\n{accept}    </acceptfont>\n"
+        f"    <rejectfont>\n{reject}    </rejectfont>\n"
+        "  </selectfont>\n"
+        "</fontconfig>\n"
+    )
+    if not conf.exists() or conf.read_text(encoding="utf-8") != body:
+        _atomic_write(conf, body.encode("utf-8"))
+    return conf
+
+
+def configure() -> bool:
+    """
+    Point fontconfig at the store when it holds every locked font (and
+    FONTCONFIG_FILE is not already set). Must run before the first render;
+    returns whether the store is in use.
+    """
+    if "FONTCONFIG_FILE" in os.environ:
+        return False
+    try:
+        if not complete():
+            return False
+        for entry in lock().values():
+            _link(entry)
+        os.environ["FONTCONFIG_FILE"] = str(fontconfig_file())
+    except (OSError, ValueError):
+        return False
+    return True
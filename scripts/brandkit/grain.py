@@ -0,0 +1,207 @@
+"""
+Seeded monochrome film grain for the social cards.
+
+The noise field is random.Random(seed).randbytes(w * h), one grey level per
+pixel, composited at a fixed opacity. The blend reproduces Pillow's
+Image.alpha_composite integer arithmetic exactly, so cards are bit-identical
+to the original three-image PIL implementation, but it runs as one
+vectorized pass over the card with NumPy (in place on a uint8 RGB array for
+opaque cards, via a lookup table). Without NumPy the PIL path is used.
+
+Noise fields are cached per (seed, width, height, style), so rendering
+several cards of the same size in one process generates the field once.
+
+Full-entropy per-pixel noise is what keeps a grained card large: deflate
+cannot predict it. A GrainStyle trades entropy for size while keeping the
+same opacity:
+
+  levels   quantize each noise sample to N grey levels with the same spread
+           as the full noise (256 = unquantized)
+  tile     generate a tile×tile field and repeat it across the card, so
+           deflate can back-reference each row's earlier tiles (0 = no tiling)
+
+The default style is the original full-entropy grain. Styles are written as
+"full" or e.g. "levels=4,tile=64"; scripts/grain-report.py tabulates PNG size
+against PSNR for candidate styles.
+"""
+
+import os
+import random
+from functools import lru_cache
+from typing import NamedTuple
+
+from PIL import Image
+
+from brandkit import trace
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional accelerator
+    np = None
+
+# Pillow's AlphaComposite.c fixed-point precision.
+_PRECISION_BITS = 7
+_BLOCK_ROWS = 16
+
+
+class GrainStyle(NamedTuple):
+    levels: int = 256
+    tile: int = 0
+
+    def __str__(self) -> str:
+        if self == FULL:
+            return "full"
+        parts = []
+        if self.levels != 256:
+            parts.append(f"levels={self.levels}")
+        if self.tile:
+            parts.append(f"tile={self.tile}")
+        return ",".join(parts)
+
+
+FULL = GrainStyle()
+
+
+def parse_style(spec: str) -> GrainStyle:
+    """Parse "full" or "levels=N,tile=T" (either key may be omitted)."""
+    spec = spec.strip()
+    if spec in ("", "full"):
+        return FULL
+    values = {}
+    for part in spec.split(","):
+        key, sep, value = part.partition("=")
+        key = key.strip()
+        if not sep or key not in GrainStyle._fields:
+            raise ValueError(f"bad grain style {spec!r}: expected 'full' or 'levels=N,tile=T'")
+        values[key] = int(value)
+    style = FULL._replace(**values)
+    if not 2 <= style.levels <= 256 or style.tile < 0:
+        raise ValueError(f"bad grain style {spec!r}: levels must be 2–256, tile ≥ 0")
+    return style
+
+
+def style_from_env(default: GrainStyle = FULL) -> GrainStyle:
+    """The style named by $BRANDKIT_GRAIN, else `default`."""
+    spec = os.environ.get("BRANDKIT_GRAIN")
+    return default if spec is None else parse_style(spec)
+
+
+@lru_cache(maxsize=4)
+def noise_bytes(seed: int, w: int, h: int, style: GrainStyle = FULL) -> bytes:
+    """The deterministic w×h noise field (one byte per pixel, row-major)."""
+    if not style.tile:
+        noise = random.Random(seed).randbytes(w * h)
+    else:
+        t = style.tile
+        tile = random.Random(seed).randbytes(t * t)
+        reps = -(-w // t)
+        rows = [(tile[r * t:(r + 1) * t] * reps)[:w] for r in range(t)]
+        noise = b"".join(rows[y % t] for y in range(h))
+    if style.levels != 256:
+        noise = noise.translate(_quantizer(style.levels))
+    return noise
+
+
+def _quantizer(n: int) -> bytes:
+    """
+    bytes.translate table mapping 0–255 onto n evenly spaced levels.
+
+    Levels are centred on 127.5 and spaced so their standard deviation equals
+    that of uniform bytes: the grain keeps its visual strength with fewer values.
+    """
+    step = ((256 * 256 - 1) / (n * n - 1)) ** 0.5
+    levels = [round(127.5 + (k - (n - 1) / 2) * step) for k in range(n)]
+    return bytes(levels[v * n // 256] for v in range(256))
+
+
+@lru_cache(maxsize=4)
+def _noise16(seed: int, w: int, h: int, style: GrainStyle):
+    """The noise field widened to uint16, ready to OR into a LUT index."""
+    noise = np.frombuffer(noise_bytes(seed, w, h, style), dtype=np.uint8).reshape(h, w)
+    wide = noise.astype(np.uint16)[..., None]
+    wide.flags.writeable = False
+    return wide
+
+
+@lru_cache(maxsize=None)
+def _lut(alpha: int):
+    """Composite result for every (opaque dst value, noise value) pair, flat [dst << 8 | noise]."""
+    dst = np.arange(256, dtype=np.uint32)[:, None]
+    noise = np.arange(256, dtype=np.uint32)[None, :]
+    coef1 = _coef1(alpha, 255)
+    coef2 = 255 * (1 << _PRECISION_BITS) - coef1
+    lut = _div255(dst * coef2 + noise * coef1 + (0x80 << _PRECISION_BITS))
+    return lut.astype(np.uint8).ravel()
+
+
+def _coef1(src_a, dst_a):
+    outa255 = src_a * 255 + dst_a * (255 - src_a)
+    return src_a * 255 * 255 * (1 << _PRECISION_BITS) // outa255
+
+
+def _div255(tmp):
+    """Pillow's SHIFTFORDIV255 followed by the precision shift."""
+    return (((tmp >> 8) + tmp) >> 8) >> _PRECISION_BITS
+
+
+def overlay_inplace(rgb, opacity: float, seed: int, style: GrainStyle = FULL) -> None:
+    """
+    Grain an opaque card held as a (h, w, 3) uint8 array, in place.
+
+    Over an opaque destination the composite depends only on the destination
+    byte and the noise byte, so each channel value is one lookup in a 64 KB
+    table. Rows are processed in small blocks to keep the index buffer hot.
+    """
+    h, w, _ = rgb.shape
+    alpha = int(255 * opacity)
+    if alpha == 0:
+        return
+    lut = _lut(alpha)
+    noise = _noise16(seed, w, h, style)
+    idx = np.empty((_BLOCK_ROWS, w, 3), dtype=np.uint16)
+    for top in range(0, h, _BLOCK_ROWS):
+        block = rgb[top:top + _BLOCK_ROWS]
+        ix = idx[:block.shape[0]]
+        np.left_shift(block, 8, out=ix, dtype=np.uint16)
+        ix |= noise[top:top + _BLOCK_ROWS]
+        np.take(lut, ix, out=block)
+
+
+def _overlay_rgba(rgba, opacity: float, seed: int, style: GrainStyle):
+    """General case: destination with per-pixel alpha. Returns (h, w, 3) uint8."""
+    h, w, _ = rgba.shape
+    alpha = int(255 * opacity)
+    rgb = rgba[..., :3].copy()
+    if alpha == 0:
+        return rgb
+    noise = np.frombuffer(noise_bytes(seed, w, h, style), dtype=np.uint8).reshape(h, w).astype(np.uint32)
+    coef1 = _coef1(alpha, rgba[..., 3].astype(np.uint32))
+    coef2 = 255 * (1 << _PRECISION_BITS) - coef1
+    bias = noise * coef1 + (0x80 << _PRECISION_BITS)
+    for c in range(3):
+        rgb[..., c] = _div255(rgb[..., c] * coef2 + bias)
+    return rgb
+
+
+def _add_grain_pil(img: Image.Image, opacity: float, seed: int, style: GrainStyle) -> Image.Image:
+    w, h = img.size
+    noise = Image.frombytes("L", (w, h), noise_bytes(seed, w, h, style))
+    alpha_mask = Image.new("L", (w, h), int(255 * opacity))
+    grain_rgba = Image.merge("RGBA", [noise, noise, noise, alpha_mask])
+    return Image.alpha_composite(img.convert("RGBA"), grain_rgba).convert("RGB")
+
+
+def add_grain(img: Image.Image, opacity: float, seed: int,
+              style: GrainStyle = FULL) -> Image.Image:
+    """Overlay seeded monochromatic grain at `opacity`; returns an RGB image."""
+    with trace.span("grain", "grain", img.width * img.height * len(img.getbands())) as span:
+        span.args["style"] = str(style)
+        if np is None:
+            return _add_grain_pil(img, opacity, seed, style)
+        if img.mode != "RGB":
+            img = img.convert("RGBA")
+            if img.getchannel("A").getextrema()[0] < 255:
+                return Image.fromarray(_overlay_rgba(np.asarray(img), opacity, seed, style), "RGB")
+        rgb = np.array(img.convert("RGB"))
+        overlay_inplace(rgb, opacity, seed, style)
+        return Image.fromarray(rgb, "RGB")
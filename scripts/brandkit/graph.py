@@ -0,0 +1,272 @@
+"""
+Dependency graph of build steps, run in topological order.
+
+A build is a DAG of typed nodes:
+
+  fonts   install a font family the generators need (runs in-process)
+  svg     run a generator's planning pass: measure text, write its SVGs and
+          yield the raster jobs it submitted (runs in-process)
+  png     rasterize one PNG — wordmark, icon or social card, the latter
+  ico     including grain and encoding (a brandkit.build Job, run in a pool)
+
+A node runs once every node it depends on has finished. In-process nodes
+run on the main thread one at a time; raster nodes go to a process pool as
+soon as they are ready, so one target's PNGs render while the next target
+is still being planned. An in-process node may return new nodes (an svg
+node returns its raster jobs), which join the graph as its dependents.
+
+The first failure stops the build: nothing new is started, raster jobs
+already running are allowed to finish (and are recorded), and run()
+returns a Report naming the failed node, its error and every node that
+did not run. Raster jobs whose outputs are current in the brandkit.build
+manifest are skipped.
+"""
+
+import os
+import re
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Optional
+
+from brandkit import build, trace
+from brandkit.paths import BASE
+
+FONTS = "fonts"
+SVG = "svg"
+PNG = "png"
+ICO = "ico"
+KINDS = (FONTS, SVG, PNG, ICO)
+
+_FRAME = re.compile(r'File "([^"]+)", line (\d+), in (\S+)')
+
+
+@dataclass
+class Node:
+    name: str
+    kind: str
+    deps: tuple = ()
+    run: Optional[Callable] = None  # in-process nodes; returns None or new nodes
+    job: Optional[build.Job] = None  # pool nodes
+
+    def __post_init__(self):
+        if self.kind not in KINDS:
+            raise ValueError(f"{self.name}: unknown node kind {self.kind!r}")
+        if (self.run is None) == (self.job is None):
+            raise ValueError(f"{self.name}: a node needs exactly one of run= or job=")
+
+
+def job_node(job: build.Job, deps: tuple = ()) -> Node:
+    """A raster node for a submitted Job, named after its (first) output."""
+    out = Path(job.out_path)
+    try:
+        name = str(out.relative_to(BASE))
+    except ValueError:
+        name = str(out)
+    return Node(name, ICO if out.suffix == ".ico" else PNG, tuple(deps), job=job)
+
+
+@dataclass
+class Report:
+    done: list = field(default_factory=list)
+    skipped: list = field(default_factory=list)
+    failed: Optional[Node] = None
+    error: str = ""
+    trace: str = ""
+    not_run: list = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.failed is None
+
+    def summary(self) -> str:
+        rendered = sum(1 for n in self.done if n.job is not None)
+        line = f"{rendered} rendered, {len(self.skipped)} up to date"
+        if self.failed is not None:
+            line += f", 1 failed, {len(self.not_run)} not run"
+        return line
+
+
+class Graph:
+    def __init__(self):
+        self.nodes = {}
+        self._dependents = {}
+
+    def add(self, node: Node) -> Node:
+        if node.name in self.nodes:
+            raise ValueError(f"duplicate node {node.name!r}")
+        for dep in node.deps:
+            if dep not in self.nodes:
+                raise ValueError(f"{node.name}: unknown dependency {dep!r}")
+        self.nodes[node.name] = node
+        self._dependents[node.name] = []
+        for dep in node.deps:
+            self._dependents[dep].append(node.name)
+        return node
+
+    def ancestors(self, names) -> set:
+        """`names` and everything they depend on, transitively."""
+        seen = set()
+        stack = list(names)
+        while stack:
+            name = stack.pop()
+            if name not in seen:
+                seen.add(name)
+                stack.extend(self.nodes[name].deps)
+        return seen
+
+    def descendants(self, name: str) -> set:
+        seen = set()
+        stack = list(self._dependents[name])
+        while stack:
+            child = stack.pop()
+            if child not in seen:
+                seen.add(child)
+                stack.extend(self._dependents[child])
+        return seen
+
+    def order(self) -> list:
+        """Node names in a topological order (insertion order among peers)."""
+        indegree = {name: len(node.deps) for name, node in self.nodes.items()}
+        ready = [name for name, n in indegree.items() if n == 0]
+        out = []
+        while ready:
+            name = ready.pop(0)
+            out.append(name)
+            for child in self._dependents[name]:
+                indegree[child] -= 1
+                if indegree[child] == 0:
+                    ready.append(child)
+        return out
+
+    def run(self, workers: int = None, keep: Callable = None) -> Report:
+        """
+        Run every node (with `keep`, only the raster nodes for which
+        keep(node) is true; planning nodes always run). See module docstring.
+        """
+        workers = workers or os.cpu_count() or 1
+        report = Report()
+        start = time.perf_counter()
+        manifest = build.load_manifest()
+        rebuild = build.rebuild_all()
+        finished = set()
+        waiting = {name: set(node.deps) for name, node in self.nodes.items()}
+        running = {}  # future → node name
+        pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+
+        def finish(node: Node, rendered: bool = True) -> None:
+            if node.job is not None and rendered:
+                build.record(node.job, manifest)
+            (report.done if rendered else report.skipped).append(node)
+            finished.add(node.name)
+            for child in self._dependents[node.name]:
+                waiting[child].discard(node.name)
+
+        def fail(node: Node, exc: BaseException) -> None:
+            report.failed = node
+            report.error = traceback.format_exception_only(type(exc), exc)[-1].strip()
+            remote = exc.__cause__  # concurrent.futures' _RemoteTraceback
+            report.trace = str(remote) if remote is not None else "".join(
+                traceback.format_exception(type(exc), exc, exc.__traceback__))
+
+        def extend(parent: Node, new_nodes) -> None:
+            for node in new_nodes or ():
+                if node.job is not None and keep is not None and not keep(node):
+                    continue
+                node.deps = tuple(dict.fromkeys((*node.deps, parent.name)))
+                self.add(node)
+                waiting[node.name] = {d for d in node.deps if d not in finished}
+
+        def ready() -> list:
+            busy = set(running.values())
+            return [n for n, deps in waiting.items()
+                    if not deps and n not in finished and n not in busy]
+
+        try:
+            while report.failed is None:
+                candidates = ready()
+                for name in candidates:
+                    node = self.nodes[name]
+                    if node.job is None:
+                        continue
+                    if not rebuild and build.is_current(node.job, manifest):
+                        for path in node.job.out_paths:
+                            print(f"  {Path(path).name} (up to date)")
+                        finish(node, rendered=False)
+                    elif pool is not None:
+                        running[pool.submit(build.run_job, node.job)] = name
+                    else:
+                        try:
+                            build.run_job(node.job)
+                        except Exception as exc:
+                            fail(node, exc)
+                            break
+                        finish(node)
+                if report.failed is not None:
+                    break
+
+                local = next((n for n in candidates if self.nodes[n].run is not None), None)
+                if local is not None:
+                    node = self.nodes[local]
+                    try:
+                        with trace.span(node.name, node.kind):
+                            new_nodes = node.run()
+                        extend(node, new_nodes)
+                    except Exception as exc:
+                        fail(node, exc)
+                        break
+                    finish(node)
+                    continue
+
+                if not running:
+                    if ready():
+                        continue
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    node = self.nodes[running.pop(future)]
+                    try:
+                        future.result()
+                    except Exception as exc:
+                        if report.failed is None:
+                            fail(node, exc)
+                    else:
+                        finish(node)
+
+            # Stopped at a failure: start nothing new, but keep what is already rendering.
+            for future in running:
+                future.cancel()
+            for future in wait(running).done:
+                if not future.cancelled() and future.exception() is None:
+                    finish(self.nodes[running[future]])
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+            if report.done:
+                build.save_manifest(manifest)
+        report.not_run = [self.nodes[n] for n in self.order()
+                          if n not in finished and (report.failed is None or n != report.failed.name)]
+        report.seconds = time.perf_counter() - start
+        return report
+
+
+def print_failure(report: Report, graph: Graph) -> None:
+    """The failure section of a build report."""
+    node = report.failed
+    print(f"\nFAILED {node.kind} node {node.name}")
+    print(f"  {report.error}")
+    frames = _FRAME.findall(report.trace)
+    ours = [f for f in frames if Path(f[0]).resolve().is_relative_to(BASE)]
+    if frames:
+        path, line, fn = (ours or frames)[-1]
+        print(f"  at {Path(path).name}:{line} in {fn}")
+    blocked = [n for n in report.not_run if n.name in graph.descendants(node.name)]
+    if blocked:
+        print(f"  blocked {len(blocked)} dependent node(s): "
+              + ", ".join(n.name for n in blocked[:5]) + (" …" if len(blocked) > 5 else ""))
+    others = len(report.not_run) - len(blocked)
+    if others:
+        print(f"  {others} other node(s) not started (stopped at first failure)")
@@ -0,0 +1,216 @@
+"""
+Icon containers: multi-frame .ico and macOS .icns from one SVG.
+
+Every icon set goes through render_icon(), which picks a strategy per
+frame by size:
+
+  native      frames up to NATIVE_MAX px (48) are rendered by cairo at
+              their own size, so strokes land on the small pixel grid and
+              a 16 px frame stays crisp instead of being a blurred shrink
+  downsample  larger frames are resized (Lanczos, premultiplied alpha)
+              from one master render at the largest requested size; the
+              master is cached per SVG, so a 1024 px ICNS set and a 256 px
+              ICO frame from the same mark cost one big cairo render
+
+Each Frame carries its strategy, render time and encoded size, and
+print_frames() reports them. The native renders and the master run
+concurrently: cairo rasterizes outside the GIL, so they overlap on a thread
+pool. Every render parses the SVG afresh (see brandkit.raster), so the
+threads share no cairosvg tree.
+
+write_ico() and write_icns() stream a container straight to its file: the
+directory is computed from the frame lengths up front, then each PNG
+payload is written as-is, instead of growing `entries += …` / `data += …`
+byte strings frame by frame.
+
+  frames = icons.render_icon(svg, [16, 32, 48, 256])
+  icons.write_ico(path / "app.ico", frames)
+  icons.svg_to_ico(svg, path / "app.ico", [16, 32, 48, 256])   # both, reported
+  icons.write_icns(path / "app.icns", icons.render_icon(svg, icons.ICNS_SIZES))
+"""
+
+import io
+import os
+import shutil
+import struct
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import NamedTuple
+
+from PIL import Image
+
+from brandkit import raster, trace
+
+NATIVE = "native"
+DOWNSAMPLE = "downsample"
+NATIVE_MAX = 48
+
+ICO_MAX = 256
+ICNS_SIZES = (16, 32, 64, 128, 256, 512, 1024)
+
+# Pixel size → the ICNS element types that hold a PNG of that size; ic11–ic14
+# and ic10 are the @2x slots of the 16–512 pt icons, so they share frames.
+ICNS_TYPES = {
+    16: (b"icp4",),
+    32: (b"icp5", b"ic11"),
+    64: (b"icp6", b"ic12"),
+    128: (b"ic07",),
+    256: (b"ic08", b"ic13"),
+    512: (b"ic09", b"ic14"),
+    1024: (b"ic10",),
+}
+
+
+class Frame(NamedTuple):
+    size: int
+    png: bytes
+    method: str
+    seconds: float
+
+
+def frame_workers(count: int) -> int:
+    """Threads for rendering `count` frames: $BRANDKIT_FRAME_WORKERS, else the CPU count."""
+    env = os.environ.get("BRANDKIT_FRAME_WORKERS")
+    workers = int(env) if env else (os.cpu_count() or 1)
+    return max(1, min(workers, count))
+
+
+def _timed_render(doc: raster.SvgDocument, size: int) -> tuple:
+    start = time.perf_counter()
+    png = doc.render_png(size, size)
+    return png, time.perf_counter() - start
+
+
+@lru_cache(maxsize=4)
+def _master(svg: str, size: int) -> tuple:
+    """(RGBA image, png bytes, seconds) of the downsampling master (memoized)."""
+    png, seconds = _timed_render(raster.load(svg), size)
+    return Image.open(io.BytesIO(png)).convert("RGBA"), png, seconds
+
+
+def _downsample(master: Image.Image, size: int) -> tuple:
+    start = time.perf_counter()
+    out = io.BytesIO()
+    master.resize((size, size), Image.LANCZOS).save(out, format="PNG")
+    return out.getvalue(), time.perf_counter() - start
+
+
+def render_icon(svg: str, sizes, native_max: int = NATIVE_MAX, workers: int = None) -> list:
+    """
+    Square PNG frames of `svg`, one Frame per size in the order of `sizes`:
+    native renders up to `native_max` px, the rest downsampled from a master
+    at the largest size. Rendered on `workers` threads (default: frame_workers()).
+    """
+    with trace.span("render_icon", "raster", len(svg)) as span:
+        frames = _render_icon(svg, list(dict.fromkeys(sizes)), native_max, workers)
+        span.args["sizes"] = [f.size for f in frames]
+        span.bytes_out = sum(len(f.png) for f in frames)
+        return frames
+
+
+def _render_icon(svg: str, sizes: list, native_max: int, workers: int) -> list:
+    native = [s for s in sizes if s <= native_max]
+    large = [s for s in sizes if s > native_max]
+    master_size = max(large) if large else None
+    workers = workers or frame_workers(len(native) + (master_size is not None))
+
+    doc = raster.load(svg)
+    if workers == 1:
+        rendered = {s: _timed_render(doc, s) for s in native}
+        master = _master(svg, master_size) if large else None
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # The master (largest) first, so the long render starts before the quick ones.
+            pending = pool.submit(_master, svg, master_size) if large else None
+            futures = {s: pool.submit(_timed_render, doc, s) for s in sorted(native, reverse=True)}
+            rendered = {s: f.result() for s, f in futures.items()}
+            master = pending.result() if pending is not None else None
+
+    frames = []
+    for size in sizes:
+        if size in rendered:
+            png, seconds = rendered[size]
+            frames.append(Frame(size, png, NATIVE, seconds))
+        elif size == master_size:
+            _, png, seconds = master
+            frames.append(Frame(size, png, NATIVE, seconds))
+        else:
+            png, seconds = _downsample(master[0], size)
+            frames.append(Frame(size, png, DOWNSAMPLE, seconds))
+    return frames
+
+
+def print_frames(frames) -> None:
+    """One report line per frame: size, strategy, render time, encoded size."""
+    for f in frames:
+        print(f"    {f.size:>4}px  {f.method:<10} {f.seconds * 1000:7.1f} ms  {len(f.png):>7,} B")
+
+
+def _copies(out_paths) -> tuple:
+    paths = (out_paths,) if isinstance(out_paths, (str, Path)) else tuple(out_paths)
+    return tuple(Path(p) for p in paths)
+
+
+def _replicate(paths: tuple) -> None:
+    for path in paths[1:]:
+        shutil.copyfile(paths[0], path)
+
+
+def write_ico(out_paths, frames) -> None:
+    """
+    A Vista-style .ico with one PNG-compressed, 32-bit entry per Frame in
+    `frames`; sizes above 256 px are not representable. `out_paths` may be
+    one path or several that receive the same file.
+    """
+    frames = list(frames)
+    too_big = [f.size for f in frames if f.size > ICO_MAX]
+    if too_big:
+        raise ValueError(f"ICO frames are at most {ICO_MAX}px; got {too_big}")
+    paths = _copies(out_paths)
+    n = len(frames)
+    offset = 6 + n * 16
+    with open(paths[0], "wb") as f:
+        f.write(struct.pack("<HHH", 0, 1, n))
+        for frame in frames:
+            dim = frame.size if frame.size < ICO_MAX else 0
+            f.write(struct.pack("<BBBBHHII", dim, dim, 0, 0, 1, 32, len(frame.png), offset))
+            offset += len(frame.png)
+        for frame in frames:
+            f.write(frame.png)
+    _replicate(paths)
+
+
+def svg_to_ico(svg: str, out_paths, sizes, base: Path = None) -> list:
+    """
+    render_icon() `svg` at `sizes` and write_ico() the frames to `out_paths`,
+    printing each path (relative to `base`, if given) and the frame table.
+    Returns the frames.
+    """
+    frames = render_icon(svg, sizes)
+    write_ico(out_paths, frames)
+    for path in _copies(out_paths):
+        print(f"  {path.relative_to(base) if base is not None else path} (ICO frames: {list(sizes)})")
+    print_frames(frames)
+    return frames
+
+
+def write_icns(out_paths, frames) -> None:
+    """
+    A macOS .icns holding each Frame in `frames` under every element type
+    for its size (ICNS_TYPES); other sizes are rejected.
+    """
+    frames = sorted(frames, key=lambda f: f.size)
+    unknown = [f.size for f in frames if f.size not in ICNS_TYPES]
+    if unknown:
+        raise ValueError(f"no ICNS element type for {unknown}px (sizes: {ICNS_SIZES})")
+    paths = _copies(out_paths)
+    elements = [(t, f.png) for f in frames for t in ICNS_TYPES[f.size]]
+    total = 8 + sum(8 + len(png) for _, png in elements)
+    with open(paths[0], "wb") as f:
+        f.write(b"icns" + struct.pack(">I", total))
+        for ostype, png in elements:
+            f.write(ostype + struct.pack(">I", 8 + len(png)))
+            f.write(png)
+    _replicate(paths)
@@ -0,0 +1,58 @@
+"""
+Text-to-outline conversion for wordmarks.
+
+Emits the glyph contours of a string as a single SVG path `d`, laid out with
+the same advance + letter-spacing (+ optional pair kerning) model as
+brandkit.fonts.x_after, so an outlined wordmark lines up exactly with its
+measured rule and canvas. The
+result has no font dependency: no @font-face payload, no fontconfig lookup.
+"""
+
+from functools import lru_cache
+from pathlib import Path
+
+from brandkit import fonts
+
+
+def _num(v: float) -> str:
+    s = f"{v:.2f}".rstrip("0").rstrip(".")
+    return "0" if s == "-0" else s
+
+
+@lru_cache(maxsize=None)
+def _font(path: str):
+    from fontTools.ttLib import TTFont
+
+    tt = TTFont(path, lazy=True)
+    return tt.getGlyphSet(), tt.getBestCmap(), tt["hmtx"].metrics, tt["head"].unitsPerEm
+
+
+def text_path_d(text: str, font_path: Path, font_size: float, ls_em: float,
+                x: float, y: float, kern: bool = None) -> str:
+    """
+    SVG path data for `text` with its alphabetic baseline at (x, y).
+
+    Each glyph is drawn through a transform that scales font units to px and
+    flips the y axis (font units grow upward, SVG user units grow downward).
+    `kern` follows brandkit.fonts (default: $BRANDKIT_KERN).
+    """
+    from fontTools.pens.svgPathPen import SVGPathPen
+    from fontTools.pens.transformPen import TransformPen
+
+    glyphs, cmap, hmtx, upm = _font(str(Path(font_path).resolve()))
+    scale = font_size / upm
+    ls_px = ls_em * font_size
+    pen = SVGPathPen(glyphs, ntos=_num)
+    if kern is None:
+        kern = fonts.kerning_default()
+    m = fonts.metrics(font_path) if kern else None
+    cursor = x
+    for i, ch in enumerate(text):
+        name = cmap.get(ord(ch))
+        if name is None:
+            raise ValueError(f"Glyph missing for '{ch}' (U+{ord(ch):04X}) in {Path(font_path).name}")
+        glyphs[name].draw(TransformPen(pen, (scale, 0, 0, -scale, cursor, y)))
+        cursor += hmtx[name][0] * scale + ls_px
+        if m is not None and i + 1 < len(text):
+            cursor += m.kern_px(ch, text[i + 1], font_size)
+    return pen.getCommands()
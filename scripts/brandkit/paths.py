@@ -0,0 +1,26 @@
+"""
+Repository and cache locations shared by the brand generators.
+"""
+
+import os
+from pathlib import Path
+
+BASE = Path(__file__).resolve().parent.parent.parent
+
+
+def cache_dir(*parts: str) -> Path:
+    """
+    Per-user cache directory for derived build data (never committed).
+
+    $BRANDKIT_CACHE_DIR overrides the default of $XDG_CACHE_HOME/custodyzero-brand
+    (~/.cache/custodyzero-brand when XDG_CACHE_HOME is unset).
+    """
+    root = os.environ.get("BRANDKIT_CACHE_DIR")
+    if root:
+        base = Path(root)
+    else:
+        xdg = os.environ.get("XDG_CACHE_HOME")
+        base = (Path(xdg) if xdg else Path.home() / ".cache") / "custodyzero-brand"
+    d = base.joinpath(*parts)
+    d.mkdir(parents=True, exist_ok=True)
+    return d
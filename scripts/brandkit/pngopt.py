@@ -0,0 +1,305 @@
+"""
+Lossless PNG optimizer, run on every PNG a build job writes.
+
+cairo and Pillow write PNGs with one fixed filter choice and zlib's default
+settings. optimize() re-encodes the same pixels as the smallest PNG it can
+find:
+
+  reduce    drop an alpha channel that is fully opaque, and store colour
+            that is all grey (R = G = B) as greyscale — fewer bytes per pixel
+            before deflate sees them
+  palette   an image with at most 256 distinct RGBA colours (a flat brand
+            colour plus its antialiased edge over transparency) is also
+            tried as an indexed PNG holding exactly those colours: PLTE,
+            a tRNS alpha table, and 1, 2, 4 or 8 bits per pixel by count
+  filter    every PNG row filter (none, sub, up, average, Paeth) applied to
+            the whole image, plus per-row adaptive selection (minimum sum
+            of absolute differences, as libpng does)
+  deflate   zlib strategies (default, filtered, RLE) at each of LEVELS,
+            tried for the two filters that compressed best at level 9
+
+The original bytes are a candidate too, so a file never grows, and the
+winner is decoded and compared with the input before it is used. Colour
+space chunks (gAMA, cHRM, sRGB, iCCP) and pHYs are carried over as-is. When the
+colours do not fit a palette, the truecolour encoding is used.
+Without NumPy the filter step is Pillow's own (adaptive) and only the zlib
+settings are searched.
+
+Results are cached by the SHA-256 of the input in the brandkit cache
+(pngopt/), so unchanged renders cost one hash on the next build.
+brandkit.build.run_job() optimizes each .png output in the worker that
+rendered it and prints the bytes saved.
+"""
+
+import hashlib
+import io
+import os
+import struct
+import zlib
+from pathlib import Path
+from typing import NamedTuple
+
+from PIL import Image, ImageChops
+
+from brandkit import trace
+from brandkit.paths import cache_dir
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional accelerator
+    np = None
+
+# Bump when the search changes, so cached results are recomputed.
+VERSION = 2
+
+SIGNATURE = b"\x89PNG\r\n\x1a\n"
+STRATEGIES = {"default": zlib.Z_DEFAULT_STRATEGY, "filtered": zlib.Z_FILTERED, "rle": zlib.Z_RLE}
+LEVELS = (9, 6)
+FILTERS = ("none", "sub", "up", "avg", "paeth")
+ADAPTIVE = "adaptive"
+KEEP_CHUNKS = (b"gAMA", b"cHRM", b"sRGB", b"iCCP", b"pHYs")
+
+PALETTE_MAX = 256
+
+# Pillow mode → (PNG colour type, bytes per pixel)
+_COLOR_TYPES = {"L": (0, 1), "RGB": (2, 3), "LA": (4, 2), "RGBA": (6, 4)}
+_INDEXED = 3
+
+
+class Result(NamedTuple):
+    data: bytes
+    method: str  # e.g. "RGB paeth/filtered/9", "P4 none/rle/9", "original", "cached"
+
+
+class Palette(NamedTuple):
+    image: Image.Image  # mode "P", one index per pixel
+    depth: int          # bits per index: 1, 2, 4 or 8
+    plte: bytes
+    trns: bytes         # alpha of the leading entries; empty if all are opaque
+
+
+def _chunks(png: bytes):
+    """(type, data) for each chunk of a PNG."""
+    pos = len(SIGNATURE)
+    while pos + 8 <= len(png):
+        length, ctype = struct.unpack(">I4s", png[pos:pos + 8])
+        yield ctype, png[pos + 8:pos + 8 + length]
+        pos += 12 + length
+
+
+def _chunk(ctype: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + ctype + data + struct.pack(">I", zlib.crc32(ctype + data))
+
+
+def _reduce(img: Image.Image) -> Image.Image:
+    """The image in the smallest lossless mode among L, LA, RGB, RGBA."""
+    if img.mode == "RGBA" and img.getchannel("A").getextrema() == (255, 255):
+        img = img.convert("RGB")
+    if img.mode in ("RGB", "RGBA"):
+        r, g, b = img.getchannel("R"), img.getchannel("G"), img.getchannel("B")
+        if ImageChops.difference(r, g).getbbox() is None and ImageChops.difference(g, b).getbbox() is None:
+            img = Image.merge("LA", (r, img.getchannel("A"))) if img.mode == "RGBA" else r
+    return img
+
+
+def _palette(img: Image.Image):
+    """
+    `img` as an exact Palette, or None if it has more than PALETTE_MAX
+    colours. Translucent entries come first (most frequent first) so tRNS
+    stops at the last of them; opaque entries follow.
+    """
+    rgba = img.convert("RGBA")
+    colors = rgba.getcolors(PALETTE_MAX)
+    if colors is None:
+        return None
+    entries = [c for _, c in sorted(colors, key=lambda nc: (nc[1][3] == 255, -nc[0]))]
+    if np is not None:
+        keys = np.frombuffer(rgba.tobytes(), dtype=">u4")
+        palette_keys = np.array([int.from_bytes(bytes(c), "big") for c in entries], dtype=np.uint32)
+        order = palette_keys.argsort()
+        pos = np.searchsorted(palette_keys[order], keys)
+        indices = order[pos].astype(np.uint8).tobytes()
+    else:
+        index = {c: i for i, c in enumerate(entries)}
+        indices = bytes(index[c] for c in rgba.getdata())
+    image = Image.frombytes("P", img.size, indices)
+    image.putpalette(b"".join(bytes(c[:3]) for c in entries))
+    translucent = sum(1 for c in entries if c[3] < 255)
+    trns = bytes(c[3] for c in entries[:translucent])
+    if trns:
+        image.info["transparency"] = trns
+    depth = next(d for d in (1, 2, 4, 8) if len(entries) <= 1 << d)
+    return Palette(image, depth, b"".join(bytes(c[:3]) for c in entries), trns)
+
+
+def _rows(img: Image.Image, depth: int = 8):
+    """The image's scanlines as a (height, row bytes) array, indices packed to `depth` bits."""
+    _, bpp = _COLOR_TYPES.get(img.mode, (_INDEXED, 1))
+    raw = np.frombuffer(img.tobytes(), dtype=np.uint8).reshape(img.height, img.width * bpp)
+    if depth == 8:
+        return raw
+    per = 8 // depth
+    pad = -img.width % per
+    grouped = np.pad(raw, ((0, 0), (0, pad))).reshape(img.height, -1, per)
+    shifts = np.arange(8 - depth, -1, -depth, dtype=np.uint8)
+    return np.bitwise_or.reduce(grouped << shifts, axis=2).astype(np.uint8)
+
+
+def _filtered(raw, bpp: int) -> dict:
+    """
+    Filter name → the filtered scanline stream (filter byte + row) for each
+    filter, over `raw` rows of `bpp` bytes per pixel (1 for packed indices).
+    """
+    height = raw.shape[0]
+    x = raw.astype(np.int16)
+    a = np.zeros_like(x)
+    a[:, bpp:] = x[:, :-bpp]
+    b = np.zeros_like(x)
+    b[1:] = x[:-1]
+    c = np.zeros_like(x)
+    c[1:, bpp:] = x[:-1, :-bpp]
+
+    p = a + b - c
+    pa, pb, pc = np.abs(p - a), np.abs(p - b), np.abs(p - c)
+    paeth = np.where((pa <= pb) & (pa <= pc), a, np.where(pb <= pc, b, c))
+    rows = {
+        "none": x,
+        "sub": x - a,
+        "up": x - b,
+        "avg": x - ((a + b) >> 1),
+        "paeth": x - paeth,
+    }
+    rows = {name: (r & 0xFF).astype(np.uint8) for name, r in rows.items()}
+
+    # Adaptive: per row, the filter whose output has the smallest sum of |signed bytes|.
+    cost = np.stack([np.abs(rows[f].view(np.int8).astype(np.int32)).sum(axis=1) for f in FILTERS])
+    best = cost.argmin(axis=0)
+    stacked = np.stack([rows[f] for f in FILTERS])
+    adaptive = stacked[best, np.arange(height)]
+
+    streams = {}
+    for name, (types, data) in {
+        **{f: (np.full(height, i, dtype=np.uint8), rows[f]) for i, f in enumerate(FILTERS)},
+        ADAPTIVE: (best.astype(np.uint8), adaptive),
+    }.items():
+        streams[name] = np.hstack([types[:, None], data]).tobytes()
+    return streams
+
+
+def _deflate(stream: bytes, level: int, strategy: int) -> bytes:
+    z = zlib.compressobj(level, zlib.DEFLATED, 15, 9, strategy)
+    return z.compress(stream) + z.flush()
+
+
+def _assemble(img: Image.Image, idat: bytes, kept: list, palette: Palette = None) -> bytes:
+    if palette is None:
+        color_type, depth, tables = _COLOR_TYPES[img.mode][0], 8, []
+    else:
+        color_type, depth = _INDEXED, palette.depth
+        tables = [(b"PLTE", palette.plte)] + ([(b"tRNS", palette.trns)] if palette.trns else [])
+    ihdr = struct.pack(">IIBBBBB", img.width, img.height, depth, color_type, 0, 0, 0)
+    return (SIGNATURE + _chunk(b"IHDR", ihdr) + b"".join(_chunk(t, d) for t, d in kept + tables)
+            + _chunk(b"IDAT", idat) + _chunk(b"IEND", b""))
+
+
+def _label(img: Image.Image, palette: Palette = None) -> str:
+    return img.mode if palette is None else f"P{palette.depth}"
+
+
+def _search_numpy(img: Image.Image, kept: list, palette: Palette = None) -> tuple:
+    if palette is None:
+        streams = _filtered(_rows(img), _COLOR_TYPES[img.mode][1])
+    else:
+        streams = _filtered(_rows(palette.image, palette.depth), 1)
+    tried = {}
+    for name, stream in streams.items():
+        tried[(name, "default", 9)] = _deflate(stream, 9, STRATEGIES["default"])
+    leaders = sorted(streams, key=lambda n: len(tried[(n, "default", 9)]))[:2]
+    for name in leaders:
+        for strategy, zs in STRATEGIES.items():
+            for level in LEVELS:
+                if (name, strategy, level) not in tried:
+                    tried[(name, strategy, level)] = _deflate(streams[name], level, zs)
+    (name, strategy, level), idat = min(tried.items(), key=lambda kv: len(kv[1]))
+    return _assemble(img, idat, kept, palette), f"{_label(img, palette)} {name}/{strategy}/{level}"
+
+
+def _search_pillow(img: Image.Image, kept: list, palette: Palette = None) -> tuple:
+    label = _label(img, palette)
+    options = {}
+    if palette is not None:
+        img = palette.image
+        options["bits"] = palette.depth
+    best = None
+    for strategy, zs in STRATEGIES.items():
+        for level in LEVELS:
+            buf = io.BytesIO()
+            img.save(buf, format="PNG", compress_level=level, compress_type=zs, **options)
+            if best is None or buf.tell() < len(best[0]):
+                best = (buf.getvalue(), f"{label} pillow/{strategy}/{level}")
+    data, method = best
+    chunks = [(t, d) for t, d in _chunks(data) if t not in KEEP_CHUNKS]
+    return SIGNATURE + b"".join(_chunk(t, d) for t, d in chunks[:1] + kept + chunks[1:]), method
+
+
+def _same_pixels(a: bytes, b: bytes) -> bool:
+    ia, ib = Image.open(io.BytesIO(a)), Image.open(io.BytesIO(b))
+    return ia.size == ib.size and ia.convert("RGBA").tobytes() == ib.convert("RGBA").tobytes()
+
+
+def search(png: bytes) -> Result:
+    """The smallest lossless re-encoding of `png` (uncached)."""
+    img = Image.open(io.BytesIO(png))
+    bit_depth = png[24] if png[12:16] == b"IHDR" else 0
+    if img.mode not in _COLOR_TYPES or bit_depth != 8:  # palette, 1-bit, 16-bit: left alone
+        return Result(png, "original")
+    img.load()
+    reduced = _reduce(img)
+    kept = [(t, d) for t, d in _chunks(png) if t in KEEP_CHUNKS]
+    encode = _search_numpy if np is not None else _search_pillow
+    palettes = [None]  # truecolour
+    if reduced.mode != "L":  # greyscale is already one byte per pixel
+        palette = _palette(reduced)
+        if palette is not None:
+            palettes.append(palette)
+    best = Result(png, "original")
+    for palette in palettes:
+        data, method = encode(reduced, kept, palette)
+        if len(data) < len(best.data) and _same_pixels(png, data):
+            best = Result(data, method)
+    return best
+
+
+def _cache_path(digest: str) -> Path:
+    return cache_dir("pngopt") / f"{digest}-v{VERSION}{'' if np is not None else '-pil'}.png"
+
+
+def optimize(png: bytes) -> Result:
+    """search(png), memoized on disk by the input's SHA-256."""
+    path = _cache_path(hashlib.sha256(png).hexdigest())
+    if path.exists():
+        return Result(path.read_bytes(), "cached")
+    with trace.span("pngopt", "encode", len(png)) as span:
+        result = search(png)
+        span.args["method"] = result.method
+        span.bytes_out = len(result.data)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        tmp.write_bytes(result.data)
+        tmp.replace(path)
+    except OSError:
+        tmp.unlink(missing_ok=True)
+    return result
+
+
+def optimize_file(path) -> int:
+    """Optimize the PNG at `path` in place; prints and returns the bytes saved."""
+    path = Path(path)
+    png = path.read_bytes()
+    result = optimize(png)
+    saved = len(png) - len(result.data)
+    if saved > 0:
+        path.write_bytes(result.data)
+        print(f"  {path.name}: {len(png):,} → {len(result.data):,} B "
+              f"(−{saved / len(png):.1%}, {result.method})")
+    return saved
@@ -0,0 +1,67 @@
+"""
+SVG rasterization through cairosvg.
+
+cairosvg writes layout state into the parsed tree while it draws: cached
+bounding boxes (text extents included, measured at the first render's
+scale), patterns and masks rewritten in place. A tree rendered a second
+time, at another size or from another thread, can therefore give
+different pixels. SvgDocument keeps the SVG source and parses a fresh tree
+for every render; load() and load_file() return such documents for SVG
+text and files.
+
+Entry points call brandkit.fontstore.configure() before they render, to
+point fontconfig at the local font store. cairosvg is imported on the first
+parse, not with this module, so nothing touches fontconfig before then.
+"""
+
+import io
+from pathlib import Path
+
+from brandkit import trace
+
+
+class SvgDocument:
+    """SVG source, rendered to PNG at any output size from a fresh parse each time."""
+
+    def __init__(self, bytestring: bytes = None, url: str = None, dpi: float = 96):
+        if bytestring is None:
+            bytestring = Path(url).read_bytes()
+        self.source = bytestring
+        self.url = url
+        self.dpi = dpi
+
+    def parse(self):
+        """A new cairosvg tree of the source (never reused across renders)."""
+        from cairosvg.parser import Tree
+
+        with trace.span("parse", "raster", len(self.source)):
+            return Tree(bytestring=self.source, url=self.url)
+
+    def render_png(self, width: int, height: int) -> bytes:
+        from cairosvg.surface import PNGSurface
+
+        tree = self.parse()
+        with trace.span("render", "raster") as span:
+            out = io.BytesIO()
+            PNGSurface(tree, out, self.dpi,
+                       output_width=width, output_height=height).finish()
+            span.args["size"] = f"{width}x{height}"
+            span.bytes_out = out.tell()
+            return out.getvalue()
+
+    def render_many(self, sizes) -> list:
+        """PNG bytes for each (width, height) in `sizes`, in order."""
+        return [self.render_png(w, h) for w, h in sizes]
+
+    def write_png(self, out_path: Path, width: int, height: int) -> None:
+        Path(out_path).write_bytes(self.render_png(width, height))
+
+
+def load(svg: str) -> SvgDocument:
+    """Document for SVG source text."""
+    return SvgDocument(bytestring=svg.encode("utf-8"))
+
+
+def load_file(svg_path: Path) -> SvgDocument:
+    """Document for an SVG file (read now; relative references resolve against it)."""
+    return SvgDocument(url=str(Path(svg_path).resolve()))
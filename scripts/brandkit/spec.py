@@ -0,0 +1,160 @@
+"""
+Declarative brand specs: brand/<name>/brand.json.
+
+A spec holds everything that used to be a constant in a per-brand generator
+script — wordmark text, font, colors, canvas and letter-spacing, the colour
+variants to emit and the icon mark itself — and scripts/generate-brand.py
+renders any number of them in one pass. Adding a product (or a variant of
+one) is a new spec file, not a new script.
+
+  {
+    "title": "Valet",
+    "colors": {"white": "#F2F2EC", "bronze": "#9D7E49"},
+    "wordmark": {
+      "text": "VALET",
+      "font": {"file": "BebasNeue-Regular.ttf", "family": "Bebas Neue",
+               "generic": "sans-serif", "fallback_url": "https://…woff2"},
+      "canvas_h": 72, "font_size": 72.0, "letter_spacing_em": 0.12,
+      "x_start": 3.0, "y_baseline": 66.0,
+      "canvas_w": null,                  // null: fit the text + pad_right
+      "pad_right": 3,
+      "rule": null,                      // or {"y": 69.0, "color": "blue", "width": 1}
+      "variants": {"dark": "white", "bronze": "bronze"},
+      "scales": [2, 3]
+    },
+    "icon": {
+      "variant": "dark", "size": 64, "scales": [2, 3], "ico_sizes": [16, 32, 48],
+      "body": ["  <line … stroke=\\"{bronze}\\" …/>", …]
+    }
+  }
+
+Colors are referenced by name; icon body lines are SVG with {color}
+placeholders, wrapped in a size×size <svg> element.
+"""
+
+import json
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+from brandkit import fontpaths
+from brandkit.paths import BASE
+
+SPEC_FILE = "brand.json"
+
+
+class Font(NamedTuple):
+    file: str
+    family: str
+    generic: str
+    fallback_url: str
+
+    @property
+    def path(self) -> Path:
+        return fontpaths.locate(self.file)
+
+
+class Rule(NamedTuple):
+    y: float
+    color: str
+    width: float
+
+
+class Wordmark(NamedTuple):
+    text: str
+    font: Font
+    canvas_h: int
+    font_size: float
+    letter_spacing_em: float
+    x_start: float
+    y_baseline: float
+    canvas_w: Optional[int]
+    pad_right: float
+    rule: Optional[Rule]
+    variants: dict
+    scales: tuple
+
+
+class Icon(NamedTuple):
+    variant: str
+    size: int
+    scales: tuple
+    ico_sizes: tuple
+    body: tuple
+
+
+class BrandSpec(NamedTuple):
+    name: str
+    title: str
+    colors: dict
+    wordmark: Wordmark
+    icon: Icon
+
+    @property
+    def root(self) -> Path:
+        return BASE / "brand" / self.name
+
+    def color(self, ref: str) -> str:
+        """A color by name, or a literal #hex."""
+        if ref.startswith("#"):
+            return ref
+        try:
+            return self.colors[ref]
+        except KeyError:
+            raise ValueError(f"{self.name}: unknown color {ref!r}") from None
+
+
+def spec_path(name: str) -> Path:
+    return BASE / "brand" / name / SPEC_FILE
+
+
+def discover() -> list:
+    """Names of every brand with a spec, sorted."""
+    return sorted(p.parent.name for p in (BASE / "brand").glob(f"*/{SPEC_FILE}"))
+
+
+def load(name: str) -> BrandSpec:
+    """Parse and validate brand/<name>/brand.json; raises ValueError on a bad spec."""
+    path = spec_path(name)
+    try:
+        raw = json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        raise ValueError(f"no brand spec at {path}") from None
+    except ValueError as exc:
+        raise ValueError(f"{path}: {exc}") from None
+    try:
+        wm = raw["wordmark"]
+        icon = raw["icon"]
+        rule = wm.get("rule")
+        spec = BrandSpec(
+            name=name,
+            title=raw["title"],
+            colors=dict(raw["colors"]),
+            wordmark=Wordmark(
+                text=wm["text"],
+                font=Font(**wm["font"]),
+                canvas_h=int(wm["canvas_h"]),
+                font_size=float(wm["font_size"]),
+                letter_spacing_em=float(wm["letter_spacing_em"]),
+                x_start=float(wm["x_start"]),
+                y_baseline=float(wm["y_baseline"]),
+                canvas_w=wm.get("canvas_w"),
+                pad_right=wm.get("pad_right", 3),
+                rule=Rule(**rule) if rule else None,
+                variants=dict(wm["variants"]),
+                scales=tuple(wm.get("scales", (2, 3))),
+            ),
+            icon=Icon(
+                variant=icon.get("variant", "dark"),
+                size=int(icon.get("size", 64)),
+                scales=tuple(icon.get("scales", (2, 3))),
+                ico_sizes=tuple(icon.get("ico_sizes", (16, 32, 48))),
+                body=tuple(icon["body"]),
+            ),
+        )
+    except (KeyError, TypeError) as exc:
+        raise ValueError(f"{path}: missing or invalid field {exc}") from None
+    for ref in spec.wordmark.variants.values():
+        spec.color(ref)
+    if spec.wordmark.rule:
+        spec.color(spec.wordmark.rule.color)
+    return spec
@@ -0,0 +1,302 @@
+"""
+Build tracing: timed spans, exported as a Chrome trace, with profiling on demand.
+
+The generators only print progress lines, which say what was written but
+not where the time went. brandkit marks each stage of a build as a span:
+
+  font      font resolution (fontpaths), metrics loading (fonts), embedding (embed)
+  measure   text measurement (fonts.measure_width, split_x, fit_size)
+  svg       SVG assembly (each generator's *_svg / build_svg) and planning passes
+  raster    cairosvg parsing and rendering (raster.SvgDocument), icon sets (icons)
+  grain     the film-grain overlay (grain.add_grain)
+  encode    PNG/WebP/AVIF encoding (card_png, encode, pngopt)
+  job       one build job or graph node (build.run_job, graph)
+
+Each span records its wall time, the bytes it took in and produced where
+that means something (SVG text, PNG bytes, pixels), and the process's peak
+RSS when it ended. Nothing is recorded unless one of these is set:
+
+  BRANDKIT_TRACE=build.json       write every span of the run (all worker
+                                  processes included) to build.json in Chrome
+                                  trace format: open it in chrome://tracing or
+                                  https://ui.perfetto.dev
+  BRANDKIT_PROFILE=grain,write_png   run the matching spans under cProfile and
+                                  save one .prof per span (pstats, snakeviz)
+  BRANDKIT_TRACEMALLOC=render     trace Python allocations in the matching
+                                  spans: peak KB in the span's args, and the
+                                  sites still holding the most memory when
+                                  the span ended in a .txt
+
+Patterns match a span's name or category (fnmatch, comma-separated).
+Profiles go to $BRANDKIT_PROFILE_DIR, default the brandkit cache's profiles/.
+
+Worker processes append their spans to <trace>.parts/ as they finish; the
+process that started the run merges them into the trace file at exit.
+
+  with trace.span("render", "raster", bytes_in=len(svg)) as s:
+      png = doc.render_png(w, h)
+      s.bytes_out = len(png)
+
+  @trace.traced("svg")
+  def build_svg(...): ...
+"""
+
+import atexit
+import cProfile
+import fnmatch
+import functools
+import itertools
+import json
+import multiprocessing
+import os
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None
+
+from brandkit.paths import cache_dir
+
+OWNER_ENV = "BRANDKIT_TRACE_OWNER"
+TOP_ALLOCATIONS = 15
+
+_UNSAFE = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+class Span:
+    """A running span; set bytes_in / bytes_out or add args before it ends."""
+
+    __slots__ = ("name", "cat", "bytes_in", "bytes_out", "args")
+
+    def __init__(self, name: str, cat: str, bytes_in: Optional[int] = None):
+        self.name = name
+        self.cat = cat
+        self.bytes_in = bytes_in
+        self.bytes_out = None
+        self.args = {}
+
+
+class _Disabled:
+    """The span handed out when nothing is being recorded; attributes are ignored."""
+
+    @property
+    def args(self) -> dict:
+        return {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __setattr__(self, name, value):
+        pass
+
+
+_DISABLED = _Disabled()
+
+
+def _patterns(var: str) -> tuple:
+    return tuple(p.strip() for p in os.environ.get(var, "").split(",") if p.strip())
+
+
+@lru_cache(maxsize=1)
+def settings() -> tuple:
+    """(trace path or None, cProfile patterns, tracemalloc patterns) from the environment."""
+    path = os.environ.get("BRANDKIT_TRACE")
+    return (Path(path).resolve() if path else None,
+            _patterns("BRANDKIT_PROFILE"), _patterns("BRANDKIT_TRACEMALLOC"))
+
+
+def enabled() -> bool:
+    path, profile, malloc = settings()
+    return bool(path or profile or malloc)
+
+
+def _matches(span: Span, patterns: tuple) -> bool:
+    return any(fnmatch.fnmatchcase(span.name, p) or fnmatch.fnmatchcase(span.cat, p)
+               for p in patterns)
+
+
+def peak_rss_kb() -> Optional[int]:
+    """This process's peak resident set size in KB (None where unavailable)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak  # bytes on macOS, KB elsewhere
+
+
+# ---------------------------------------------------------------------------
+# Recording
+# ---------------------------------------------------------------------------
+
+class _Recorder:
+    """Appends finished spans to this process's part file as Chrome trace events."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.pid = None
+        self.file = None
+        self.owner = None
+
+    def _open(self) -> None:
+        pid = os.getpid()
+        if multiprocessing.parent_process() is None:
+            # The process that started the run: it merges everyone's spans at exit.
+            self.owner = pid
+            os.environ[OWNER_ENV] = str(pid)
+            atexit.register(self.export)
+        else:
+            self.owner = int(os.environ.get(OWNER_ENV) or os.getppid())
+        parts = self.parts_dir()
+        parts.mkdir(parents=True, exist_ok=True)
+        self.file = open(parts / f"{self.owner}-{pid}.jsonl", "a", encoding="utf-8")
+        self.pid = pid
+        name = "build" if self.owner == pid else f"worker {pid}"
+        self._write({"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": name}})
+
+    def parts_dir(self) -> Path:
+        return self.path.with_name(self.path.name + ".parts")
+
+    def _write(self, event: dict) -> None:
+        self.file.write(json.dumps(event, separators=(",", ":")) + "\n")
+        self.file.flush()
+
+    def record(self, event: dict) -> None:
+        with self.lock:
+            if self.pid != os.getpid():  # first span, or first in a forked worker
+                self._open()
+            event["pid"] = self.pid
+            self._write(event)
+
+    def export(self) -> None:
+        """Merge this run's part files into the Chrome trace file (owner only)."""
+        if self.owner != os.getpid():
+            return
+        self.file.close()
+        events = []
+        for part in sorted(self.parts_dir().glob(f"{self.owner}-*.jsonl")):
+            with open(part, encoding="utf-8") as f:
+                events += [json.loads(line) for line in f if line.strip()]
+            part.unlink()
+        try:
+            self.parts_dir().rmdir()
+        except OSError:
+            pass  # another run's parts are still there
+        events.sort(key=lambda e: (e.get("ts", 0), -e.get("dur", 0)))
+        body = {"traceEvents": events, "displayTimeUnit": "ms"}
+        self.path.write_text(json.dumps(body, separators=(",", ":")) + "\n", encoding="utf-8")
+        spans = sum(1 for e in events if e["ph"] == "X")
+        print(f"trace: {spans} spans → {self.path}", file=sys.stderr)
+
+
+@lru_cache(maxsize=1)
+def _recorder() -> Optional[_Recorder]:
+    path = settings()[0]
+    return _Recorder(path) if path else None
+
+
+# ---------------------------------------------------------------------------
+# Profiling
+# ---------------------------------------------------------------------------
+
+_counter = itertools.count(1)
+
+
+def _profile_path(span: Span, suffix: str) -> Path:
+    root = os.environ.get("BRANDKIT_PROFILE_DIR")
+    d = Path(root) if root else cache_dir("profiles")
+    d.mkdir(parents=True, exist_ok=True)
+    return d / f"{_UNSAFE.sub('_', span.name)}-{os.getpid()}-{next(_counter)}{suffix}"
+
+
+@contextmanager
+def _profiled(span: Span):
+    _, profile, malloc = settings()
+    profiler = cProfile.Profile() if _matches(span, profile) else None
+    tracing = _matches(span, malloc)
+    started = False
+    if tracing:
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            path = _profile_path(span, ".prof")
+            profiler.dump_stats(path)
+            span.args["profile"] = str(path)
+        if tracing:
+            span.args["py_peak_kb"] = tracemalloc.get_traced_memory()[1] // 1024
+            stats = tracemalloc.take_snapshot().statistics("lineno")[:TOP_ALLOCATIONS]
+            path = _profile_path(span, ".allocations.txt")
+            path.write_text("".join(f"{s}\n" for s in stats), encoding="utf-8")
+            span.args["allocations"] = str(path)
+            if started:
+                tracemalloc.stop()
+
+
+# ---------------------------------------------------------------------------
+# Spans
+# ---------------------------------------------------------------------------
+
+@contextmanager
+def _span(name: str, cat: str, bytes_in: Optional[int]):
+    current = Span(name, cat, bytes_in)
+    start = time.perf_counter_ns()
+    try:
+        with _profiled(current):
+            yield current
+    finally:
+        dur = time.perf_counter_ns() - start
+        recorder = _recorder()
+        if recorder is not None:
+            args = {k: v for k, v in (("bytes_in", current.bytes_in),
+                                      ("bytes_out", current.bytes_out),
+                                      ("peak_rss_kb", peak_rss_kb())) if v is not None}
+            args.update(current.args)
+            recorder.record({"name": name, "cat": cat, "ph": "X", "ts": start / 1000,
+                             "dur": dur / 1000, "tid": threading.get_native_id(), "args": args})
+
+
+def span(name: str, cat: str, bytes_in: Optional[int] = None):
+    """
+    Context manager timing the enclosed block as span `name` in category
+    `cat`; yields a Span (or a no-op stand-in when nothing is recorded).
+    """
+    if not enabled():
+        return _DISABLED
+    return _span(name, cat, bytes_in)
+
+
+def traced(cat: str, name: str = None):
+    """Decorator: run each call of the function as a span (named after it by default)."""
+    def decorate(fn):
+        label = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not enabled():
+                return fn(*args, **kwargs)
+            with _span(label, cat, None) as current:
+                result = fn(*args, **kwargs)
+                if isinstance(result, (bytes, str)):
+                    current.bytes_out = len(result)
+                return result
+        return wrapper
+    return decorate
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Build every brand target in one run, scheduling its steps as a dependency graph.
+
+A target is either a brand with a spec (brand/<name>/brand.json, rendered by
+scripts/generate-brand.py) or one of the remaining per-brand scripts
+(scripts/generate-*.py and scripts/rasterize.py). The build is a DAG (see
+brandkit.graph): font installs → each target's planning pass (measure text,
+write SVGs) → one node per PNG / ICO / social card it submits. Planning runs
+in this process; raster nodes render in a pool sized to the CPU count as
+soon as their target is planned. All selected spec brands are planned
+together, so renders they share happen once. Output is byte-identical to
+running the scripts one after another.
+
+The first failing step stops the build and is reported with its error; the
+exit status is then 1. Outputs whose inputs are unchanged since the last
+build are skipped (see brandkit.build); --force renders everything.
+
+--only PATH restricts the build to outputs under PATH (relative to the repo
+root, e.g. brand/valet/social): only targets that write there are planned,
+and only their raster outputs under PATH are rendered.
+
+Usage:
+  python3 scripts/build-brand.py                  # every target
+  python3 scripts/build-brand.py archon valet     # selected targets
+  python3 scripts/build-brand.py --only brand/valet/social
+  python3 scripts/build-brand.py --jobs 1         # serial, in-process
+  python3 scripts/build-brand.py --force          # ignore the rebuild cache
+  python3 scripts/build-brand.py --list
+"""
+
+import argparse
+import os
+import sys
+import time
+from functools import partial
+from pathlib import Path
+
+from brandkit import build, fontstore, graph, spec
+from brandkit.paths import BASE
+
+SCRIPTS = Path(__file__).parent
+ENGINE = SCRIPTS / "generate-brand.py"
+
+
+def discover() -> dict:
+    """
+    Target name → script path, e.g. 'valet-social' → generate-valet-social.py.
+
+    Brands with a spec map to generate-brand.py; their thin generate-<name>.py
+    wrappers are not separate targets.
+    """
+    specs = spec.discover()
+    targets = {name: ENGINE for name in specs}
+    for path in sorted(SCRIPTS.glob("generate-*.py")):
+        name = path.stem.removeprefix("generate-")
+        if path == ENGINE or name in specs:
+            continue
+        targets["custodyzero-social" if name == "social" else name] = path
+    targets["custodyzero"] = SCRIPTS / "rasterize.py"
+    return dict(sorted(targets.items()))
+
+
+def scopes(name: str, targets: dict) -> tuple:
+    """
+    Directories (relative to the repo root) a target writes into.
+
+    '<brand>-social' writes brand/<brand>/social; a brand target writes its
+    wordmark and icon directories, plus social when it has no -social target.
+    """
+    if name.endswith("-social"):
+        return (f"brand/{name.removesuffix('-social')}/social",)
+    dirs = (f"brand/{name}/wordmark", f"brand/{name}/icon")
+    return dirs if f"{name}-social" in targets else dirs + (f"brand/{name}/social",)
+
+
+def _within(path: str, prefix: str) -> bool:
+    return path == prefix or path.startswith(prefix + "/")
+
+
+def _keep_under(only: list):
+    """Graph filter: keep the raster nodes that write at least one output under `only`."""
+    def keep(node: graph.Node) -> bool:
+        return any(_within(Path(p).relative_to(BASE).as_posix(), o)
+                   for p in node.job.out_paths for o in only)
+    return keep
+
+
+def _plan_target(label: str, path: Path, args: list) -> list:
+    """svg node: run the target's main() in collecting mode; its jobs become raster nodes."""
+    print(f"\n== {label} ({path.name})")
+    argv = sys.argv
+    sys.argv = [str(path), *args]
+    try:
+        with build.collecting() as collected:
+            build.load_script(str(path)).main()
+    finally:
+        sys.argv = argv
+    return [graph.job_node(job) for job in collected]
+
+
+def build_graph(targets: dict) -> graph.Graph:
+    """Font install and planning nodes for `targets`; raster nodes join as each plans."""
+    runs = [(name, path, []) for name, path in targets.items() if path != ENGINE]
+    brands = [name for name, path in targets.items() if path == ENGINE]
+    if brands:
+        runs.insert(0, (" ".join(brands), ENGINE, brands))
+
+    g = graph.Graph()
+    for label, path, args in runs:
+        module = build.load_script(str(path))
+        fonts = []
+        for attr in sorted(a for a in dir(module) if a.startswith("ensure_")):
+            name = "fonts:" + attr.removeprefix("ensure_")
+            if name not in g.nodes:
+                g.add(graph.Node(name, graph.FONTS, run=getattr(module, attr)))
+            fonts.append(name)
+        g.add(graph.Node("svg:" + label.replace(" ", ","), graph.SVG, tuple(fonts),
+                         run=partial(_plan_target, label, path, args)))
+    return g
+
+
+def main() -> None:
+    fontstore.configure()
+    available = discover()
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("targets", nargs="*", metavar="TARGET",
+                        help="targets to build (default: all; see --list)")
+    parser.add_argument("--only", action="append", default=[], metavar="PATH",
+                        help="build only outputs under PATH, e.g. brand/valet/social (repeatable)")
+    parser.add_argument("--jobs", "-j", type=int, default=None,
+                        help="worker processes (default: CPU count)")
+    parser.add_argument("--force", action="store_true",
+                        help="render every output even if its inputs are unchanged")
+    parser.add_argument("--list", action="store_true", help="list targets and exit")
+    args = parser.parse_args()
+    if args.force:
+        os.environ["BRANDKIT_REBUILD"] = "1"
+
+    if args.list:
+        for name, path in available.items():
+            print(f"  {name:<20} {path.name:<32} {' '.join(scopes(name, available))}")
+        return
+
+    unknown = [t for t in args.targets if t not in available]
+    if unknown:
+        parser.error(f"unknown target(s): {', '.join(unknown)} (see --list)")
+    selected = {t: available[t] for t in args.targets} if args.targets else available
+
+    if args.only:
+        only = [Path(p).as_posix().strip("/") for p in args.only]
+        selected = {
+            name: path for name, path in selected.items()
+            if any(_within(d, o) or _within(o, d) for d in scopes(name, available) for o in only)
+        }
+        if not selected:
+            parser.error(f"no target writes under {', '.join(only)} (see --list)")
+    keep = _keep_under(only) if args.only else None
+
+    start = time.perf_counter()
+    g = build_graph(selected)
+    report = g.run(args.jobs, keep=keep)
+    print(f"\n  {report.summary()}")
+    if not report.ok:
+        graph.print_failure(report, g)
+        sys.exit(1)
+    print(f"\nBuilt {len(selected)} targets in {time.perf_counter() - start:.2f}s.")
+
+
+if __name__ == "__main__":
+    main()
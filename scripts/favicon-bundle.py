@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Generate the web favicon / app-icon bundle for each brand's icon mark.
+
+For every selected brand this writes brand/<name>/favicon/:
+
+  favicon.ico                  16, 32, 48 px (native renders, see brandkit.icons)
+  favicon.svg                  the icon mark itself, for <link rel="icon" type="image/svg+xml">
+  apple-touch-icon.png         180 px on the brand background (iOS fills transparency black)
+  icon-192.png, icon-512.png   transparent, manifest purpose "any"
+  icon-maskable-192.png        on the brand background, the mark scaled to sit inside
+  icon-maskable-512.png          the maskable safe zone (a centred circle, 80% of the width)
+  site.webmanifest             the manifest "icons" entry (plus theme/background colour)
+  head.html                    the matching <link> tags
+
+The marks come from the generators themselves: icon_svg() of each spec
+brand (scripts/generate-brand.py) and of StationZero, and CustodyZero's
+committed icon SVG. Each output set is one job; a job renders all its sizes
+from one SVG via brandkit.icons.render_icon() (small frames natively, large
+ones downsampled from a single master render, frames concurrently), and the
+jobs run on a process pool. Outputs whose inputs are unchanged are skipped
+(see brandkit.build).
+
+Prerequisites:
+  pip install cairosvg Pillow
+
+Usage:
+  python3 scripts/favicon-bundle.py                  # every brand with an icon mark
+  python3 scripts/favicon-bundle.py valet stationzero
+  python3 scripts/favicon-bundle.py --background "#111111"
+  python3 scripts/favicon-bundle.py --list
+"""
+
+import argparse
+import io
+import json
+import math
+import re
+from pathlib import Path
+
+from PIL import Image
+
+from brandkit import build, fontstore, icons, raster, spec
+
+BASE = Path(__file__).parent.parent
+SCRIPTS = Path(__file__).parent
+
+BACKGROUND = "#0A0A0A"  # the house card/page background
+ICO_SIZES = [16, 32, 48]
+APPLE_TOUCH = 180
+APP_SIZES = [192, 512]
+SAFE_RADIUS = 0.40  # maskable safe zone: circle of radius 40% of the icon width
+SAFE_PROBE = 128    # render size used to find how far the mark reaches
+
+_SVG_ROOT = re.compile(r'<svg\b[^>]*\bviewBox="([^"]+)"[^>]*>(.*)</svg>', re.S)
+
+
+# ---------------------------------------------------------------------------
+# Sources
+# ---------------------------------------------------------------------------
+
+def sources() -> dict:
+    """Brand name → icon mark SVG."""
+    marks = {}
+    engine = build.load_script(str(SCRIPTS / "generate-brand.py"))
+    for name in spec.discover():
+        marks[name] = engine.icon_svg(spec.load(name))
+    marks["stationzero"] = build.load_script(str(SCRIPTS / "generate-stationzero.py")).icon_svg()
+    marks["custodyzero"] = (
+        BASE / "brand" / "custodyzero" / "icon" / "custodyzero-icon-dark.svg"
+    ).read_text(encoding="utf-8")
+    return dict(sorted(marks.items()))
+
+
+# ---------------------------------------------------------------------------
+# Tiles (the mark on a solid background)
+# ---------------------------------------------------------------------------
+
+def safe_scale(svg: str) -> float:
+    """
+    Largest scale (≤ 1) at which every painted pixel of the mark lies inside
+    the maskable safe-zone circle, measured on a SAFE_PROBE px render.
+    """
+    png = raster.load(svg).render_png(SAFE_PROBE, SAFE_PROBE)
+    alpha = Image.open(io.BytesIO(png)).convert("RGBA").getchannel("A")
+    c = SAFE_PROBE / 2
+    reach = 0.0
+    for i, a in enumerate(alpha.getdata()):
+        if a:
+            y, x = divmod(i, SAFE_PROBE)
+            reach = max(reach, math.hypot(x + 0.5 - c, y + 0.5 - c))
+    return min(1.0, SAFE_RADIUS * SAFE_PROBE / reach) if reach else 1.0
+
+
+def tile_svg(svg: str, background: str, scale: float = 1.0) -> str:
+    """The mark scaled by `scale` about its centre, over a full-bleed background."""
+    m = _SVG_ROOT.search(svg)
+    if m is None:
+        raise ValueError("icon SVG has no root <svg> element with a viewBox")
+    x, y, w, h = (float(v) for v in m.group(1).replace(",", " ").split())
+    cx, cy = x + w / 2, y + h / 2
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="{m.group(1)}" width="{w:g}" height="{h:g}">\n'
+        f'  <rect x="{x:g}" y="{y:g}" width="{w:g}" height="{h:g}" fill="{background}"/>\n'
+        f'  <g transform="translate({cx:g} {cy:g}) scale({scale:.4f}) translate({-cx:g} {-cy:g})">'
+        f"{m.group(2)}</g>\n"
+        "</svg>\n"
+    )
+
+
+# ---------------------------------------------------------------------------
+# Raster jobs
+# ---------------------------------------------------------------------------
+
+def _report(out_path, note: str) -> None:
+    print(f"  {Path(out_path).relative_to(BASE)} ({note})")
+
+
+def svg_to_ico(svg_content: str, out_path: Path, sizes: list):
+    icons.svg_to_ico(svg_content, out_path, sizes, BASE)
+
+
+def svg_to_pngs(svg_content: str, out_paths: tuple, sizes: list, background: str = None,
+                maskable: bool = False):
+    """
+    One square PNG per size (out_paths[i] gets sizes[i]), all from one
+    render_icon() call; with `background`, of the mark tiled onto it (scaled
+    into the safe zone when `maskable`).
+    """
+    if background is not None:
+        svg_content = tile_svg(svg_content, background,
+                               safe_scale(svg_content) if maskable else 1.0)
+    frames = icons.render_icon(svg_content, sizes)
+    for out_path, frame in zip(out_paths, frames):
+        Path(out_path).write_bytes(frame.png)
+        _report(out_path, f"{frame.size}×{frame.size}")
+    icons.print_frames(frames)
+
+
+# ---------------------------------------------------------------------------
+# Bundle
+# ---------------------------------------------------------------------------
+
+def manifest(background: str) -> dict:
+    entries = [{"src": f"/icon-{s}.png", "sizes": f"{s}x{s}", "type": "image/png"} for s in APP_SIZES]
+    entries += [{"src": f"/icon-maskable-{s}.png", "sizes": f"{s}x{s}", "type": "image/png",
+                 "purpose": "maskable"} for s in APP_SIZES]
+    return {"icons": entries, "theme_color": background, "background_color": background}
+
+
+HEAD_HTML = """\
+<link rel="icon" href="/favicon.ico" sizes="32x32">
+<link rel="icon" href="/favicon.svg" type="image/svg+xml">
+<link rel="apple-touch-icon" href="/apple-touch-icon.png">
+<link rel="manifest" href="/site.webmanifest">
+"""
+
+
+def plan_bundle(name: str, svg: str, background: str) -> None:
+    """Write the bundle's text files and submit its raster jobs."""
+    out_dir = BASE / "brand" / name / "favicon"
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    for filename, text in [
+        ("favicon.svg", svg),
+        ("site.webmanifest", json.dumps(manifest(background), indent=2) + "\n"),
+        ("head.html", HEAD_HTML),
+    ]:
+        path = out_dir / filename
+        path.write_text(text, encoding="utf-8")
+        print(f"  {path.relative_to(BASE)}")
+
+    build.submit(svg_to_ico, svg, out_dir / "favicon.ico", ICO_SIZES)
+    build.submit(svg_to_pngs, svg, tuple(out_dir / f"icon-{s}.png" for s in APP_SIZES), APP_SIZES)
+    build.submit(svg_to_pngs, svg, (out_dir / "apple-touch-icon.png",), [APPLE_TOUCH], background)
+    build.submit(svg_to_pngs, svg, tuple(out_dir / f"icon-maskable-{s}.png" for s in APP_SIZES),
+                 APP_SIZES, background, True)
+
+
+def main(argv=None):
+    fontstore.configure()
+    marks = sources()
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("brands", nargs="*", metavar="BRAND",
+                        help=f"brands to bundle (default: all — {', '.join(marks)})")
+    parser.add_argument("--background", default=BACKGROUND,
+                        help=f"tile and manifest colour (default: {BACKGROUND})")
+    parser.add_argument("--jobs", "-j", type=int, default=None,
+                        help="worker processes (default: CPU count)")
+    parser.add_argument("--list", action="store_true", help="list brands with an icon mark and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name in marks:
+            print(f"  {name}")
+        return
+    unknown = [b for b in args.brands if b not in marks]
+    if unknown:
+        parser.error(f"no icon mark for brand(s): {', '.join(unknown)} (see --list)")
+
+    with build.collecting() as jobs:
+        for name in args.brands or marks:
+            print(f"\n== {name}")
+            plan_bundle(name, marks[name], args.background)
+
+    print(f"\nRendering {sum(len(j.out_paths) for j in jobs)} images…")
+    skipped = build.run_incremental(jobs, workers=args.jobs)
+    print(f"\nDone ({len(jobs) - skipped} jobs rendered, {skipped} up to date).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Generate wordmark and icon assets for brands described by a spec file.
+
+Each brand/<name>/brand.json (see brandkit.spec) gives the wordmark text,
+font, colors, layout and icon mark. For every selected brand this writes:
+
+  brand/<name>/wordmark/<name>-wordmark-<variant>.svg   + @2x/@3x PNG
+  brand/<name>/icon/<name>-icon-<variant>.svg           + @2x/@3x PNG + ICO
+
+All brands are planned in one pass before anything is rasterized, so
+renders that would produce identical pixels (e.g. Valet and Steward share
+their icon mark) are done once and written to every output that needs them.
+Two SVGs count as identical when they differ only in comments and
+inter-tag whitespace.
+
+Prerequisites:
+  pip install cairosvg Pillow fonttools brotli
+  Bebas Neue TTF must be installed — run scripts/install-fonts.py first.
+
+Usage:
+  python3 scripts/generate-brand.py                 # every brand with a spec
+  python3 scripts/generate-brand.py valet steward [--outline]
+  python3 scripts/generate-brand.py --list
+"""
+
+import argparse
+import re
+from pathlib import Path
+
+from brandkit import build, embed, encode, fonts, fontstore, icons, outline, raster, spec, trace
+
+BASE = Path(__file__).parent.parent
+
+_COMMENT = re.compile(r"<!--.*?-->", re.S)
+_BETWEEN_TAGS = re.compile(r">\s+<")
+
+
+def font_face(font: spec.Font, b64: str) -> str:
+    return (
+        "@font-face {\n"
+        f"  font-family: '{font.family}';\n"
+        "  font-style: normal;\n"
+        "  font-weight: 400;\n"
+        f'  src: url("data:font/truetype;base64,{b64}") format("truetype"),\n'
+        f"       url('{font.fallback_url}') format('woff2');\n"
+        "}"
+    )
+
+
+def canvas_width(brand: spec.BrandSpec, text_width: float) -> int:
+    wm = brand.wordmark
+    return wm.canvas_w or int(text_width + wm.x_start + wm.pad_right)
+
+
+@trace.traced("svg")
+def wordmark_svg(brand: spec.BrandSpec, text_color: str, font_b64: str, text_width: float,
+                 outlined: bool = False) -> str:
+    """
+    The wordmark in `text_color` on transparent, with the spec's underline
+    rule if it has one.
+
+    With outlined=True the text is emitted as glyph paths (no @font-face,
+    no fontconfig dependency); font_b64 is ignored.
+    """
+    wm = brand.wordmark
+    if outlined:
+        d = outline.text_path_d(wm.text, wm.font.path, wm.font_size, wm.letter_spacing_em,
+                                wm.x_start, wm.y_baseline)
+        mark = f'  <path d="{d}" fill="{text_color}"/>\n'
+    else:
+        mark = (
+            f"  <defs>\n"
+            f"    <style>{font_face(wm.font, font_b64)}</style>\n"
+            f"  </defs>\n"
+            f'  <text x="{wm.x_start}" y="{wm.y_baseline}" text-anchor="start"\n'
+            f"        font-family=\"'{wm.font.family}', {wm.font.generic}\"\n"
+            f"        font-size=\"{wm.font_size}\" letter-spacing=\"{wm.letter_spacing_em}em\"\n"
+            f'        fill="{text_color}">{wm.text}</text>\n'
+        )
+    if wm.rule:
+        mark += (
+            f'  <line x1="{wm.x_start}" y1="{wm.rule.y}"'
+            f' x2="{wm.x_start + text_width:.2f}" y2="{wm.rule.y}"'
+            f' stroke="{brand.color(wm.rule.color)}" stroke-width="{wm.rule.width}"/>\n'
+        )
+    canvas_w = canvas_width(brand, text_width)
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg"'
+        f' viewBox="0 0 {canvas_w} {wm.canvas_h}"'
+        f' width="{canvas_w}" height="{wm.canvas_h}">\n'
+        f"{mark}"
+        f"</svg>\n"
+    )
+
+
+@trace.traced("svg")
+def icon_svg(brand: spec.BrandSpec) -> str:
+    """The icon mark: the spec's body lines, colors filled in, on a size×size canvas."""
+    s = brand.icon.size
+    body = "".join(line.format_map(brand.colors) + "\n" for line in brand.icon.body)
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {s} {s}" width="{s}" height="{s}">\n'
+        f"{body}"
+        "</svg>\n"
+    )
+
+
+# ---------------------------------------------------------------------------
+# Raster jobs (out_paths: every file that receives the same bytes)
+# ---------------------------------------------------------------------------
+
+def _write_all(data: bytes, out_paths, note: str) -> None:
+    for out_path in out_paths:
+        Path(out_path).write_bytes(data)
+        print(f"  {Path(out_path).relative_to(BASE)} ({note})")
+
+
+def svg_to_png(svg_content: str, out_paths: tuple, width: int, height: int,
+               alternates: encode.Alternates = encode.NONE):
+    png = raster.load(svg_content).render_png(width, height)
+    _write_all(png, out_paths, f"{width}×{height}")
+    for out_path in out_paths:
+        for path in encode.write_alternates(png, out_path, alternates):
+            print(f"  {path.relative_to(BASE)}")
+
+
+def svg_to_ico(svg_content: str, out_paths: tuple, sizes: list):
+    """Multi-frame ICO with one PNG-embedded frame per size (see brandkit.icons)."""
+    icons.svg_to_ico(svg_content, out_paths, sizes, BASE)
+
+
+# ---------------------------------------------------------------------------
+# Planning
+# ---------------------------------------------------------------------------
+
+class Plan:
+    """Raster outputs grouped by what they render, in first-seen order."""
+
+    def __init__(self):
+        self.groups = {}
+
+    def add(self, fn, svg: str, out_path: Path, *args) -> None:
+        key = (fn.__name__, _BETWEEN_TAGS.sub("><", _COMMENT.sub("", svg)), repr(args))
+        self.groups.setdefault(key, (fn, svg, args, []))[3].append(out_path)
+
+    def outputs(self) -> int:
+        return sum(len(paths) for *_, paths in self.groups.values())
+
+    def submit(self) -> None:
+        for fn, svg, args, paths in self.groups.values():
+            build.submit(fn, svg, tuple(sorted(paths)), *args)
+
+
+def plan_brand(brand: spec.BrandSpec, plan: Plan, outlined: bool) -> None:
+    """Write the brand's SVGs and add its raster outputs to `plan`."""
+    wm = brand.wordmark
+    wordmark_dir = brand.root / "wordmark"
+    icon_dir = brand.root / "icon"
+    wordmark_dir.mkdir(parents=True, exist_ok=True)
+    icon_dir.mkdir(parents=True, exist_ok=True)
+
+    if not wm.font.path.exists():
+        raise FileNotFoundError(
+            f"{wm.font.file} not found at {wm.font.path}. "
+            "Run scripts/install-fonts.py first."
+        )
+
+    print("Loading font…")
+    font_b64 = None if outlined else embed.font_b64(wm.font.path, wm.text)
+
+    print("Measuring text width…")
+    text_width = fonts.measure_width(wm.text, wm.font.path, wm.font_size, wm.letter_spacing_em)
+    print(f"  '{wm.text}' at {wm.font_size}px, {wm.letter_spacing_em}em spacing → {text_width:.2f}px")
+    canvas_w = canvas_width(brand, text_width)
+    alternates = encode.alternates_from_env()  # WebP/AVIF wordmarks are opt-in
+
+    print("\nGenerating wordmark SVGs…")
+    for variant, color in wm.variants.items():
+        svg = wordmark_svg(brand, brand.color(color), font_b64, text_width, outlined=outlined)
+        svg_path = wordmark_dir / f"{brand.name}-wordmark-{variant}.svg"
+        svg_path.write_text(svg, encoding="utf-8")
+        print(f"  {svg_path.relative_to(BASE)}")
+        for scale in wm.scales:
+            plan.add(svg_to_png, svg, wordmark_dir / f"{brand.name}-wordmark-{variant}@{scale}x.png",
+                     canvas_w * scale, wm.canvas_h * scale, alternates)
+
+    print("\nGenerating icon SVG…")
+    icon = icon_svg(brand)
+    stem = f"{brand.name}-icon-{brand.icon.variant}"
+    icon_path = icon_dir / f"{stem}.svg"
+    icon_path.write_text(icon, encoding="utf-8")
+    print(f"  {icon_path.relative_to(BASE)}")
+    for scale in brand.icon.scales:
+        size = brand.icon.size * scale
+        plan.add(svg_to_png, icon, icon_dir / f"{stem}@{scale}x.png", size, size)
+    plan.add(svg_to_ico, icon, icon_dir / f"{stem}.ico", list(brand.icon.ico_sizes))
+
+
+def main(argv=None):
+    fontstore.configure()
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("brands", nargs="*", metavar="BRAND",
+                        help="brands to generate (default: every brand/<name>/brand.json)")
+    parser.add_argument("--outline", action="store_true",
+                        help="emit wordmark text as glyph outlines instead of an embedded font")
+    parser.add_argument("--list", action="store_true", help="list brands with a spec and exit")
+    args = parser.parse_args(argv)
+
+    available = spec.discover()
+    if args.list:
+        for name in available:
+            print(f"  {name:<12} {spec.spec_path(name).relative_to(BASE)}")
+        return
+    unknown = [b for b in args.brands if b not in available]
+    if unknown:
+        parser.error(f"no spec for brand(s): {', '.join(unknown)} (see --list)")
+
+    brands = [spec.load(name) for name in args.brands or available]
+    plan = Plan()
+    for brand in brands:
+        print(f"\n== {brand.title} ({spec.spec_path(brand.name).relative_to(BASE)})")
+        plan_brand(brand, plan, args.outline)
+
+    shared = plan.outputs() - len(plan.groups)
+    print(f"\nRasterizing {plan.outputs()} outputs"
+          + (f" ({len(plan.groups)} renders, {shared} shared)…" if shared else "…"))
+    plan.submit()
+
+    print("\nDone.")
+    print("\nBrand assets written to:")
+    for brand in brands:
+        print(f"  {brand.root.relative_to(BASE)}/")
+
+
+if __name__ == "__main__":
+    main()
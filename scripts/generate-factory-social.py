@@ -21,28 +21,24 @@ Design follows Factory brand guidelines:
   - Geometric grid (architectural constraint theme)
 """
 
-import base64
 import io
-import random
-import struct
-import urllib.request
-import re
+from xml.sax.saxutils import escape
 from pathlib import Path
 
-import cairosvg
-from fontTools.ttLib import TTFont
 from PIL import Image
 
+from brandkit import build, embed, encode, fontpaths, fontstore, grain, raster, trace
+from brandkit.fonts import fit_size, measure_width
+
 # ---------------------------------------------------------------------------
 # Paths
 # ---------------------------------------------------------------------------
 
 BASE = Path(__file__).parent.parent
-FONT_DIR = Path.home() / "Library" / "Fonts"
 OUT_DIR = BASE / "brand" / "factory" / "social"
 
-FONT_BEBAS = FONT_DIR / "BebasNeue-Regular.ttf"
-FONT_DMMONO = FONT_DIR / "DMMono-Regular.ttf"
+FONT_BEBAS = fontpaths.find("Bebas Neue")
+FONT_DMMONO = fontpaths.find("DM Mono")
 
 # ---------------------------------------------------------------------------
 # Card geometry
@@ -50,6 +46,12 @@ FONT_DMMONO = FONT_DIR / "DMMono-Regular.ttf"
 
 W, H = 1200, 630
 
+# Text (build_svg() overrides these per card; see scripts/og-server.py)
+WM_TEXT = "FACTORY"
+TAGLINE = "Change governance for every project."
+URL_TEXT = "github.com/CustodyZero/factory"
+TEXT_MAX_W = W - 2 * 80   # longer titles/taglines are scaled down to fit
+
 # Wordmark
 WM_FONT_SIZE = 110.0
 WM_LS_EM = 0.12            # Factory standard (not house 0.15)
@@ -94,80 +96,21 @@ TEXT_MUTED = "#444444"
 # Font installation helpers
 # ---------------------------------------------------------------------------
 
-_GF_UA = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
-
-
-def _fetch_gf_css(family_query: str) -> str:
-    url = f"https://fonts.googleapis.com/css2?{family_query}&display=swap"
-    req = urllib.request.Request(url, headers={"User-Agent": _GF_UA})
-    with urllib.request.urlopen(req) as r:
-        return r.read().decode("utf-8")
-
-
-def _woff2_url_from_css(css: str, hint: str = "") -> str:
-    matches = re.findall(r"url\(([^)]+\.woff2)\)", css)
-    if hint:
-        for m in matches:
-            if hint.lower() in m.lower():
-                return m
-    if matches:
-        return matches[0]
-    raise RuntimeError(f"No woff2 URL found in CSS\n{css[:400]}")
-
-
-def _download_ttf(woff2_url: str, dest: Path) -> None:
-    tmp = Path("/tmp") / (dest.stem + ".woff2")
-    print(f"    Downloading {woff2_url}")
-    urllib.request.urlretrieve(woff2_url, tmp)
-    font = TTFont(str(tmp))
-    font.flavor = None
-    font.save(str(dest))
-    tmp.unlink(missing_ok=True)
-    print(f"    Installed → {dest}")
-
+# Pinned in scripts/fonts.lock.json; copied from the local font store
+# (brandkit.fontstore), which is only filled from the network when empty.
 
 def ensure_dmmono() -> None:
-    if FONT_DMMONO.exists():
-        return
-    print("  Installing DM Mono Regular…")
-    css = _fetch_gf_css("family=DM+Mono:wght@400")
-    url = _woff2_url_from_css(css)
-    _download_ttf(url, FONT_DMMONO)
-
-
-# ---------------------------------------------------------------------------
-# Font metrics
-# ---------------------------------------------------------------------------
-
-def _load_cmap_hmtx(path: Path):
-    tt = TTFont(str(path))
-    return tt.getBestCmap(), tt["hmtx"].metrics, tt["head"].unitsPerEm
-
-
-def measure_width(text: str, font_path: Path, font_size: float, ls_em: float) -> float:
-    """Visual ink width (no trailing letter-spacing gap)."""
-    cmap, hmtx, upm = _load_cmap_hmtx(font_path)
-    advances = []
-    for ch in text:
-        gid = cmap.get(ord(ch))
-        if gid is None:
-            raise ValueError(f"Glyph missing for '{ch}' in {font_path.name}")
-        adv, _ = hmtx[gid]
-        advances.append(adv / upm * font_size)
-    ls_px = ls_em * font_size
-    return sum(advances) + (len(text) - 1) * ls_px
+    fontstore.install(FONT_DMMONO)
 
 
 # ---------------------------------------------------------------------------
 # Font base64 embedding
 # ---------------------------------------------------------------------------
 
-def _b64(path: Path) -> str:
-    return base64.b64encode(path.read_bytes()).decode("ascii")
-
-
-def _font_face(family: str, path: Path, style: str = "normal", weight: str = "400") -> str:
-    b64 = _b64(path)
+def _font_face(family: str, path: Path, style: str = "normal", weight: str = "400",
+               text: str = None) -> str:
+    """@font-face rule; the font is subset to `text` (see brandkit.embed)."""
+    b64 = embed.font_b64(path, text)
     return (
         f"@font-face {{\n"
         f"  font-family: '{family}';\n"
@@ -182,10 +125,16 @@ def _font_face(family: str, path: Path, style: str = "normal", weight: str = "40
 # SVG builder
 # ---------------------------------------------------------------------------
 
-def build_svg() -> str:
+@trace.traced("svg")
+def build_svg(title: str = WM_TEXT, tagline: str = TAGLINE, url: str = URL_TEXT) -> str:
+    """
+    The card SVG with `title` in place of the wordmark. Text is XML-escaped;
+    a title or tagline wider than TEXT_MAX_W is set smaller to fit.
+    """
     # --- measure wordmark ---
-    wm_text = "FACTORY"
-    wm_total_w = measure_width(wm_text, FONT_BEBAS, WM_FONT_SIZE, WM_LS_EM)
+    wm_text = title
+    wm_size = fit_size(wm_text, FONT_BEBAS, WM_FONT_SIZE, WM_LS_EM, TEXT_MAX_W)
+    wm_total_w = measure_width(wm_text, FONT_BEBAS, wm_size, WM_LS_EM)
     wm_x = (W - wm_total_w) / 2.0
 
     # --- green rule: full wordmark width, centered ---
@@ -194,12 +143,13 @@ def build_svg() -> str:
     rule_x2 = wm_x + wm_total_w
 
     # --- tagline: DM Mono, centered ---
-    tl_text = "Change governance for every project."
-    tl_w = measure_width(tl_text, FONT_DMMONO, TL_FONT_SIZE, 0.0)
+    tl_text = tagline
+    tl_size = fit_size(tl_text, FONT_DMMONO, TL_FONT_SIZE, 0.0, TEXT_MAX_W)
+    tl_w = measure_width(tl_text, FONT_DMMONO, tl_size, 0.0)
     tl_x = (W - tl_w) / 2.0
 
     # --- url: centered ---
-    url_text = "github.com/CustodyZero/factory"
+    url_text = url
     url_w = measure_width(url_text, FONT_DMMONO, URL_FONT_SIZE, 0.0)
     url_x = (W - url_w) / 2.0
 
@@ -225,8 +175,8 @@ def build_svg() -> str:
 
     # --- font face declarations ---
     styles = "\n".join([
-        _font_face("Bebas Neue", FONT_BEBAS, "normal", "400"),
-        _font_face("DM Mono", FONT_DMMONO, "normal", "400"),
+        _font_face("Bebas Neue", FONT_BEBAS, "normal", "400", wm_text),
+        _font_face("DM Mono", FONT_DMMONO, "normal", "400", tl_text + url_text),
     ])
 
     # --- grid path ---
@@ -275,8 +225,8 @@ def build_svg() -> str:
   <!-- 5. Wordmark: white on dark -->
   <text x="{wm_x:.2f}" y="{WM_Y_BASELINE}"
         font-family="'Bebas Neue', sans-serif"
-        font-size="{WM_FONT_SIZE}" letter-spacing="{WM_LS_EM}em"
-        fill="{WHITE}">{wm_text}</text>
+        font-size="{wm_size}" letter-spacing="{WM_LS_EM}em"
+        fill="{WHITE}">{escape(wm_text)}</text>
 
   <!-- 6. Green horizontal rule -->
   <line x1="{rule_x1:.2f}" y1="{rule_y}" x2="{rule_x2:.2f}" y2="{rule_y}"
@@ -285,14 +235,14 @@ def build_svg() -> str:
   <!-- 7. Tagline -->
   <text x="{tl_x:.2f}" y="{TL_Y_BASELINE}"
         font-family="'DM Mono', 'Courier New', monospace"
-        font-size="{TL_FONT_SIZE}" fill="{TEXT_SECONDARY}"
-        letter-spacing="0.02em">{tl_text}</text>
+        font-size="{tl_size}" fill="{TEXT_SECONDARY}"
+        letter-spacing="0.02em">{escape(tl_text)}</text>
 
   <!-- 8. URL -->
   <text x="{url_x:.2f}" y="{URL_Y_BASELINE}"
         font-family="'DM Mono', 'Courier New', monospace"
         font-size="{URL_FONT_SIZE}" fill="{TEXT_MUTED}"
-        letter-spacing="0.05em">{url_text}</text>
+        letter-spacing="0.05em">{escape(url_text)}</text>
 </svg>
 """
     return svg
@@ -303,16 +253,37 @@ def build_svg() -> str:
 # ---------------------------------------------------------------------------
 
 def add_grain(img: Image.Image, opacity: float = GRAIN_OPACITY, seed: int = GRAIN_SEED) -> Image.Image:
-    w, h = img.size
-    rng = random.Random(seed)
-    noise_bytes = rng.randbytes(w * h)
-    noise = Image.frombytes("L", (w, h), noise_bytes)
-    alpha_val = int(255 * opacity)
-    alpha_mask = Image.new("L", (w, h), alpha_val)
-    grain_rgba = Image.merge("RGBA", [noise, noise, noise, alpha_mask])
-    result = img.convert("RGBA")
-    result = Image.alpha_composite(result, grain_rgba)
-    return result.convert("RGB")
+    """Overlay seeded monochromatic film grain (see brandkit.grain)."""
+    return grain.add_grain(img, opacity, seed)
+
+
+# ---------------------------------------------------------------------------
+# PNG output
+# ---------------------------------------------------------------------------
+
+@trace.traced("encode")
+def card_png(svg: str, scale: int = 1) -> bytes:
+    """Rasterize the card at `scale`×; returns optimized PNG bytes."""
+    png_bytes = raster.load(svg).render_png(W * scale, H * scale)
+    img = Image.open(io.BytesIO(png_bytes))
+    buf = io.BytesIO()
+    img.save(buf, format="PNG", optimize=True)
+    return buf.getvalue()
+
+
+def write_png(svg: str, out_path: Path, scale: int,
+              alternates: encode.Alternates = encode.NONE) -> None:
+    """
+    Rasterize the card at `scale`× and write it as an optimized PNG, plus
+    its WebP/AVIF companions (see brandkit.encode).
+    """
+    out_w, out_h = W * scale, H * scale
+    png = card_png(svg, scale)
+    out_path.write_bytes(png)
+    size_kb = out_path.stat().st_size / 1024
+    print(f"  PNG: {out_path.relative_to(BASE)} ({out_w}×{out_h}, {size_kb:.0f}KB)")
+    for path in encode.write_alternates(png, out_path, alternates):
+        print(f"  {path.suffix[1:].upper()}: {path.relative_to(BASE)} ({path.stat().st_size / 1024:.0f}KB)")
 
 
 # ---------------------------------------------------------------------------
@@ -320,6 +291,7 @@ def add_grain(img: Image.Image, opacity: float = GRAIN_OPACITY, seed: int = GRAI
 # ---------------------------------------------------------------------------
 
 def main() -> None:
+    fontstore.configure()
     if not FONT_BEBAS.exists():
         raise FileNotFoundError(
             f"Bebas Neue not found at {FONT_BEBAS}. Run scripts/install-fonts.py first."
@@ -342,20 +314,11 @@ def main() -> None:
     out_w, out_h = W * SCALE, H * SCALE
 
     print(f"Rasterizing to PNG at {SCALE}x ({out_w}×{out_h})…")
-    png_bytes = cairosvg.svg2png(
-        bytestring=svg.encode("utf-8"),
-        output_width=out_w,
-        output_height=out_h,
-    )
-    img = Image.open(io.BytesIO(png_bytes))
-
     # Skip grain at 2x — it defeats PNG compression (millions of unique pixel
     # values) and is invisible at social card display sizes. The SVG reference
     # is grain-free regardless.
-    out_png = OUT_DIR / "factory-social-card.png"
-    img.save(str(out_png), format="PNG", optimize=True)
-    size_kb = out_png.stat().st_size / 1024
-    print(f"  PNG: {out_png.relative_to(BASE)} ({out_w}×{out_h}, {size_kb:.0f}KB)")
+    build.submit(write_png, svg, OUT_DIR / "factory-social-card.png", SCALE,
+                 encode.alternates_from_env(encode.FORMATS))
 
     print("\nDone.")
 
@@ -8,35 +8,32 @@ Prerequisites:
   pip install cairosvg Pillow fonttools brotli
   Bebas Neue TTF must already be installed (run scripts/install-fonts.py first).
   This script auto-installs Fraunces and DM Mono from Google Fonts if absent.
+  numpy is optional; with it the grain overlay is a single vectorized pass.
 
 Grain is seeded (random.Random(42)) — output is fully deterministic given the
 same fonts and input parameters.
 """
 
-import base64
 import io
-import random
-import re
-import struct
-import urllib.request
 from pathlib import Path
+from xml.sax.saxutils import escape
 
-import cairosvg
-from fontTools.ttLib import TTFont
 from PIL import Image
 
+from brandkit import build, embed, encode, fontpaths, fontstore, grain, raster, trace
+from brandkit.fonts import fit_size, measure_width, split_x
+
 # ---------------------------------------------------------------------------
 # Paths
 # ---------------------------------------------------------------------------
 
 BASE = Path(__file__).parent.parent
-FONT_DIR = Path.home() / "Library" / "Fonts"
 OUT_DIR = BASE / "brand" / "custodyzero" / "social"
 OUT_PATH = OUT_DIR / "custodyzero-social-card.png"
 
-FONT_BEBAS = FONT_DIR / "BebasNeue-Regular.ttf"
-FONT_FRAUNCES = FONT_DIR / "Fraunces-LightItalic.ttf"
-FONT_DMMONO = FONT_DIR / "DMMono-Regular.ttf"
+FONT_BEBAS = fontpaths.find("Bebas Neue")
+FONT_FRAUNCES = fontpaths.find("Fraunces", 300, "italic")
+FONT_DMMONO = fontpaths.find("DM Mono")
 
 # ---------------------------------------------------------------------------
 # Card geometry
@@ -44,6 +41,13 @@ FONT_DMMONO = FONT_DIR / "DMMono-Regular.ttf"
 
 W, H = 1200, 630
 
+# Text (build_svg() overrides these per card; see scripts/og-server.py)
+WM_TEXT = "CUSTODYZERO"
+WM_SPLIT = len("CUSTODY")  # leading characters set in white; the rest is amber
+TAGLINE = "The capability is yours."
+URL_TEXT = "custodyzero.com"
+TEXT_MAX_W = W - 2 * 80   # longer titles/taglines are scaled down to fit
+
 # Wordmark
 WM_FONT_SIZE = 110.0
 WM_LS_EM = 0.15          # matching the house standard
@@ -74,6 +78,9 @@ GRID_OPACITY = 0.30
 # Grain
 GRAIN_OPACITY = 0.035     # 3.5% — subtle
 GRAIN_SEED = 42
+# Full-entropy grain; $BRANDKIT_GRAIN (e.g. "levels=2,tile=128") selects a
+# lower-entropy style — see scripts/grain-report.py for the size/PSNR table.
+GRAIN_STYLE = grain.FULL
 
 # ---------------------------------------------------------------------------
 # Colors (verbatim from design system)
@@ -89,103 +96,25 @@ TEXT_MUTED = "#444444"
 # Font installation helpers
 # ---------------------------------------------------------------------------
 
-_GF_UA = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
-
-
-def _fetch_gf_css(family_query: str) -> str:
-    url = f"https://fonts.googleapis.com/css2?{family_query}&display=swap"
-    req = urllib.request.Request(url, headers={"User-Agent": _GF_UA})
-    with urllib.request.urlopen(req) as r:
-        return r.read().decode("utf-8")
-
-
-def _woff2_url_from_css(css: str, hint: str = "") -> str:
-    """Return the first woff2 URL in css that contains hint (case-insensitive)."""
-    matches = re.findall(r"url\(([^)]+\.woff2)\)", css)
-    if hint:
-        for m in matches:
-            if hint.lower() in m.lower():
-                return m
-    if matches:
-        return matches[0]
-    raise RuntimeError(f"No woff2 URL found in CSS\n{css[:400]}")
-
-
-def _download_ttf(woff2_url: str, dest: Path) -> None:
-    tmp = Path("/tmp") / (dest.stem + ".woff2")
-    print(f"    Downloading {woff2_url}")
-    urllib.request.urlretrieve(woff2_url, tmp)
-    font = TTFont(str(tmp))
-    font.flavor = None
-    font.save(str(dest))
-    tmp.unlink(missing_ok=True)
-    print(f"    Installed → {dest}")
-
+# Pinned in scripts/fonts.lock.json; copied from the local font store
+# (brandkit.fontstore), which is only filled from the network when empty.
 
 def ensure_fraunces() -> None:
-    if FONT_FRAUNCES.exists():
-        return
-    print("  Installing Fraunces Light Italic…")
-    # Request: italic (ital=1), opsz=36 (display range), wght=300
-    css = _fetch_gf_css("family=Fraunces:ital,opsz,wght@1,9..144,300")
-    url = _woff2_url_from_css(css)
-    _download_ttf(url, FONT_FRAUNCES)
+    fontstore.install(FONT_FRAUNCES)
 
 
 def ensure_dmmono() -> None:
-    if FONT_DMMONO.exists():
-        return
-    print("  Installing DM Mono Regular…")
-    css = _fetch_gf_css("family=DM+Mono:wght@400")
-    url = _woff2_url_from_css(css)
-    _download_ttf(url, FONT_DMMONO)
-
-
-# ---------------------------------------------------------------------------
-# Font metrics
-# ---------------------------------------------------------------------------
-
-def _load_cmap_hmtx(path: Path):
-    tt = TTFont(str(path))
-    return tt.getBestCmap(), tt["hmtx"].metrics, tt["head"].unitsPerEm
-
-
-def measure_width(text: str, font_path: Path, font_size: float, ls_em: float) -> float:
-    """Visual ink width (no trailing letter-spacing gap)."""
-    cmap, hmtx, upm = _load_cmap_hmtx(font_path)
-    advances = []
-    for ch in text:
-        gid = cmap.get(ord(ch))
-        if gid is None:
-            raise ValueError(f"Glyph missing for '{ch}' in {font_path.name}")
-        adv, _ = hmtx[gid]
-        advances.append(adv / upm * font_size)
-    ls_px = ls_em * font_size
-    return sum(advances) + (len(text) - 1) * ls_px
-
-
-def x_after(text: str, font_path: Path, font_size: float, ls_em: float) -> float:
-    """Advance width INCLUDING trailing letter-spacing (start-x for next char)."""
-    cmap, hmtx, upm = _load_cmap_hmtx(font_path)
-    ls_px = ls_em * font_size
-    total = 0.0
-    for ch in text:
-        gid = cmap.get(ord(ch))
-        adv, _ = hmtx[gid]
-        total += adv / upm * font_size + ls_px
-    return total
+    fontstore.install(FONT_DMMONO)
 
 
 # ---------------------------------------------------------------------------
 # Font base64 embedding
 # ---------------------------------------------------------------------------
 
-def _b64(path: Path) -> str:
-    return base64.b64encode(path.read_bytes()).decode("ascii")
-
-
-def _font_face(family: str, path: Path, style: str = "normal", weight: str = "400") -> str:
-    b64 = _b64(path)
+def _font_face(family: str, path: Path, style: str = "normal", weight: str = "400",
+               text: str = None) -> str:
+    """@font-face rule; the font is subset to `text` (see brandkit.embed)."""
+    b64 = embed.font_b64(path, text)
     return (
         f"@font-face {{\n"
         f"  font-family: '{family}';\n"
@@ -200,16 +129,23 @@ def _font_face(family: str, path: Path, style: str = "normal", weight: str = "40
 # SVG builder
 # ---------------------------------------------------------------------------
 
-def build_svg() -> str:
+@trace.traced("svg")
+def build_svg(title: str = WM_TEXT, tagline: str = TAGLINE, url: str = URL_TEXT,
+              split: int = WM_SPLIT) -> str:
+    """
+    The card SVG. `title` replaces the wordmark: its first `split` characters
+    are white, the rest amber. Text is XML-escaped; a title or tagline wider
+    than TEXT_MAX_W is set smaller to fit.
+    """
     # --- measure wordmark ---
-    wm_full = "CUSTODYZERO"
-    wm_prefix = "CUSTODY"  # white portion
+    wm_full = title
 
-    wm_total_w = measure_width(wm_full, FONT_BEBAS, WM_FONT_SIZE, WM_LS_EM)
+    wm_size = fit_size(wm_full, FONT_BEBAS, WM_FONT_SIZE, WM_LS_EM, TEXT_MAX_W)
+    wm_total_w = measure_width(wm_full, FONT_BEBAS, wm_size, WM_LS_EM)
     wm_x = (W - wm_total_w) / 2.0
 
-    # x position where "ZERO" starts (after "CUSTODY" + its trailing ls gap)
-    zero_x = wm_x + x_after(wm_prefix, FONT_BEBAS, WM_FONT_SIZE, WM_LS_EM)
+    # colour split: middle of the ink gap between "CUSTODY" and "ZERO"
+    zero_x = wm_x + split_x(wm_full, split, FONT_BEBAS, wm_size, WM_LS_EM)
 
     # --- amber rule: full wordmark width, centered ---
     rule_y = WM_Y_BASELINE + RULE_OFFSET_Y
@@ -217,12 +153,13 @@ def build_svg() -> str:
     rule_x2 = wm_x + wm_total_w
 
     # --- tagline: centered ---
-    tl_text = "The capability is yours."
-    tl_w = measure_width(tl_text, FONT_FRAUNCES, TL_FONT_SIZE, 0.0)
+    tl_text = tagline
+    tl_size = fit_size(tl_text, FONT_FRAUNCES, TL_FONT_SIZE, 0.0, TEXT_MAX_W)
+    tl_w = measure_width(tl_text, FONT_FRAUNCES, tl_size, 0.0)
     tl_x = (W - tl_w) / 2.0
 
     # --- url: centered ---
-    url_text = "custodyzero.com"
+    url_text = url
     url_w = measure_width(url_text, FONT_DMMONO, URL_FONT_SIZE, 0.0)
     url_x = (W - url_w) / 2.0
 
@@ -233,9 +170,9 @@ def build_svg() -> str:
 
     # --- font face declarations ---
     styles = "\n".join([
-        _font_face("Bebas Neue", FONT_BEBAS, "normal", "400"),
-        _font_face("Fraunces", FONT_FRAUNCES, "italic", "300"),
-        _font_face("DM Mono", FONT_DMMONO, "normal", "400"),
+        _font_face("Bebas Neue", FONT_BEBAS, "normal", "400", wm_full),
+        _font_face("Fraunces", FONT_FRAUNCES, "italic", "300", tl_text),
+        _font_face("DM Mono", FONT_DMMONO, "normal", "400", url_text),
     ])
 
     # --- grid path: build horizontal + vertical lines ---
@@ -288,14 +225,14 @@ def build_svg() -> str:
   <!-- 4. Wordmark: white portion (CUSTODY) -->
   <text x="{wm_x:.2f}" y="{WM_Y_BASELINE}"
         font-family="'Bebas Neue', sans-serif"
-        font-size="{WM_FONT_SIZE}" letter-spacing="{WM_LS_EM}em"
-        fill="{WHITE}" clip-path="url(#clipWhite)">{wm_full}</text>
+        font-size="{wm_size}" letter-spacing="{WM_LS_EM}em"
+        fill="{WHITE}" clip-path="url(#clipWhite)">{escape(wm_full)}</text>
 
   <!-- 4b. Wordmark: amber portion (ZERO) -->
   <text x="{wm_x:.2f}" y="{WM_Y_BASELINE}"
         font-family="'Bebas Neue', sans-serif"
-        font-size="{WM_FONT_SIZE}" letter-spacing="{WM_LS_EM}em"
-        fill="{AMBER}" clip-path="url(#clipAmber)">{wm_full}</text>
+        font-size="{wm_size}" letter-spacing="{WM_LS_EM}em"
+        fill="{AMBER}" clip-path="url(#clipAmber)">{escape(wm_full)}</text>
 
   <!-- 5. Amber horizontal rule -->
   <line x1="{rule_x1:.2f}" y1="{rule_y}" x2="{rule_x2:.2f}" y2="{rule_y}"
@@ -305,39 +242,58 @@ def build_svg() -> str:
   <text x="{tl_x:.2f}" y="{TL_Y_BASELINE}"
         font-family="'Fraunces', Georgia, serif"
         font-style="italic" font-weight="300"
-        font-size="{TL_FONT_SIZE}" fill="{TEXT_SECONDARY}"
-        letter-spacing="0.01em">{tl_text}</text>
+        font-size="{tl_size}" fill="{TEXT_SECONDARY}"
+        letter-spacing="0.01em">{escape(tl_text)}</text>
 
   <!-- 7. URL -->
   <text x="{url_x:.2f}" y="{URL_Y_BASELINE}"
         font-family="'DM Mono', 'Courier New', monospace"
         font-size="{URL_FONT_SIZE}" fill="{TEXT_MUTED}"
-        letter-spacing="0.05em">{url_text}</text>
+        letter-spacing="0.05em">{escape(url_text)}</text>
 </svg>
 """
     return svg
 
 
 # ---------------------------------------------------------------------------
-# Grain overlay (no numpy — seeded random for determinism)
+# Grain overlay (seeded random for determinism)
 # ---------------------------------------------------------------------------
 
-def add_grain(img: Image.Image, opacity: float = GRAIN_OPACITY, seed: int = GRAIN_SEED) -> Image.Image:
+def add_grain(img: Image.Image, opacity: float = GRAIN_OPACITY, seed: int = GRAIN_SEED,
+              style: grain.GrainStyle = GRAIN_STYLE) -> Image.Image:
     """
     Overlay monochromatic film grain at the given opacity.
-    Uses a seeded RNG so output is fully deterministic.
+    Uses a seeded RNG so output is fully deterministic (see brandkit.grain).
+    """
+    return grain.add_grain(img, opacity, seed, style)
+
+
+# ---------------------------------------------------------------------------
+# PNG output
+# ---------------------------------------------------------------------------
+
+@trace.traced("encode")
+def card_png(svg: str, scale: int = 1, style: grain.GrainStyle = GRAIN_STYLE) -> bytes:
+    """Rasterize the card at `scale`× with the seeded grain overlay; returns PNG bytes."""
+    png_bytes = raster.load(svg).render_png(W * scale, H * scale)
+    img = Image.open(io.BytesIO(png_bytes))
+    img = add_grain(img, opacity=GRAIN_OPACITY, seed=GRAIN_SEED, style=style)
+    buf = io.BytesIO()
+    img.save(buf, format="PNG", optimize=False)
+    return buf.getvalue()
+
+
+def write_png(svg: str, out_path: Path, style: grain.GrainStyle = GRAIN_STYLE,
+              alternates: encode.Alternates = encode.NONE) -> None:
+    """
+    Rasterize the card, add the seeded grain overlay and write the PNG, plus
+    its WebP/AVIF companions (see brandkit.encode).
     """
-    w, h = img.size
-    rng = random.Random(seed)
-    noise_bytes = rng.randbytes(w * h)
-    noise = Image.frombytes("L", (w, h), noise_bytes)
-    # Scale L channel to target opacity via paste with alpha mask
-    alpha_val = int(255 * opacity)
-    alpha_mask = Image.new("L", (w, h), alpha_val)
-    grain_rgba = Image.merge("RGBA", [noise, noise, noise, alpha_mask])
-    result = img.convert("RGBA")
-    result = Image.alpha_composite(result, grain_rgba)
-    return result.convert("RGB")
+    png = card_png(svg, 1, style)
+    out_path.write_bytes(png)
+    print(f"  {out_path.relative_to(BASE)} ({W}×{H}, grain: {style})")
+    for path in encode.write_alternates(png, out_path, alternates):
+        print(f"  {path.relative_to(BASE)} ({path.stat().st_size / 1024:.0f}KB)")
 
 
 # ---------------------------------------------------------------------------
@@ -345,6 +301,7 @@ def add_grain(img: Image.Image, opacity: float = GRAIN_OPACITY, seed: int = GRAI
 # ---------------------------------------------------------------------------
 
 def main() -> None:
+    fontstore.configure()
     if not FONT_BEBAS.exists():
         raise FileNotFoundError(
             f"Bebas Neue not found at {FONT_BEBAS}. Run scripts/install-fonts.py first."
@@ -363,19 +320,9 @@ def main() -> None:
     svg_path.write_text(svg, encoding="utf-8")
     print(f"  SVG reference: {svg_path.relative_to(BASE)}")
 
-    print("Rasterizing to PNG…")
-    png_bytes = cairosvg.svg2png(
-        bytestring=svg.encode("utf-8"),
-        output_width=W,
-        output_height=H,
-    )
-    img = Image.open(io.BytesIO(png_bytes))
-
-    print("Adding grain overlay…")
-    img = add_grain(img, opacity=GRAIN_OPACITY, seed=GRAIN_SEED)
-
-    img.save(str(OUT_PATH), format="PNG", optimize=False)
-    print(f"  {OUT_PATH.relative_to(BASE)} ({W}×{H})")
+    print("Rasterizing to PNG with grain overlay…")
+    build.submit(write_png, svg, OUT_PATH, grain.style_from_env(GRAIN_STYLE),
+                 encode.alternates_from_env(encode.FORMATS))
 
     print("\nDone.")
 
@@ -10,19 +10,15 @@ Usage:
   python3 scripts/generate-stationzero.py
 """
 
-import base64
-import os
-import struct
 from pathlib import Path
 
-import cairosvg
-from fontTools.ttLib import TTFont
+from brandkit import build, embed, encode, fontpaths, fonts, fontstore, icons, raster, trace
 
 BASE = Path(__file__).parent.parent
 WORDMARK_DIR = BASE / "brand" / "stationzero" / "wordmark"
 ICON_DIR = BASE / "brand" / "stationzero" / "icon"
 
-FONT_PATH = Path.home() / "Library" / "Fonts" / "BebasNeue-Regular.ttf"
+FONT_PATH = fontpaths.find("Bebas Neue")
 
 SIGNAL_RED = "#C04848"
 SIGNAL_RED_DIM = "#7A2E2E"
@@ -37,9 +33,9 @@ WM_X_START = 3.0
 WM_Y_BASELINE = 69.5  # Same as CustodyZero
 
 
-def load_font_b64() -> str:
-    with open(FONT_PATH, "rb") as f:
-        return base64.b64encode(f.read()).decode("ascii")
+def load_font_b64(text: str = None) -> str:
+    """Base64 TTF for @font-face, subset to the glyphs in `text` (see brandkit.embed)."""
+    return embed.font_b64(FONT_PATH, text)
 
 
 def measure_text_width(text: str, font_size: float, letter_spacing_em: float) -> float:
@@ -47,45 +43,17 @@ def measure_text_width(text: str, font_size: float, letter_spacing_em: float) ->
     Compute the visual ink width of `text` using actual glyph advance widths.
     Excludes trailing letter-spacing (matches visual extent, not advance extent).
     """
-    tt = TTFont(str(FONT_PATH))
-    cmap = tt.getBestCmap()
-    hmtx = tt["hmtx"].metrics
-    upm = tt["head"].unitsPerEm
+    return fonts.measure_width(text, FONT_PATH, font_size, letter_spacing_em)
 
-    advances = []
-    for char in text:
-        gid = cmap.get(ord(char))
-        if gid is None:
-            raise ValueError(f"Glyph not found for character '{char}' (U+{ord(char):04X})")
-        adv, _ = hmtx[gid]
-        advances.append(adv / upm * font_size)
 
-    spacing_px = letter_spacing_em * font_size
-    return sum(advances) + (len(text) - 1) * spacing_px
-
-
-def measure_split_x(prefix: str, font_size: float, letter_spacing_em: float) -> float:
+def measure_split_x(text: str, split: int, font_size: float, letter_spacing_em: float) -> float:
     """
-    Compute the x-position where the color split occurs: the advance width
-    of the prefix text including its trailing letter-spacing (since a character
-    follows). This is the boundary between STATION and ZERO.
+    Compute the x-position where the color split occurs: the middle of the
+    ink gap between text[split - 1] and text[split], so the clip edge falls
+    clear of both glyphs however the renderer rounds. This is the boundary
+    between STATION and ZERO.
     """
-    tt = TTFont(str(FONT_PATH))
-    cmap = tt.getBestCmap()
-    hmtx = tt["hmtx"].metrics
-    upm = tt["head"].unitsPerEm
-
-    advances = []
-    for char in prefix:
-        gid = cmap.get(ord(char))
-        if gid is None:
-            raise ValueError(f"Glyph not found for character '{char}' (U+{ord(char):04X})")
-        adv, _ = hmtx[gid]
-        advances.append(adv / upm * font_size)
-
-    spacing_px = letter_spacing_em * font_size
-    # Include trailing spacing because ZERO follows immediately
-    return sum(advances) + len(prefix) * spacing_px
+    return fonts.split_x(text, split, FONT_PATH, font_size, letter_spacing_em)
 
 
 def font_face(b64: str) -> str:
@@ -100,6 +68,7 @@ def font_face(b64: str) -> str:
     )
 
 
+@trace.traced("svg")
 def wordmark_svg(font_b64: str, full_width: float, split_x: float, canvas_w: int) -> str:
     """
     Generate the StationZero wordmark SVG.
@@ -108,10 +77,7 @@ def wordmark_svg(font_b64: str, full_width: float, split_x: float, canvas_w: int
     rendered at the same position, clipped at the split boundary.
     Left clip shows STATION in --white, right clip shows ZERO in Signal Red.
     """
-    # Nudge split 2px left into the N–Z letter-spacing gap to compensate
-    # for sub-pixel rounding differences between fontTools metrics and
-    # browser SVG text layout. The gap is ~12.5px so this is invisible.
-    split_abs = WM_X_START + split_x - 2.0
+    split_abs = WM_X_START + split_x
     return (
         f'<svg xmlns="http://www.w3.org/2000/svg"'
         f' viewBox="0 0 {canvas_w} {WM_CANVAS_H}"'
@@ -133,6 +99,7 @@ def wordmark_svg(font_b64: str, full_width: float, split_x: float, canvas_w: int
     )
 
 
+@trace.traced("svg")
 def wordmark_red_svg(font_b64: str, full_width: float, canvas_w: int) -> str:
     """
     Generate a single-color Signal Red variant for light backgrounds
@@ -154,6 +121,7 @@ def wordmark_red_svg(font_b64: str, full_width: float, canvas_w: int) -> str:
     )
 
 
+@trace.traced("svg")
 def icon_svg() -> str:
     """
     Generate the StationZero icon mark SVG.
@@ -190,48 +158,24 @@ def icon_svg() -> str:
     )
 
 
-def svg_to_png(svg_content: str, out_path: Path, width: int, height: int):
-    cairosvg.svg2png(
-        bytestring=svg_content.encode("utf-8"),
-        write_to=str(out_path),
-        output_width=width,
-        output_height=height,
-    )
+def svg_to_png(svg_content: str, out_path: Path, width: int, height: int,
+               alternates: encode.Alternates = encode.NONE):
+    png = raster.load(svg_content).render_png(width, height)
+    out_path.write_bytes(png)
     print(f"  {out_path.relative_to(BASE)} ({width}×{height})")
+    for path in encode.write_alternates(png, out_path, alternates):
+        print(f"  {path.relative_to(BASE)}")
 
 
 def svg_to_ico(svg_content: str, out_path: Path, sizes: list):
     """
     Build a multi-size ICO by embedding one PNG frame per requested size.
     """
-    png_list = [
-        cairosvg.svg2png(
-            bytestring=svg_content.encode("utf-8"),
-            output_width=s,
-            output_height=s,
-        )
-        for s in sizes
-    ]
-
-    n = len(sizes)
-    header = struct.pack("<HHH", 0, 1, n)
-
-    data_offset = 6 + n * 16
-    entries = b""
-    data = b""
-    offset = data_offset
-    for size, png in zip(sizes, png_list):
-        w = size if size < 256 else 0
-        h = size if size < 256 else 0
-        entries += struct.pack("<BBBBHHII", w, h, 0, 0, 1, 32, len(png), offset)
-        data += png
-        offset += len(png)
-
-    out_path.write_bytes(header + entries + data)
-    print(f"  {out_path.relative_to(BASE)} (ICO frames: {sizes})")
+    icons.svg_to_ico(svg_content, out_path, sizes, BASE)
 
 
 def main():
+    fontstore.configure()
     WORDMARK_DIR.mkdir(parents=True, exist_ok=True)
     ICON_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -242,11 +186,11 @@ def main():
         )
 
     print("Loading font…")
-    font_b64 = load_font_b64()
+    font_b64 = load_font_b64("STATIONZERO")
 
     print("Measuring text widths…")
     full_width = measure_text_width("STATIONZERO", WM_FONT_SIZE, WM_LETTER_SPACING_EM)
-    split_x = measure_split_x("STATION", WM_FONT_SIZE, WM_LETTER_SPACING_EM)
+    split_x = measure_split_x("STATIONZERO", len("STATION"), WM_FONT_SIZE, WM_LETTER_SPACING_EM)
     print(f"  'STATIONZERO' at {WM_FONT_SIZE}px, {WM_LETTER_SPACING_EM}em spacing → {full_width:.2f}px")
     print(f"  Split point (after STATION): {split_x:.2f}px from x_start")
 
@@ -271,7 +215,8 @@ def main():
     for variant, svg_content in [("dark", wm_dark), ("red", wm_red)]:
         for scale in [2, 3]:
             out = WORDMARK_DIR / f"stationzero-wordmark-{variant}@{scale}x.png"
-            svg_to_png(svg_content, out, canvas_w * scale, WM_CANVAS_H * scale)
+            build.submit(svg_to_png, svg_content, out, canvas_w * scale, WM_CANVAS_H * scale,
+                         encode.alternates_from_env())
 
     # --- Icon mark ---
     print("\nGenerating icon mark…")
@@ -284,11 +229,11 @@ def main():
     print("\nRasterizing icon…")
     for scale in [2, 3]:
         out = ICON_DIR / f"stationzero-icon-dark@{scale}x.png"
-        svg_to_png(icon, out, 64 * scale, 64 * scale)
+        build.submit(svg_to_png, icon, out, 64 * scale, 64 * scale)
 
     print("\nGenerating ICO…")
     ico_path = ICON_DIR / "stationzero-icon-dark.ico"
-    svg_to_ico(icon, ico_path, [16, 32, 48])
+    build.submit(svg_to_ico, icon, ico_path, [16, 32, 48])
 
     print("\nDone.")
 
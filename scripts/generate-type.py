@@ -11,14 +11,9 @@ Usage:
   python3 scripts/generate-type.py
 """
 
-import base64
-import io
-import os
 from pathlib import Path
 
-import cairosvg
-from fontTools.ttLib import TTFont
-from PIL import Image
+from brandkit import build, embed, encode, fontpaths, fonts, fontstore, icons, raster, trace
 
 
 BASE = Path(__file__).parent.parent
@@ -27,7 +22,7 @@ WORDMARK_DIR = BRAND_DIR / "wordmark"
 ICON_DIR = BRAND_DIR / "icon"
 SOCIAL_DIR = BRAND_DIR / "social"
 
-FONT_PATH = Path.home() / "Library" / "Fonts" / "Cormorant-Light.ttf"
+FONT_PATH = fontpaths.find("Cormorant", 300)
 
 # Brand tokens
 PENCIL = "#8B3A3A"
@@ -47,29 +42,17 @@ WM_Y_BASELINE = 72.0   # ~5.5px top clearspace above ascender
 WM_X_START = 3.0
 WM_CANVAS_H = 98        # baseline(72) + descender(21) + clearspace(5) = 98
 
+SOCIAL_TAGLINE = "A long-form writing instrument"
 
-def load_font_b64() -> str:
-    with open(FONT_PATH, "rb") as f:
-        return base64.b64encode(f.read()).decode("ascii")
+
+def load_font_b64(text: str = None) -> str:
+    """Base64 TTF for @font-face, subset to the glyphs in `text` (see brandkit.embed)."""
+    return embed.font_b64(FONT_PATH, text)
 
 
 def measure_text_width(text: str, font_size: float, letter_spacing_em: float) -> float:
     """Compute visual ink width using actual glyph advance widths."""
-    tt = TTFont(str(FONT_PATH))
-    cmap = tt.getBestCmap()
-    hmtx = tt["hmtx"].metrics
-    upm = tt["head"].unitsPerEm
-
-    advances = []
-    for char in text:
-        gid = cmap.get(ord(char))
-        if gid is None:
-            raise ValueError(f"Glyph not found for '{char}' (U+{ord(char):04X})")
-        adv, _ = hmtx[gid]
-        advances.append(adv / upm * font_size)
-
-    spacing_px = letter_spacing_em * font_size
-    return sum(advances) + (len(text) - 1) * spacing_px
+    return fonts.measure_width(text, FONT_PATH, font_size, letter_spacing_em)
 
 
 def font_face(b64: str) -> str:
@@ -83,6 +66,7 @@ def font_face(b64: str) -> str:
     )
 
 
+@trace.traced("svg")
 def wordmark_svg(text_color: str, font_b64: str, text_width: float) -> str:
     canvas_w = int(WM_X_START + text_width + 10)
     return f"""<svg xmlns="http://www.w3.org/2000/svg" width="{canvas_w}" height="{WM_CANVAS_H}" viewBox="0 0 {canvas_w} {WM_CANVAS_H}">
@@ -102,6 +86,7 @@ def wordmark_svg(text_color: str, font_b64: str, text_width: float) -> str:
 </svg>"""
 
 
+@trace.traced("svg")
 def social_card_svg(font_b64: str) -> str:
     """Open Graph social preview card — 1200x630."""
     return f"""<svg xmlns="http://www.w3.org/2000/svg" width="1200" height="630" viewBox="0 0 1200 630">
@@ -129,7 +114,7 @@ def social_card_svg(font_b64: str) -> str:
   <text x="600" y="390" text-anchor="middle"
         font-family="'Cormorant', Georgia, serif"
         font-size="18" font-weight="300"
-        fill="{INK_MUTED}">A long-form writing instrument</text>
+        fill="{INK_MUTED}">{SOCIAL_TAGLINE}</text>
 
   <!-- CustodyZero attribution -->
   <text x="600" y="590" text-anchor="middle"
@@ -139,35 +124,26 @@ def social_card_svg(font_b64: str) -> str:
 </svg>"""
 
 
-def svg_to_png(svg_content: str, out_path: Path, width: int, height: int):
-    cairosvg.svg2png(
-        bytestring=svg_content.encode("utf-8"),
-        write_to=str(out_path),
-        output_width=width,
-        output_height=height,
-    )
+def svg_to_png(svg_content: str, out_path: Path, width: int, height: int,
+               alternates: encode.Alternates = encode.NONE):
+    png = raster.load(svg_content).render_png(width, height)
+    out_path.write_bytes(png)
     print(f"  {out_path.name} ({width}x{height})")
+    for path in encode.write_alternates(png, out_path, alternates):
+        print(f"  {path.name}")
 
 
 def svg_to_png_from_file(svg_path: Path, out_path: Path, width: int, height: int):
-    cairosvg.svg2png(
-        url=str(svg_path),
-        write_to=str(out_path),
-        output_width=width,
-        output_height=height,
-    )
+    raster.load_file(svg_path).write_png(out_path, width, height)
     print(f"  {out_path.name} ({width}x{height})")
 
 
 def svg_to_ico(svg_path: Path, out_path: Path, sizes: list[int]):
-    max_size = max(sizes)
-    png_bytes = cairosvg.svg2png(url=str(svg_path), output_width=max_size, output_height=max_size)
-    img = Image.open(io.BytesIO(png_bytes)).convert("RGBA")
-    img.save(str(out_path), format="ICO", sizes=[(s, s) for s in sizes])
-    print(f"  {out_path.name} (ICO {sizes})")
+    icons.svg_to_ico(svg_path.read_text(encoding="utf-8"), out_path, sizes, out_path.parent)
 
 
 def main():
+    fontstore.configure()
     for d in [WORDMARK_DIR, ICON_DIR, SOCIAL_DIR]:
         d.mkdir(parents=True, exist_ok=True)
 
@@ -176,7 +152,7 @@ def main():
         print("Run: python3 scripts/install-cormorant.py")
         return
 
-    font_b64 = load_font_b64()
+    font_b64 = load_font_b64(WM_TEXT)
     text_width = measure_text_width(WM_TEXT, WM_FONT_SIZE, WM_LETTER_SPACING_EM)
     canvas_w = int(WM_X_START + text_width + 10)
 
@@ -196,27 +172,33 @@ def main():
     # --- Wordmark PNGs ---
     print("Rasterizing wordmark PNGs...")
     for variant, svg_content in [("light", light_svg), ("dark", dark_svg)]:
-        svg_to_png(
+        build.submit(
+            svg_to_png,
             svg_content,
             WORDMARK_DIR / f"type-wordmark-{variant}@2x.png",
             canvas_w * 2, WM_CANVAS_H * 2,
+            encode.alternates_from_env(),
         )
-        svg_to_png(
+        build.submit(
+            svg_to_png,
             svg_content,
             WORDMARK_DIR / f"type-wordmark-{variant}@3x.png",
             canvas_w * 3, WM_CANVAS_H * 3,
+            encode.alternates_from_env(),
         )
 
     # --- Icon PNGs ---
     print("Rasterizing icon PNGs...")
     for variant in ["light", "dark"]:
         svg_path = ICON_DIR / f"type-icon-{variant}.svg"
-        svg_to_png_from_file(
+        build.submit(
+            svg_to_png_from_file,
             svg_path,
             ICON_DIR / f"type-icon-{variant}@2x.png",
             128, 128,
         )
-        svg_to_png_from_file(
+        build.submit(
+            svg_to_png_from_file,
             svg_path,
             ICON_DIR / f"type-icon-{variant}@3x.png",
             192, 192,
@@ -224,7 +206,8 @@ def main():
 
     # --- Icon ICO ---
     print("Generating ICO...")
-    svg_to_ico(
+    build.submit(
+        svg_to_ico,
         ICON_DIR / "type-icon-light.svg",
         ICON_DIR / "type-icon-light.ico",
         [16, 32, 48],
@@ -232,15 +215,17 @@ def main():
 
     # --- Social card ---
     print("Generating social card...")
-    social_svg_content = social_card_svg(font_b64)
+    social_svg_content = social_card_svg(load_font_b64(WM_TEXT + SOCIAL_TAGLINE))
     social_svg_path = SOCIAL_DIR / "type-social-card.svg"
     social_svg_path.write_text(social_svg_content)
     print(f"  {social_svg_path.name} (1200x630)")
 
-    svg_to_png(
+    build.submit(
+        svg_to_png,
         social_svg_content,
         SOCIAL_DIR / "type-social-card.png",
         2400, 1260,
+        encode.alternates_from_env(encode.FORMATS),
     )
 
     print("\nDone. All Type brand assets generated.")
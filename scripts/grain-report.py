@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Tabulate PNG size against image quality for film-grain styles.
+
+Renders the CustodyZero social card once without grain, then applies each
+candidate style (see brandkit.grain) at the card's 3.5% opacity and seed,
+encodes it exactly as generate-social.py does and reports:
+
+  size    encoded PNG bytes
+  ×full   how many times smaller than the current full-entropy grain
+  PSNR    peak signal-to-noise ratio against the grain-free card (dB); equal
+          PSNR means the grain adds the same amount of texture
+  RMS     root-mean-square grain amplitude in 8-bit levels
+
+Prerequisites:
+  pip install cairosvg Pillow fonttools brotli numpy
+  Fonts as for scripts/generate-social.py.
+
+Usage:
+  python3 scripts/grain-report.py
+  python3 scripts/grain-report.py --styles full levels=2 tile=64 levels=2,tile=128
+  python3 scripts/grain-report.py --base clean-card.png   # skip rendering
+"""
+
+import argparse
+import io
+import math
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from brandkit import build, fontstore, grain, raster
+
+SCRIPTS = Path(__file__).parent
+
+DEFAULT_STYLES = [
+    "full",
+    "levels=4",
+    "levels=2",
+    "tile=128",
+    "tile=64",
+    "tile=32",
+    "levels=2,tile=128",
+    "levels=2,tile=64",
+    "levels=2,tile=32",
+]
+
+
+def clean_card() -> Image.Image:
+    """The CustodyZero social card rendered without grain."""
+    social = build.load_script(str(SCRIPTS / "generate-social.py"))
+    social.ensure_fraunces()
+    social.ensure_dmmono()
+    png = raster.load(social.build_svg()).render_png(social.W, social.H)
+    return Image.open(io.BytesIO(png)).convert("RGB")
+
+
+def encoded_size(img: Image.Image, optimize: bool) -> int:
+    buf = io.BytesIO()
+    img.save(buf, format="PNG", optimize=optimize)
+    return buf.tell()
+
+
+def psnr_rms(img: Image.Image, ref: Image.Image) -> tuple:
+    diff = np.asarray(img, dtype=np.float64) - np.asarray(ref, dtype=np.float64)
+    mse = float(np.mean(diff * diff))
+    psnr = math.inf if mse == 0 else 10 * math.log10(255 ** 2 / mse)
+    return psnr, math.sqrt(mse)
+
+
+def main() -> None:
+    fontstore.configure()
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--styles", nargs="+", default=DEFAULT_STYLES, metavar="STYLE",
+                        help="grain styles to compare ('full', 'levels=N', 'tile=T', 'levels=N,tile=T')")
+    parser.add_argument("--base", type=Path,
+                        help="grain-free card PNG to use instead of rendering generate-social.py's SVG")
+    parser.add_argument("--optimize", action="store_true",
+                        help="encode with Pillow's optimize=True (the card itself is written without)")
+    args = parser.parse_args()
+
+    styles = [grain.parse_style(s) for s in args.styles]
+    social = build.load_script(str(SCRIPTS / "generate-social.py"))
+    base = Image.open(args.base).convert("RGB") if args.base else clean_card()
+
+    print(f"Card {base.width}×{base.height}, grain opacity {social.GRAIN_OPACITY}, "
+          f"seed {social.GRAIN_SEED}, optimize={args.optimize}")
+    print(f"  grain-free: {encoded_size(base, args.optimize) / 1024:.1f} KB\n")
+
+    rows = []
+    for style in styles:
+        img = grain.add_grain(base, social.GRAIN_OPACITY, social.GRAIN_SEED, style)
+        rows.append((str(style), encoded_size(img, args.optimize), *psnr_rms(img, base)))
+
+    full = next((size for name, size, *_ in rows if name == "full"), None)
+    print(f"  {'style':<20} {'size':>10} {'×full':>7} {'PSNR':>9} {'RMS':>6}")
+    for name, size, psnr, rms in rows:
+        ratio = f"{full / size:.2f}" if full else "—"
+        print(f"  {name:<20} {size / 1024:>7.1f} KB {ratio:>7} {psnr:>6.2f} dB {rms:>6.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,60 +1,89 @@
 #!/usr/bin/env python3
 """
-Download and install Bebas Neue (latin subset) for use with cairosvg.
+Provision the brand fonts pinned in scripts/fonts.lock.json.
 
-cairosvg resolves fonts via fontconfig / system font paths, not via SVG
-@font-face data URIs. This script places the TTF in the correct location
-so that rasterize.py produces output using the actual brand typeface.
+Each locked font (Bebas Neue, Cormorant Light, DM Mono, Fraunces Light
+Italic, Zilla Slab) is put in the local content-addressed font store (see
+brandkit.fontstore) — downloaded from its pinned source, or imported from a
+directory of TTFs on machines without network access — verified against its
+SHA-256, and installed into the user font directory. The generators find
+fonts in the store, user or system font directories (brandkit.fontpaths).
+
+Builds then resolve fonts from the store: no network, and no `fc-cache -f`
+(the build scripts point FONTCONFIG_FILE at the store's own fontconfig config).
 
 Prerequisites:
-  pip install fonttools brotli requests
+  pip install fonttools brotli
 
 Idempotent: safe to run multiple times.
+
+Usage:
+  python3 scripts/install-fonts.py                          # every locked font
+  python3 scripts/install-fonts.py Cormorant-Light.ttf      # selected fonts
+  python3 scripts/install-fonts.py --import /mnt/fonts      # offline, from TTFs
+  python3 scripts/install-fonts.py --relock                 # re-pin to fetched bytes
+  BRANDKIT_OFFLINE=1 python3 scripts/install-fonts.py       # fail rather than download
 """
-import os
+import argparse
+import hashlib
 import sys
-import urllib.request
 from pathlib import Path
 
+from brandkit import fontpaths, fontstore
+
+
+def provision(names, locked, relocked, args) -> None:
+    """Store (and install) each named font; relocked collects re-pinned entries."""
+    for name in names:
+        entry = locked[name]
+        if not args.relock and fontstore.stored(name) is not None:
+            print(f"  {name}: in store")
+        else:
+            if args.source is not None:
+                data = (args.source / name).read_bytes()
+            else:
+                print(f"  {name}: fetching {entry.family} {entry.weight} {entry.style}…")
+                data = fontstore.download(entry)
+            if args.relock:
+                entry = relocked[name] = entry._replace(sha256=hashlib.sha256(data).hexdigest())
+            fontstore.add(data, entry)
+            print(f"  {name}: stored ({entry.sha256[:12]}…)")
+        if not args.store_only:
+            fontstore.install((args.dest or fontpaths.user_dir()) / name)
+
+
+def main(argv=None):
+    locked = fontstore.lock()
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("fonts", nargs="*", metavar="FILE",
+                        help=f"locked font files (default: all — {', '.join(locked)})")
+    parser.add_argument("--import", dest="source", type=Path, metavar="DIR",
+                        help="take the TTFs from DIR instead of downloading them")
+    parser.add_argument("--relock", action="store_true",
+                        help="pin the lockfile to the bytes obtained now")
+    parser.add_argument("--dest", type=Path, default=None,
+                        help="font directory to install into (default: the user font directory)")
+    parser.add_argument("--store-only", action="store_true",
+                        help="fill the store but install nothing into a font directory")
+    args = parser.parse_args(argv)
+
+    unknown = [f for f in args.fonts if f not in locked]
+    if unknown:
+        parser.error(f"not in {fontstore.LOCKFILE.name}: {', '.join(unknown)}")
+    names = args.fonts or list(locked)
+    print(f"Font store: {fontstore.store_dir()}")
+
+    relocked = dict(locked)
+    try:
+        provision(names, locked, relocked, args)
+    except fontstore.FontMissing as exc:
+        sys.exit(f"error: {exc}")
 
-WOFF2_URL = (
-    "https://fonts.gstatic.com/s/bebasneue/v16/"
-    "JTUSjIg69CK48gW7PXoo9WlhyyTh89Y.woff2"
-)
-FONT_NAME = "BebasNeue-Regular.ttf"
-
-
-def font_dir() -> Path:
-    if sys.platform == "darwin":
-        return Path.home() / "Library" / "Fonts"
-    elif sys.platform.startswith("linux"):
-        d = Path.home() / ".local" / "share" / "fonts"
-        d.mkdir(parents=True, exist_ok=True)
-        return d
-    else:
-        raise RuntimeError(f"Unsupported platform: {sys.platform}")
-
-
-def main():
-    dest = font_dir() / FONT_NAME
-    if dest.exists():
-        print(f"Already installed: {dest}")
-        return
-
-    print(f"Downloading Bebas Neue (latin) from Google Fonts…")
-    woff2_path = Path("/tmp/bebas-neue-install.woff2")
-    urllib.request.urlretrieve(WOFF2_URL, woff2_path)
-
-    print("Converting woff2 → TTF (requires fonttools + brotli)…")
-    from fontTools.ttLib import TTFont
-    font = TTFont(str(woff2_path))
-    font.flavor = None
-    font.save(str(dest))
-    print(f"Installed: {dest}")
-
-    if sys.platform.startswith("linux"):
-        os.system("fc-cache -f")
-        print("Font cache refreshed.")
+    if args.relock:
+        fontstore.write_lock(relocked.values())
+        print(f"Updated {fontstore.LOCKFILE.name}")
+    if fontstore.complete():
+        print(f"All locked fonts present; builds use {fontstore.fontconfig_file()}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Render social cards in bulk from a JSONL or CSV manifest.
+
+One row per card. Columns / keys:
+
+  out       output path, relative to --out-dir (or give `slug` → <slug>.png)
+  card      custodyzero | factory | stationzero | steward | valet
+            (default: --card)
+  title, tagline, url, split, scale
+            as for scripts/og-server.py; empty or missing → the card's own
+
+The manifest is streamed: rows are read one at a time, rendered on a process
+pool with at most --inflight cards outstanding, and each PNG is written
+(atomically) as soon as it finishes. Outputs that already exist are skipped,
+so an interrupted run picks up where it stopped; --force re-renders them.
+Bad rows are reported with their line number and the run continues.
+
+Prerequisites:
+  pip install cairosvg Pillow fonttools brotli
+  Fonts as for the social card scripts (installed on first use if absent).
+
+Usage:
+  python3 scripts/og-batch.py pages.jsonl --out-dir site/og
+  python3 scripts/og-batch.py pages.csv --out-dir site/og --card valet --workers 8
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+
+from brandkit import cards, fontstore
+
+PROGRESS_EVERY = 500
+
+
+class Stats:
+    def __init__(self):
+        self.rendered = 0
+        self.skipped = 0
+        self.failed = 0
+        self.bytes = 0
+        self.start = time.perf_counter()
+
+    def line(self) -> str:
+        elapsed = time.perf_counter() - self.start
+        rate = self.rendered / elapsed if elapsed else 0.0
+        return (f"{self.rendered} rendered, {self.skipped} skipped, {self.failed} failed, "
+                f"{self.bytes / 1024 / 1024:.1f} MB in {elapsed:.1f}s ({rate:.0f}/s)")
+
+
+# ---------------------------------------------------------------------------
+# Manifest → render tasks (generator pipeline)
+# ---------------------------------------------------------------------------
+
+def read_rows(path: Path):
+    """Yield (line number, row dict or parse error) without loading the file."""
+    with path.open(encoding="utf-8", newline="") as f:
+        if path.suffix.lower() == ".csv":
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, row
+        else:
+            for n, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except ValueError as exc:
+                    yield n, exc
+                    continue
+                yield n, row if isinstance(row, dict) else ValueError("row is not an object")
+
+
+def _field(row: dict, key: str):
+    value = row.get(key)
+    return None if value is None or value == "" else value
+
+
+def parse_row(row: dict, out_dir: Path, default_card: str):
+    """(CardRequest, output path) for one manifest row."""
+    out = _field(row, "out")
+    if out is None:
+        slug = _field(row, "slug")
+        if slug is None:
+            raise ValueError("row needs 'out' or 'slug'")
+        out = f"{slug}.png"
+    out_path = (out_dir / str(out)).resolve()
+    if not out_path.is_relative_to(out_dir):
+        raise ValueError(f"output {out!r} escapes --out-dir")
+    card = _field(row, "card") or default_card
+    if card is None:
+        raise ValueError("row has no 'card' and no --card default was given")
+    try:
+        req = cards.normalize(
+            card,
+            title=_field(row, "title"),
+            tagline=_field(row, "tagline"),
+            url=_field(row, "url"),
+            split=_field(row, "split"),
+            scale=_field(row, "scale") or 1,
+        )
+    except KeyError:
+        raise ValueError(f"unknown card {card!r}") from None
+    return req, out_path
+
+
+def tasks(rows, out_dir: Path, default_card: str, force: bool, stats: Stats):
+    """Yield (line, request, out_path) for rows that still need rendering."""
+    prepared = set()
+    for n, row in rows:
+        try:
+            if isinstance(row, Exception):
+                raise row
+            req, out_path = parse_row(row, out_dir, default_card)
+        except (TypeError, ValueError) as exc:
+            stats.failed += 1
+            print(f"  line {n}: {exc}", file=sys.stderr)
+            continue
+        if not force and out_path.exists():
+            stats.skipped += 1
+            continue
+        if req.card not in prepared:
+            cards.prepare(req.card)
+            prepared.add(req.card)
+        yield n, req, out_path
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+def main() -> None:
+    fontstore.configure()
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("manifest", type=Path, help=".jsonl or .csv manifest")
+    parser.add_argument("--out-dir", type=Path, required=True)
+    parser.add_argument("--card", choices=sorted(cards.CARDS),
+                        help="card for rows without a 'card' column")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="render processes (default: CPU count)")
+    parser.add_argument("--inflight", type=int, default=None,
+                        help="max cards queued or rendering at once (default: 4 × workers)")
+    parser.add_argument("--force", action="store_true", help="re-render existing outputs")
+    args = parser.parse_args()
+
+    out_dir = args.out_dir.resolve()
+    inflight = args.inflight or 4 * args.workers
+    stats = Stats()
+    pending = {}
+
+    def collect(done) -> None:
+        for future in done:
+            n, out_path = pending.pop(future)
+            try:
+                stats.bytes += future.result()
+                stats.rendered += 1
+            except Exception as exc:
+                stats.failed += 1
+                print(f"  line {n}: {out_path.name}: {exc}", file=sys.stderr)
+                continue
+            if stats.rendered % PROGRESS_EVERY == 0:
+                print(f"  {stats.line()}")
+
+    print(f"Rendering {args.manifest} → {out_dir} ({args.workers} workers, {inflight} in flight)")
+    rows = read_rows(args.manifest)
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=cards.load_all) as pool:
+        for n, req, out_path in tasks(rows, out_dir, args.card, args.force, stats):
+            if len(pending) >= inflight:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+            pending[pool.submit(cards.write, req, str(out_path))] = (n, out_path)
+        collect(wait(pending).done)
+
+    print(f"\nDone: {stats.line()}")
+    if stats.failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
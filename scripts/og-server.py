@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Serve per-page Open Graph cards rendered on request.
+
+Each card is one of the brand social cards (scripts/generate-*social.py)
+with a caller-supplied title, tagline and URL:
+
+  GET /<card>.png?title=…&tagline=…&url=…&split=N&scale=1|2
+  GET /healthz
+
+Cards: custodyzero, factory, stationzero, steward, valet. Omitted text falls
+back to the card's own; split (two-tone cards only) is the number of title
+characters set in white. scale=1 gives the 1200×630 OG size.
+
+Requests are normalized (Unicode NFC, collapsed whitespace) into a cache key.
+Rendered PNGs are kept in a bounded in-memory LRU; rasterization runs in a
+process pool so the event loop only ever serves bytes. Every response carries
+a strong ETag derived from the key and the rendering code. A matching
+If-None-Match gets a 304 without rasterizing, once the request is known to
+render: its PNG is cached, or its SVG builds (cards.check()), so a stale
+or guessed ETag for a card that would fail still gets the error. Identical requests that
+arrive while a card is rendering share that one render.
+
+Prerequisites:
+  pip install cairosvg Pillow fonttools brotli
+  Fonts as for the social card scripts (installed on startup if absent).
+
+Usage:
+  python3 scripts/og-server.py [--host 127.0.0.1] [--port 8787] [--workers N] [--cache-mb 256]
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+
+from brandkit import cards, fontstore
+
+MAX_HEADER_BYTES = 16 * 1024
+IDLE_TIMEOUT = 30.0
+CACHE_CONTROL = "public, max-age=86400"
+
+
+# ---------------------------------------------------------------------------
+# Rendered-card cache
+# ---------------------------------------------------------------------------
+
+class PngCache:
+    """LRU of rendered PNGs bounded by total bytes."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key, entry) -> None:
+        size = len(entry[0])
+        if size > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.bytes -= len(old[0])
+        self._entries[key] = entry
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            _, (png, _) = self._entries.popitem(last=False)
+            self.bytes -= len(png)
+
+    def __contains__(self, key) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# ---------------------------------------------------------------------------
+# HTTP
+# ---------------------------------------------------------------------------
+
+class Response:
+    __slots__ = ("status", "headers", "body")
+
+    def __init__(self, status: HTTPStatus, body: bytes = b"", headers: dict = None):
+        self.status = status
+        self.body = body
+        self.headers = headers or {}
+
+
+def text_response(status: HTTPStatus, message: str = None) -> Response:
+    body = ((message or status.phrase) + "\n").encode()
+    return Response(status, body, {"Content-Type": "text/plain; charset=utf-8"})
+
+
+def etag_matches(header: str, etag: str) -> bool:
+    if header is None:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+class CardServer:
+    def __init__(self, pool: ProcessPoolExecutor, cache: PngCache):
+        self.pool = pool
+        self.cache = cache
+        self.inflight = {}
+        self.renders = 0
+
+    async def card(self, req: cards.CardRequest):
+        """(png, etag) for `req` from the cache, an in-flight render or a new one."""
+        entry = self.cache.get(req)
+        if entry is not None:
+            return entry, True
+        future = self.inflight.get(req)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self.pool, cards.render, req)
+            self.inflight[req] = future
+            self.renders += 1
+            future.add_done_callback(lambda _: self.inflight.pop(req, None))
+        png = await asyncio.shield(future)
+        entry = (png, cards.etag(req))
+        self.cache.put(req, entry)
+        return entry, False
+
+    async def respond(self, method: str, target: str, headers: dict) -> Response:
+        if method not in ("GET", "HEAD"):
+            resp = text_response(HTTPStatus.METHOD_NOT_ALLOWED)
+            resp.headers["Allow"] = "GET, HEAD"
+            return resp
+        parts = urlsplit(target)
+        if parts.path == "/healthz":
+            return text_response(
+                HTTPStatus.OK,
+                f"ok cards={len(self.cache)} bytes={self.cache.bytes} hits={self.cache.hits} "
+                f"misses={self.cache.misses} renders={self.renders}",
+            )
+        name = parts.path.strip("/").removesuffix(".png")
+        query = {k: v[-1] for k, v in parse_qs(parts.query, keep_blank_values=True).items()}
+        try:
+            req = cards.normalize(
+                name,
+                title=query.get("title"),
+                tagline=query.get("tagline"),
+                url=query.get("url"),
+                split=query.get("split"),
+                scale=query.get("scale", 1),
+            )
+        except KeyError:
+            return text_response(HTTPStatus.NOT_FOUND, f"unknown card {name!r}")
+        except ValueError as exc:
+            return text_response(HTTPStatus.BAD_REQUEST, str(exc))
+
+        etag = cards.etag(req)
+        cache_headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+        if etag_matches(headers.get("if-none-match"), etag):
+            if req not in self.cache:
+                try:
+                    await asyncio.get_running_loop().run_in_executor(None, cards.check, req)
+                except ValueError as exc:
+                    return text_response(HTTPStatus.BAD_REQUEST, str(exc))
+            return Response(HTTPStatus.NOT_MODIFIED, headers=cache_headers)
+        try:
+            (png, _), hit = await self.card(req)
+        except ValueError as exc:  # e.g. a character the card's fonts cannot set
+            return text_response(HTTPStatus.BAD_REQUEST, str(exc))
+        cache_headers["Content-Type"] = "image/png"
+        cache_headers["X-Cache"] = "HIT" if hit else "MISS"
+        return Response(HTTPStatus.OK, png, cache_headers)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), IDLE_TIMEOUT)
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                    return
+                except asyncio.LimitOverrunError:
+                    await self.send(writer, "GET", text_response(
+                        HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE), keep_alive=False)
+                    return
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, version = lines[0].split(" ")
+                except ValueError:
+                    await self.send(writer, "GET", text_response(HTTPStatus.BAD_REQUEST),
+                                    keep_alive=False)
+                    return
+                headers = {}
+                for line in lines[1:]:
+                    key, sep, value = line.partition(":")
+                    if sep:
+                        headers[key.strip().lower()] = value.strip()
+                connection = headers.get("connection", "").lower()
+                keep_alive = (connection != "close" if version == "HTTP/1.1"
+                              else connection == "keep-alive")
+                try:
+                    resp = await self.respond(method, target, headers)
+                except Exception as exc:
+                    print(f"  ERROR {method} {target}: {exc!r}")
+                    resp = text_response(HTTPStatus.INTERNAL_SERVER_ERROR)
+                await self.send(writer, method, resp, keep_alive)
+                if not keep_alive:
+                    return
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def send(writer: asyncio.StreamWriter, method: str, resp: Response,
+                   keep_alive: bool) -> None:
+        headers = dict(resp.headers)
+        if resp.status != HTTPStatus.NOT_MODIFIED:
+            headers["Content-Length"] = str(len(resp.body))
+        headers["Connection"] = "keep-alive" if keep_alive else "close"
+        head = f"HTTP/1.1 {resp.status.value} {resp.status.phrase}\r\n"
+        head += "".join(f"{k}: {v}\r\n" for k, v in headers.items()) + "\r\n"
+        writer.write(head.encode("latin-1"))
+        if method != "HEAD" and resp.status != HTTPStatus.NOT_MODIFIED:
+            writer.write(resp.body)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+async def serve(args) -> None:
+    cache = PngCache(args.cache_mb * 1024 * 1024)
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=cards.load_all) as pool:
+        app = CardServer(pool, cache)
+        server = await asyncio.start_server(app.handle, args.host, args.port,
+                                            limit=MAX_HEADER_BYTES)
+        print(f"Serving {', '.join(cards.CARDS)} on http://{args.host}:{args.port}/ "
+              f"({args.workers} render workers, {args.cache_mb} MB cache)")
+        async with server:
+            await server.serve_forever()
+
+
+def main() -> None:
+    fontstore.configure()
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="render processes (default: CPU count)")
+    parser.add_argument("--cache-mb", type=int, default=256,
+                        help="rendered PNG cache size in MB (default: 256)")
+    args = parser.parse_args()
+
+    print("Preparing card fonts…")
+    start = time.perf_counter()
+    for card in cards.CARDS:
+        cards.prepare(card)
+    print(f"  ready in {time.perf_counter() - start:.2f}s")
+
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        print("\nStopped.")
+
+
+if __name__ == "__main__":
+    main()
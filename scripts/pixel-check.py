@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Check that every generated raster still has the same pixels as its golden digest.
+
+Copies scripts/ and brand/ (without their PNG/ICO outputs) into a temporary
+directory, rebuilds every target there with scripts/build-brand.py --force
+and scripts/favicon-bundle.py, and compares each output's decoded pixels
+with the digests stored in scripts/pixel-goldens.json. Only decoded pixels
+count: a PNG re-encoded with another filter, zlib level or colour type (see
+brandkit.pngopt) still matches. A digest is the SHA-256 of the image as
+8-bit RGBA together with its size; an ICO has one per frame (path#size).
+
+For every mismatch the fresh render is compared with the asset committed
+in the tree: its maximum and mean per-channel error are printed, and the
+render plus a diff image (the largest channel difference per pixel,
+stretched to full range) are written to --diff-dir. The exit status is 1
+if any output differs, is missing or has no golden digest.
+
+A golden may be pending: its size is known but no real cairo render of it
+has been recorded yet ("rgba_sha256": null, with the reason under
+"pending"). A pending golden has no digest to check against, so it fails
+the check like a missing one unless --allow-pending is given, which lists
+it and passes. --fill records the pending digests from this run and checks
+everything else as usual.
+
+The rebuild uses the default settings — grain, kerning, font embedding and
+WebP/AVIF companions are not taken from the environment — and its own
+rebuild manifest, so the working tree and the cache's record of it are
+left alone. The font store and the metrics, subset and PNG optimizer caches
+are shared. Rasters render on a process pool, and outputs are decoded and
+hashed on one.
+
+Run --update after an intentional change to record the new digests, or
+--fill for the pending ones only (from a machine with the real cairo and
+the locked fonts; commit the file).
+
+Prerequisites:
+  As for scripts/build-brand.py and scripts/favicon-bundle.py.
+
+Usage:
+  python3 scripts/pixel-check.py
+  python3 scripts/pixel-check.py --jobs 4 --diff-dir /tmp/pixel-diff
+  python3 scripts/pixel-check.py --update
+  python3 scripts/pixel-check.py --fill
+  python3 scripts/pixel-check.py --allow-pending
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from PIL import Image, ImageChops, ImageStat
+
+from brandkit.paths import BASE, cache_dir
+
+SCRIPTS = Path(__file__).parent
+GOLDENS = SCRIPTS / "pixel-goldens.json"
+RASTERS = (".png", ".ico")
+COMPANIONS = (".webp", ".avif")
+
+# Settings that change rendered pixels; goldens are for their defaults.
+UNSET = ("BRANDKIT_GRAIN", "BRANDKIT_KERN", "BRANDKIT_FONT_EMBED", "BRANDKIT_MIN_PSNR")
+
+BUILDS = (
+    ["build-brand.py", "--force"],
+    ["favicon-bundle.py"],
+)
+
+
+# ---------------------------------------------------------------------------
+# Decoding
+# ---------------------------------------------------------------------------
+
+def frames(path: Path) -> list:
+    """(key suffix, RGBA image) for each image in a PNG ("") or ICO ("#<size>")."""
+    img = Image.open(path)
+    if img.format != "ICO":
+        return [("", img.convert("RGBA"))]
+    return [(f"#{w}" if w == h else f"#{w}x{h}", img.ico.getimage((w, h)).convert("RGBA"))
+            for w, h in sorted(img.ico.sizes())]
+
+
+def digest(img: Image.Image) -> str:
+    h = hashlib.sha256(f"{img.width}x{img.height}:".encode())
+    h.update(img.tobytes())
+    return h.hexdigest()
+
+
+def digest_file(root: Path, rel: str) -> list:
+    """(asset key, "WxH", digest) for each frame of `rel` under `root`."""
+    return [(rel + suffix, f"{img.width}x{img.height}", digest(img))
+            for suffix, img in frames(root / rel)]
+
+
+def digest_tree(root: Path, workers: int) -> dict:
+    """Asset key → {"size", "rgba_sha256"} for every raster under root/brand."""
+    rels = sorted(p.relative_to(root).as_posix()
+                  for p in (root / "brand").rglob("*") if p.suffix in RASTERS)
+    out = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for entries in pool.map(digest_file, [root] * len(rels), rels, chunksize=4):
+            for key, size, sha in entries:
+                out[key] = {"size": size, "rgba_sha256": sha}
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Rendering
+# ---------------------------------------------------------------------------
+
+def _ignore_outputs(directory: str, names: list) -> set:
+    return {n for n in names if n == "__pycache__" or n.endswith(RASTERS + COMPANIONS)}
+
+
+def prepare(root: Path) -> dict:
+    """Copy the sources into `root`; returns the environment to build them with."""
+    for name in ("scripts", "brand"):
+        shutil.copytree(BASE / name, root / name, ignore=_ignore_outputs)
+
+    # A private cache: its own rebuild manifest, everything else shared.
+    cache = root / "cache"
+    cache.mkdir()
+    for shared in cache_dir().iterdir():
+        if shared.is_dir() and shared.name != "build":
+            (cache / shared.name).symlink_to(shared, target_is_directory=True)
+
+    env = {k: v for k, v in os.environ.items() if k not in UNSET}
+    env.update(BRANDKIT_CACHE_DIR=str(cache), BRANDKIT_FORMATS="none")
+    return env
+
+
+def render(root: Path, env: dict, workers: int) -> None:
+    for script, *args in BUILDS:
+        cmd = [sys.executable, str(root / "scripts" / script), *args, "--jobs", str(workers)]
+        start = time.perf_counter()
+        result = subprocess.run(cmd, cwd=root, env=env, capture_output=True, text=True)
+        if result.returncode != 0:
+            print(result.stdout[-4000:] + result.stderr[-4000:])
+            sys.exit(f"{script} failed (exit {result.returncode})")
+        print(f"  {script}: {time.perf_counter() - start:.1f}s")
+
+
+# ---------------------------------------------------------------------------
+# Comparison
+# ---------------------------------------------------------------------------
+
+def _frame(path: Path, key: str):
+    suffix = key[len(key.split("#")[0]):]
+    return dict(frames(path)).get(suffix)
+
+
+def explain(key: str, root: Path, diff_dir: Path) -> str:
+    """Error statistics of the render against the committed asset; writes the diff images."""
+    rel = key.split("#")[0]
+    new = _frame(root / rel, key)
+    committed = BASE / rel
+    if new is None:
+        return "not rendered"
+    old = _frame(committed, key) if committed.exists() else None
+    if old is None:
+        return "no committed asset to compare with"
+    if old.size != new.size:
+        return f"size {old.width}x{old.height} → {new.width}x{new.height}"
+
+    diff = ImageChops.difference(new, old)
+    peak = max(hi for _, hi in diff.getextrema())
+    mean = sum(ImageStat.Stat(diff).mean) / 4
+    if not peak:
+        return "same pixels as the committed asset (golden digest out of date?)"
+    name = key.replace("/", "_").replace("#", "_")
+    diff_dir.mkdir(parents=True, exist_ok=True)
+    new.save(diff_dir / f"{name}.new.png")
+    channels = diff.split()
+    worst = channels[0]
+    for c in channels[1:]:
+        worst = ImageChops.lighter(worst, c)
+    worst.point(lambda v: v * 255 // peak).save(diff_dir / f"{name}.diff.png")
+    return f"max error {peak}, mean {mean:.3f}"
+
+
+def pending(goldens: dict) -> list:
+    """Keys whose golden has a size but no recorded digest yet."""
+    return sorted(k for k, v in goldens.items() if v["rgba_sha256"] is None)
+
+
+def compare(goldens: dict, rendered: dict, root: Path, diff_dir: Path,
+            allow_pending: bool = False) -> int:
+    """Print every difference; returns how many assets failed (pending ones too, unless allowed)."""
+    failed = 0
+    for key in sorted(goldens.keys() | rendered.keys()):
+        want, got = goldens.get(key), rendered.get(key)
+        if want is not None and got is not None and want["size"] == got["size"]:
+            if want["rgba_sha256"] == got["rgba_sha256"]:
+                continue
+            if want["rgba_sha256"] is None:
+                print(f"  PENDING  {key} ({want.get('pending', 'no digest recorded')})")
+                failed += not allow_pending
+                continue
+        failed += 1
+        if want is None:
+            print(f"  NEW      {key} ({got['size']}; no golden digest)")
+        elif got is None:
+            print(f"  MISSING  {key}")
+        else:
+            print(f"  CHANGED  {key}: {explain(key, root, diff_dir)}")
+    return failed
+
+
+def load_goldens() -> dict:
+    try:
+        return json.loads(GOLDENS.read_text(encoding="utf-8"))["assets"]
+    except FileNotFoundError:
+        sys.exit(f"{GOLDENS.relative_to(BASE)} does not exist; record it with --update")
+
+
+def save_goldens(assets: dict) -> None:
+    body = {"version": 1, "assets": dict(sorted(assets.items()))}
+    GOLDENS.write_text(json.dumps(body, indent=1) + "\n", encoding="utf-8")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--update", action="store_true",
+                        help=f"record the rendered digests in {GOLDENS.name} instead of checking")
+    parser.add_argument("--fill", action="store_true",
+                        help="record the rendered digests of pending goldens (and check the rest)")
+    parser.add_argument("--allow-pending", action="store_true",
+                        help="list pending goldens without failing the check")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1,
+                        help="worker processes (default: CPU count)")
+    parser.add_argument("--diff-dir", type=Path, default=cache_dir("pixel-check"),
+                        help="where renders and diff images of mismatches go "
+                             "(default: the brandkit cache's pixel-check/)")
+    parser.add_argument("--keep", action="store_true", help="keep the temporary build tree")
+    args = parser.parse_args()
+    if args.update and args.fill:
+        parser.error("--update records every digest; --fill only the pending ones")
+
+    goldens = None if args.update else load_goldens()
+    start = time.perf_counter()
+    root = Path(tempfile.mkdtemp(prefix="pixel-check-"))
+    try:
+        print(f"Rendering every target into {root}…")
+        render(root, prepare(root), args.jobs)
+        rendered = digest_tree(root, args.jobs)
+
+        if args.update:
+            save_goldens(rendered)
+            print(f"\nRecorded {len(rendered)} digests in {GOLDENS.relative_to(BASE)}.")
+            return
+        waiting = [k for k in pending(goldens)
+                   if k in rendered and rendered[k]["size"] == goldens[k]["size"]]
+        failed = compare(goldens, rendered, root, args.diff_dir,
+                         allow_pending=args.allow_pending or args.fill)
+        if args.fill and waiting:
+            goldens.update((k, rendered[k]) for k in waiting)
+            save_goldens(goldens)
+            print(f"\nRecorded {len(waiting)} pending digests in {GOLDENS.relative_to(BASE)}.")
+            waiting = []
+    finally:
+        if args.keep:
+            print(f"  (build tree kept at {root})")
+        else:
+            shutil.rmtree(root, ignore_errors=True)
+
+    elapsed = time.perf_counter() - start
+    if failed:
+        hint = (f"; {len(waiting)} pending (record them with --fill on a machine with cairo, "
+                f"or pass --allow-pending)" if waiting and not args.allow_pending else "")
+        print(f"\n{failed} of {len(goldens.keys() | rendered.keys())} assets fail the check "
+              f"(renders and diffs in {args.diff_dir}){hint}; {elapsed:.1f}s.")
+        sys.exit(1)
+    note = f"; {len(waiting)} pending (record them with --fill)" if waiting else ""
+    print(f"\nAll {len(rendered) - len(waiting)} assets match their golden pixels{note} "
+          f"({elapsed:.1f}s).")
+
+
+if __name__ == "__main__":
+    main()
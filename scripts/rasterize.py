@@ -4,17 +4,16 @@ Rasterize CustodyZero brand SVGs to PNG and ICO.
 
 Prerequisites:
   pip install cairosvg Pillow fonttools brotli
-  The Bebas Neue TTF must be installed in ~/Library/Fonts/ (macOS) or
-  /usr/share/fonts/ (Linux) for cairosvg to resolve it via fontconfig.
-  Run scripts/install-fonts.py to install it automatically.
+  The Bebas Neue TTF must be installed (in the font store or a user or
+  system font directory, see brandkit.fontpaths) for cairosvg to resolve it
+  via fontconfig. Run scripts/install-fonts.py to install it automatically.
 
 Usage:
   python3 scripts/rasterize.py
 """
 import os
-import cairosvg
-from PIL import Image
-import io
+
+from brandkit import build, encode, fontstore, icons, raster
 
 BASE         = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 WORDMARK_DIR = os.path.join(BASE, "brand/custodyzero/wordmark")
@@ -51,27 +50,29 @@ ICO_ASSET = (
 )
 
 
-def svg_to_png(svg_path, out_path, width, height):
-    cairosvg.svg2png(url=svg_path, write_to=out_path, output_width=width, output_height=height)
+def svg_to_png(svg_path, out_path, width, height, alternates=encode.NONE):
+    png = raster.load_file(svg_path).render_png(width, height)
+    with open(out_path, "wb") as f:
+        f.write(png)
     print(f"  {out_path} ({width}x{height})")
+    for path in encode.write_alternates(png, out_path, alternates):
+        print(f"  {path}")
 
 
 def svg_to_ico(svg_path, out_path, sizes):
-    # Render at the largest size; Pillow resamples each ICO frame.
-    max_size = max(sizes)
-    png_bytes = cairosvg.svg2png(url=svg_path, output_width=max_size, output_height=max_size)
-    img = Image.open(io.BytesIO(png_bytes)).convert("RGBA")
-    img.save(out_path, format="ICO", sizes=[(s, s) for s in sizes])
-    print(f"  {out_path} (ICO {sizes})")
+    # Per-frame native render or downsample, by size (see brandkit.icons).
+    with open(svg_path, encoding="utf-8") as f:
+        icons.svg_to_ico(f.read(), out_path, sizes)
 
 
 def main():
+    fontstore.configure()
     print("Rasterizing PNGs...")
     for svg, out, w, h in ASSETS:
-        svg_to_png(svg, out, w, h)
+        build.submit(svg_to_png, svg, out, w, h, encode.alternates_from_env())
 
     print("Generating ICO...")
-    svg_to_ico(*ICO_ASSET)
+    build.submit(svg_to_ico, *ICO_ASSET)
 
     print("Done.")
 